@@ -5,11 +5,7 @@ import logging
 import sys
 import asyncio
 import time
-from niveristand.legacy import NIVeriStand
 import json
-from niveristand.library import wait
-from niveristand.clientapi import BooleanValue, ChannelReference, DoubleValue
-from niveristand import nivs_rt_sequence, NivsParam, realtimesequencetools
 
 
 def read_project_config(project_config_path='projectConfig.json'):
@@ -38,6 +34,7 @@ def read_project_config(project_config_path='projectConfig.json'):
 
 def connect_to_veristand(project_path: str, calibration_file: str, system_address: str) -> None:
     """Connect to VeriStand Workspace and deploy the project."""
+    from niveristand.legacy import NIVeriStand
     logging.debug("Launching VeriStand Worksapce")
     NIVeriStand.LaunchNIVeriStand()
     logging.debug("Waiting for Verstand to be ready")
@@ -52,6 +49,8 @@ def connect_to_veristand(project_path: str, calibration_file: str, system_addres
 
 def run_demo(iterations=10):
     """Blink light on cRIO module."""
+    from niveristand.clientapi import ChannelReference
+    from niveristand.library import wait
     with open ("projectConfig.json") as f:
         data = json.load(f)
     # do_channels = data["variables"]["do_channels"]
@@ -79,6 +78,7 @@ def init_hil(configfile='projectConfig.json'):
 
 def disconnect_hil(ws, Systemadress):
     run_demo(iterations=100)
+    from niveristand.legacy import NIVeriStand
     print("Disconnecting from VeriStand system...")
     ws = NIVeriStand.Workspace2(Systemadress)
     ws.DisconnectFromSystem("", True)
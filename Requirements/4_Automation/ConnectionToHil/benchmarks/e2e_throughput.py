@@ -0,0 +1,75 @@
+"""
+E2E throughput benchmark
+
+Stamps and verifies CRC + counter for every protected signal group of the
+CAN database, batched (E2EEngine) and frame by frame with the scalar
+reference CRC, and compares the rates with a fully loaded bus (500 kbit/s,
+8 byte extended frames). Exits non-zero when the batched engine cannot keep
+up with the bus.
+
+Usage:
+    python benchmarks/e2e_throughput.py [frames_per_group]
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from e2e import COUNTER_MODULO, E2EEngine, crc8
+from restbus import frame_bits
+from signal_db import load_db
+
+
+BITRATE = 500_000
+
+
+def scalar_protect(layout, payloads, counter=0):
+    """One frame at a time, the straightforward way"""
+    out = []
+    for payload in payloads:
+        data = bytearray(payload)
+        data[layout.counter_byte] = data[layout.counter_byte] & ~layout.counter_mask | layout.counter_pattern[counter]
+        data[layout.crc_byte] = crc8(bytes(data[b] for b in layout.data), layout.crc_seed)
+        out.append(bytes(data))
+        counter = (counter + 1) % COUNTER_MODULO
+    return out
+
+
+def rate(func, frames, repeats=3):
+    best = min(_timed(func) for _ in range(repeats))
+    return frames / best
+
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(per_group=10_000):
+    engine = E2EEngine(load_db(cache_dir=None))
+    batches = {g: [os.urandom(l.frame_length) for _ in range(per_group)] for g, l in engine.layouts.items()}
+    frames = per_group * len(batches)
+    assert all(scalar_protect(engine.layouts[g], p) == engine.protect(g, p, 0) for g, p in batches.items())
+
+    protected = {g: engine.protect(g, p, 0) for g, p in batches.items()}
+    results = {
+        "protect (batched)": rate(lambda: [engine.protect(g, p, 0) for g, p in batches.items()], frames),
+        "verify (batched)": rate(lambda: [engine.verify(g, p) for g, p in protected.items()], frames),
+        "protect (per frame)": rate(lambda: [scalar_protect(engine.layouts[g], p) for g, p in batches.items()],
+                                    frames),
+    }
+    bus_rate = BITRATE / frame_bits(8)
+    print(f"{len(batches)} protected groups, {frames} frames, full bus = {bus_rate:,.0f} frames/s")
+    print(f"{'case':<22}{'frames/s':>14}{'x bus rate':>12}")
+    for case, fps in results.items():
+        print(f"{case:<22}{fps:>14,.0f}{fps / bus_rate:>12.1f}")
+    batched = min(results["protect (batched)"], results["verify (batched)"])
+    return 0 if batched >= bus_rate else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000))
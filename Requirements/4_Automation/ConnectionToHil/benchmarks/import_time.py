@@ -0,0 +1,64 @@
+"""
+Import time benchmark
+
+Runs each import the offline tooling does in a fresh interpreter under
+``python -X importtime`` and prints the total import time, the number of
+modules loaded and whether any VeriStand backend module was pulled in.
+Exits non-zero when one of them imports the backend.
+
+Usage:
+    python benchmarks/import_time.py [repeats]
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# name -> statement run in the fresh interpreter
+CASES = {
+    "config reader": "from hil_modules import read_project_config; read_project_config()",
+    "runtime": "import hil_runtime",
+    "dry run collection": "import test_max_defrost_dry_run",
+    "safe test collection": "import test_max_defrost_safe",
+}
+
+BACKEND_PREFIXES = ("niveristand", "realtimesequencetools")
+
+
+def measure(statement):
+    """(total_ms, modules, backend_modules) of one run"""
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    total_us, modules, backend = 0, 0, []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        modules += 1
+        name = name.strip()
+        if name.startswith(BACKEND_PREFIXES):
+            backend.append(name)
+    if result.returncode and not backend:
+        print(result.stderr.strip().splitlines()[-1])
+    return total_us / 1000, modules, backend
+
+
+def main(repeats=5):
+    print(f"{'case':<24}{'best ms':>10}{'modules':>10}  backend")
+    clean = True
+    for case, statement in CASES.items():
+        runs = [measure(statement) for _ in range(repeats)]
+        best_ms = min(r[0] for r in runs)
+        _, modules, backend = runs[0]
+        clean &= not backend
+        print(f"{case:<24}{best_ms:>10.1f}{modules:>10}  {', '.join(backend[:3]) or '-'}")
+    return 0 if clean else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
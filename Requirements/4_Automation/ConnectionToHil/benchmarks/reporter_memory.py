@@ -0,0 +1,81 @@
+"""
+Reporter memory benchmark
+
+Records 100k checks (plus one set per 10 checks) into TestReporter and into a
+replica of the previous dict-per-record layout, and prints the peak traced
+memory of each.
+
+Usage:
+    python benchmarks/reporter_memory.py [num_checks]
+"""
+
+import sys
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from test_reporter import TestReporter
+
+
+SIGNALS = ["MaxDefrostStatus", "HVACBlowerLevelStat_BlowerLevel",
+           "ClimateAirDistStatus_Defrost", "CabHeatManStatus"]
+
+
+class DictReporter:
+    """The previous storage layout: one dict per record, checks kept twice"""
+
+    def __init__(self):
+        self.checks = []
+        self.current_step = {"name": "Monitor", "timestamp": datetime.now(),
+                             "checks": [], "sets": []}
+
+    def add_set(self, signal_name, value):
+        self.current_step["sets"].append({"signal": signal_name, "value": value,
+                                          "timestamp": datetime.now()})
+
+    def add_check(self, signal_name, expected, actual, passed, tolerance=None):
+        check = {"signal": signal_name, "expected": expected, "actual": actual,
+                 "passed": passed, "tolerance": tolerance, "timestamp": datetime.now()}
+        self.current_step["checks"].append(check)
+        self.checks.append(check)
+
+
+def fill(reporter, num_checks):
+    for i in range(num_checks):
+        # Build the name at runtime, as the signal helpers do from config lookups
+        signal = "".join(SIGNALS[i % len(SIGNALS)])
+        if i % 10 == 0:
+            reporter.add_set(signal, i % 11)
+        reporter.add_check(signal, 1, 1.0, True, 0.1)
+
+
+def measure(factory, num_checks):
+    tracemalloc.start()
+    reporter = factory()
+    fill(reporter, num_checks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    num_checks = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    def slots_factory():
+        reporter = TestReporter("benchmark")
+        reporter.add_step("Monitor")
+        return reporter
+
+    legacy = measure(DictReporter, num_checks)
+    compact = measure(slots_factory, num_checks)
+
+    print(f"checks recorded : {num_checks}")
+    print(f"dict records    : {legacy / 1e6:8.2f} MB")
+    print(f"slots records   : {compact / 1e6:8.2f} MB")
+    print(f"reduction       : {100 * (1 - compact / legacy):8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
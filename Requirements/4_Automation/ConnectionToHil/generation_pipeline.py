@@ -0,0 +1,246 @@
+"""
+Generation Pipeline - Incremental requirement -> scenario -> script -> report build
+
+Every requirement row of requirements.csv goes through three artifacts:
+
+    scenario_<section>.md   written by the scenario writer
+    test_<section>.py       thin script rendered from the scenario (hil_runtime)
+    report_<section>.*      produced by running the script (--run)
+
+Each artifact is keyed by the hash of its inputs:
+
+    scenario: requirement row, signal DB version, writer version
+    script:   scenario content, TEMPLATE_VERSION
+    report:   script and scenario content, signal DB version
+
+and the keys are kept in a manifest next to the outputs. Only artifacts
+whose key changed (or whose file is missing) are rebuilt, so an unchanged
+section costs a few hashes, and a changed DBC only re-runs what depends
+on it. Sections are built in parallel; the stages of one section run in
+order. Outputs have stable names instead of one timestamped copy per
+generation.
+
+The scenario writer is pluggable (--writer module:function, called as
+function(row) -> markdown). By default the newest existing scenario file
+of the section (FinalTest/, Scenarios/) is adopted, so the pipeline can
+take over the current tree without regenerating anything.
+
+Usage:
+    python generation_pipeline.py ../../requirements.csv --out ../../Generated [--run] [--jobs 8]
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import argparse
+import csv
+import hashlib
+import importlib
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+
+from hil_runtime.script_template import TEMPLATE_VERSION, render_scenario_script
+
+
+HERE = Path(__file__).resolve().parent
+REQUIREMENTS_DIR = HERE.parent.parent
+DEFAULT_DB_FILES = [REQUIREMENTS_DIR.parent / "DB", HERE / "projectConfig.json"]
+DEFAULT_SCENARIO_DIRS = [REQUIREMENTS_DIR / "FinalTest", REQUIREMENTS_DIR / "Scenarios"]
+MANIFEST = "manifest.json"
+
+
+def input_key(*parts):
+    """Stable hash of JSON-serialisable inputs"""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_hash(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def db_version(paths=DEFAULT_DB_FILES):
+    """Hash over the signal databases (DBC/LDF files, projectConfig.json)"""
+    hashes = {}
+    for root in paths:
+        root = Path(root)
+        files = sorted(p for p in root.rglob("*") if p.is_file()) if root.is_dir() else [root]
+        for f in files:
+            if f.exists():
+                hashes[f.name] = file_hash(f)
+    return input_key(hashes)
+
+
+def runtime_dir(out_dir):
+    """This directory relative to ``out_dir``, as generated scripts find hil_runtime"""
+    try:
+        return os.path.relpath(HERE, Path(out_dir).resolve())
+    except ValueError:  # other drive
+        return str(HERE)
+
+
+def read_requirements(csv_path):
+    """Requirement rows by section id (chunk_id), in file order"""
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        return {row["chunk_id"]: row for row in csv.DictReader(f) if row.get("chunk_id")}
+
+
+def _timestamp(name):
+    m = re.search(r"\d{4}-\d{2}-\d{2}-\d{2}-\d{2}", name)
+    return m.group(0) if m else ""
+
+
+def _section_number(section):
+    return section.rsplit("_", 1)[-1]
+
+
+class AdoptExistingWriter:
+    """Default writer: the newest scenario file the old generator left for a section"""
+    version = "adopt-1"
+
+    def __init__(self, search_dirs=DEFAULT_SCENARIO_DIRS):
+        self.search_dirs = [Path(d) for d in search_dirs]
+
+    def source(self, row):
+        n = _section_number(row["chunk_id"])
+        pattern = re.compile(rf"^(?:scenario_req_section_{n}_|req_section_{n}_scenario).*\.md$")
+        candidates = [p for d in self.search_dirs if d.is_dir() for p in d.iterdir() if pattern.match(p.name)]
+        # Newest generation timestamp wins; an undated file counts as oldest
+        return max(candidates, key=lambda p: (_timestamp(p.name), p.name), default=None)
+
+    def input_of(self, row):
+        source = self.source(row)
+        return None if source is None else file_hash(source)
+
+    def __call__(self, row):
+        source = self.source(row)
+        return None if source is None else source.read_text(encoding="utf-8")
+
+
+class ModuleWriter:
+    """Writer loaded from "module:function"; the module may define WRITER_VERSION"""
+
+    def __init__(self, spec):
+        module_name, _, func_name = spec.partition(":")
+        module = importlib.import_module(module_name)
+        self.func = getattr(module, func_name or "write_scenario")
+        self.version = f"{spec}@{getattr(module, 'WRITER_VERSION', '1')}"
+
+    def input_of(self, row):
+        return None
+
+    def __call__(self, row):
+        return self.func(row)
+
+
+class Pipeline:
+    """
+    Build graph over requirement sections
+
+    Args:
+        requirements: {section: row}
+        out_dir: output directory (manifest.json lives there)
+        writer: scenario writer (AdoptExistingWriter by default)
+        db_files: files/directories hashed into the DB version
+        run_reports: also run the generated scripts
+    """
+
+    def __init__(self, requirements, out_dir, writer=None, db_files=DEFAULT_DB_FILES, run_reports=False):
+        self.requirements = requirements
+        self.out_dir = Path(out_dir)
+        self.writer = writer or AdoptExistingWriter()
+        self.db = db_version(db_files)
+        self.run_reports = run_reports
+        self.manifest_path = self.out_dir / MANIFEST
+        try:
+            self.manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.manifest = {}
+
+    def _fresh(self, artifact_id, key, path):
+        entry = self.manifest.get(artifact_id)
+        return entry is not None and entry["key"] == key and Path(path).exists()
+
+    def _write(self, path, text):
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+
+    def build_section(self, section):
+        """Bring one section up to date; returns {artifact_id: (key, path, rebuilt)}"""
+        row = self.requirements[section]
+        results = {}
+
+        scenario_path = self.out_dir / f"scenario_{section}.md"
+        key = input_key(row, self.db, self.writer.version, self.writer.input_of(row))
+        if self._fresh(f"{section}/scenario", key, scenario_path):
+            results[f"{section}/scenario"] = (key, str(scenario_path), False)
+        else:
+            text = self.writer(row)
+            if text is None:
+                logging.warning(f"{section}: no scenario available, skipped")
+                return results
+            self._write(scenario_path, text)
+            results[f"{section}/scenario"] = (key, str(scenario_path), True)
+        scenario_hash = file_hash(scenario_path)
+
+        script_path = self.out_dir / f"test_{section}.py"
+        runtime = runtime_dir(self.out_dir)
+        key = input_key(scenario_hash, TEMPLATE_VERSION, runtime)
+        rebuilt = not self._fresh(f"{section}/script", key, script_path)
+        if rebuilt:
+            self._write(script_path, render_scenario_script(section, scenario_path.name, row.get("title", ""),
+                                                            runtime))
+        results[f"{section}/script"] = (key, str(script_path), rebuilt)
+
+        if self.run_reports:
+            report_path = self.out_dir / f"report_{section}.html"
+            key = input_key(file_hash(script_path), scenario_hash, self.db)
+            rebuilt = not self._fresh(f"{section}/report", key, report_path)
+            if rebuilt:
+                self.run_script(script_path, report_path)
+            results[f"{section}/report"] = (key, str(report_path), rebuilt)
+        return results
+
+    def run_script(self, script_path, report_path):
+        env = dict(os.environ, HIL_REPORT_PATH=str(report_path.resolve()),
+                   HIL_REPORT_FORMATS=os.environ.get("HIL_REPORT_FORMATS", "html,jsonl"),
+                   PYTHONPATH=os.pathsep.join(filter(None, [str(HERE), os.environ.get("PYTHONPATH")])))
+        result = subprocess.run([sys.executable, "-m", "pytest", "-q", str(script_path)],
+                                cwd=HERE, env=env, capture_output=True, text=True)
+        logging.info(f"{script_path.name}: pytest exit code {result.returncode}")
+
+    def build(self, sections=None, jobs=None):
+        """Build ``sections`` (default: all) in parallel; returns the ids of rebuilt artifacts"""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        sections = list(sections or self.requirements)
+        rebuilt = []
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            for results in pool.map(self.build_section, sections):
+                for artifact_id, (key, path, was_rebuilt) in results.items():
+                    self.manifest[artifact_id] = {"key": key, "path": path}
+                    if was_rebuilt:
+                        rebuilt.append(artifact_id)
+        self._write(self.manifest_path, json.dumps(self.manifest, indent=1, sort_keys=True))
+        return rebuilt
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally generate scenarios, scripts and reports")
+    parser.add_argument("requirements", nargs="?", default=str(REQUIREMENTS_DIR / "requirements.csv"),
+                        help="requirements.csv (title, source, chunk_id)")
+    parser.add_argument("--out", default=str(REQUIREMENTS_DIR / "Generated"), help="Output directory")
+    parser.add_argument("--sections", nargs="*", help="Only these sections (e.g. req_section_3)")
+    parser.add_argument("--writer", help="Scenario writer as module:function (default: adopt existing files)")
+    parser.add_argument("--run", action="store_true", help="Run stale scripts to refresh their reports")
+    parser.add_argument("--jobs", type=int, help="Sections built in parallel")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    pipeline = Pipeline(read_requirements(args.requirements), args.out,
+                        writer=ModuleWriter(args.writer) if args.writer else None, run_reports=args.run)
+    rebuilt = pipeline.build(args.sections, args.jobs)
+    logging.info(f"{len(rebuilt)} artifacts rebuilt" + (": " + ", ".join(rebuilt) if rebuilt else ""))
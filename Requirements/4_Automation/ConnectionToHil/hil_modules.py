@@ -1,14 +1,40 @@
 import warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
-import asyncio, json, sys, logging, os, pathlib
-from niveristand.legacy import NIVeriStand
-from niveristand.library import wait
-from niveristand.clientapi import BooleanValue, ChannelReference, DoubleValue
-from niveristand import nivs_rt_sequence, NivsParam, realtimesequencetools
+import asyncio, importlib, json, sys, logging, os, pathlib, time
 
 from typing import Tuple
 
+# The VeriStand client modules are heavy and only exist on rig machines, so
+# they are imported on first hardware use. Config readers, dry runs and pytest
+# collection import this module without touching them.
+_BACKEND_NAMES = {
+    "NIVeriStand": ("niveristand.legacy", "NIVeriStand"),
+    "wait": ("niveristand.library", "wait"),
+    "BooleanValue": ("niveristand.clientapi", "BooleanValue"),
+    "ChannelReference": ("niveristand.clientapi", "ChannelReference"),
+    "DoubleValue": ("niveristand.clientapi", "DoubleValue"),
+    "nivs_rt_sequence": ("niveristand", "nivs_rt_sequence"),
+    "NivsParam": ("niveristand", "NivsParam"),
+    "realtimesequencetools": ("niveristand", "realtimesequencetools"),
+}
+
+
+def __getattr__(name):
+    """Resolve the VeriStand names on first access (from hil_modules import ChannelReference)."""
+    try:
+        module_name, attr = _BACKEND_NAMES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def _veristand():
+    """NIVeriStand legacy API, imported on first use."""
+    return globals().get("NIVeriStand") or __getattr__("NIVeriStand")
+
 
 def read_project_config(project_config_path='projectConfig.json'):
     logging.debug("Reading project config")
@@ -36,6 +62,7 @@ def read_project_config(project_config_path='projectConfig.json'):
 
 def connect_to_veristand(project_path: str, calibration_file: str, system_address: str):
     """Connect to VeriStand Workspace and deploy the project."""
+    NIVeriStand = _veristand()
     logging.debug("Launching VeriStand Worksapce")
     NIVeriStand.LaunchNIVeriStand()
     logging.debug("Waiting for Verstand to be ready")
@@ -63,7 +90,7 @@ def connect_hil(configfile='projectConfig.json') -> Tuple[object, str]:
 
 def disconnect_hil(ws, Systemadress):
     print("Disconnecting from VeriStand system...")
-    ws = NIVeriStand.Workspace2(Systemadress)
+    ws = _veristand().Workspace2(Systemadress)
     ws.DisconnectFromSystem("", True)
     if ws.GetSystemState()["state"] == 1:
         logging.debug("HIL disconnected successfully!")
@@ -81,7 +108,7 @@ def check_if_already_connected(disconnect_if_connected = False):
     sys_addr = read_project_config()[2]
     
     logging.debug("Checking if HIL is already conencted...")
-    ws = NIVeriStand.Workspace2(sys_addr)
+    ws = _veristand().Workspace2(sys_addr)
     
     hil_connected = ws.GetSystemState()["state"] == 1
     
@@ -92,6 +119,94 @@ def check_if_already_connected(disconnect_if_connected = False):
     return ws.GetSystemState()["state"] == 1
 
 
+_workspaces = {}
+
+def get_workspace(system_address=None):
+    """Return a cached Workspace2 for system_address (default: from projectConfig.json)."""
+    if system_address is None:
+        system_address = read_project_config()[2]
+    ws = _workspaces.get(system_address)
+    if ws is None:
+        ws = _workspaces[system_address] = _veristand().Workspace2(system_address)
+    return ws
+
+def read_channels(paths, system_address=None):
+    """Read several channel values in one gateway round trip."""
+    return list(get_workspace(system_address).GetMultipleChannelValues(list(paths)))
+
+def write_channels(paths, values, system_address=None):
+    """Write several channel values in one gateway round trip."""
+    get_workspace(system_address).SetMultipleChannelValues(list(paths), [float(v) for v in values])
+
+
+def config_paths(variables, direction):
+    """{name: path} of all CAN and LIN channels of a direction ('OUT' or 'IN') in 'variables'."""
+    paths = {}
+    for key, group in (variables or {}).items():
+        if key == f"CAN_{direction}":
+            channels = group
+        elif isinstance(group, dict) and isinstance(group.get(direction), dict):
+            channels = group[direction]  # {"CAN": {"OUT": ...}} and LIN28/LIN29
+        else:
+            continue
+        for name, path in channels.items():
+            paths.setdefault(name, path)
+    return paths
+
+
+class Checkpoint:
+    """Values of all OUT channels and IN statuses at one moment (path -> value)."""
+
+    def __init__(self, outputs, statuses):
+        self.outputs = dict(outputs)
+        self.statuses = dict(statuses)
+
+    def save(self, path):
+        pathlib.Path(path).write_text(json.dumps({"outputs": self.outputs, "statuses": self.statuses}))
+
+    @classmethod
+    def load(cls, path):
+        data = json.loads(pathlib.Path(path).read_text())
+        return cls(data["outputs"], data["statuses"])
+
+
+def checkpoint(variables=None, system_address=None, read=read_channels):
+    """Capture all CAN_OUT/LIN OUT values and the IN statuses in one batched read."""
+    if variables is None:
+        variables = read_project_config()[3]
+    outputs = list(dict.fromkeys(config_paths(variables, "OUT").values()))
+    statuses = [p for p in dict.fromkeys(config_paths(variables, "IN").values()) if p not in outputs]
+    values = read(outputs + statuses, system_address)
+    logging.debug(f"Checkpoint of {len(outputs)} outputs and {len(statuses)} statuses")
+    return Checkpoint(zip(outputs, values[:len(outputs)]), zip(statuses, values[len(outputs):]))
+
+
+def restore(cp, system_address=None, timeout=5.0, period=0.05, tolerance=1e-6,
+            read=read_channels, write=write_channels):
+    """
+    Bring the rig back to a checkpoint.
+
+    One batched read of the current state, one batched write of the outputs
+    that differ, then only the statuses that differ are polled (one batched
+    read per cycle) until they are back. Returns {path: last value} of the
+    statuses that did not return within timeout (empty on success).
+    """
+    differs = lambda value, target: value is None or abs(value - target) > tolerance
+    outputs, statuses = list(cp.outputs), list(cp.statuses)
+    values = read(outputs + statuses, system_address)
+    changed = [(p, cp.outputs[p]) for p, v in zip(outputs, values) if differs(v, cp.outputs[p])]
+    if changed:
+        write([p for p, _ in changed], [v for _, v in changed], system_address)
+    pending = {p: v for p, v in zip(statuses, values[len(outputs):]) if differs(v, cp.statuses[p])}
+    logging.debug(f"Restore: {len(changed)} outputs written, {len(pending)} statuses to verify")
+    deadline = time.monotonic() + timeout
+    while pending and time.monotonic() < deadline:
+        time.sleep(period)
+        paths = list(pending)
+        pending = {p: v for p, v in zip(paths, read(paths, system_address)) if differs(v, cp.statuses[p])}
+    return pending
+
+
 
 if __name__ == "__main__":
     config_logs()
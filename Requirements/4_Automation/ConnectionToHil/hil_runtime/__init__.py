@@ -0,0 +1,41 @@
+"""
+Shared runtime for HIL test scripts
+
+Generated scripts import from here instead of carrying their own copies of
+the signal helpers, mocks and TestReporter:
+
+    from hil_runtime import HilSession
+
+    def test_example():
+        with HilSession("Max Defrost", simulate=simulate_hardware_response) as hil:
+            hil.step("Step 1: Set Pre-Conditions")
+            hil.set_many({"VehicleMode": 6, "ClimatePowerRequest": 1})
+            hil.wait(0.5)
+            assert hil.check("ClimatePowerStatus", 1)
+"""
+
+from .backends import (Backend, MockBackend, ReplayBackend, SimulatorBackend,
+                       VeriStandBackend, VirtualClock, make_backend)
+from .duration import DurationCase, reset_rig, run_case, run_cases
+from .journal import Journal, read_journal, resume_point
+from .monitors import MonitorSet, always, eventually_within, never, stable_for
+from .ordering import order_suite, transition_cost
+from .outputs import OutputCache
+from .policy import ExecutionPolicy, TestAborted, safe_state
+from .poller import SignalPoller
+from .rtseq import SequenceCache, compile_steps, run_on_target
+from .scenario import (STATE_ENUM, VEHICLE_MODE_ENUM, Scenario, load_scenario, parse_scenario,
+                       run_scenario)
+from .session import HilSession, load_hil_var, load_update_bits, values_match
+from .signals import Signal, SignalMap
+from .steps import Check, Set, Wait, WaitUntil, steps_hash
+
+__all__ = [
+    "Backend", "MockBackend", "ReplayBackend", "SimulatorBackend", "VeriStandBackend", "VirtualClock",
+    "make_backend", "OutputCache", "SignalPoller", "HilSession", "load_hil_var", "load_update_bits", "values_match", "Signal", "SignalMap",
+    "Set", "Wait", "WaitUntil", "Check", "steps_hash", "SequenceCache", "compile_steps", "run_on_target",
+    "Scenario", "parse_scenario", "load_scenario", "run_scenario", "VEHICLE_MODE_ENUM", "STATE_ENUM",
+    "order_suite", "transition_cost", "MonitorSet", "always", "never", "eventually_within", "stable_for",
+    "DurationCase", "reset_rig", "run_case", "run_cases", "ExecutionPolicy", "TestAborted",
+    "safe_state", "Journal", "read_journal", "resume_point",
+]
@@ -0,0 +1,5 @@
+"""python -m hil_runtime SCENARIO.md ... - run scenario files (see scenario.py)"""
+
+from .scenario import main
+
+raise SystemExit(main())
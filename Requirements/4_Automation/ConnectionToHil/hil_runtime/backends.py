@@ -0,0 +1,196 @@
+"""
+Pluggable I/O backends for HilSession
+
+- VeriStandBackend: real rig via the Workspace2 multi-channel calls
+- MockBackend:      in-memory channels, reads return the last written value
+- SimulatorBackend: in-memory requests + a response model (dry runs)
+- ReplayBackend:    replays the check values recorded in a JSONL report
+
+Select with ``make_backend`` or the HIL_BACKEND environment variable
+(veristand | mock | simulator | replay; replay reads HIL_REPLAY_FILE).
+Simulator and replay run on a VirtualClock instead of real time.
+"""
+
+import json
+import os
+import time
+
+
+class Backend:
+    """Batched channel access; subclasses implement read_many/write_many"""
+    name = "base"
+    simulated = False
+
+    def read_many(self, signals):
+        """Values of ``signals`` (list of Signal) in one round trip"""
+        raise NotImplementedError
+
+    def write_many(self, signals, values):
+        """Write ``values`` to ``signals`` in one round trip"""
+        raise NotImplementedError
+
+    def sleep(self, seconds):
+        """Wait on the backend's clock"""
+        time.sleep(seconds)
+
+    def now(self):
+        """Seconds on the backend's clock"""
+        return time.monotonic()
+
+    def close(self):
+        pass
+
+
+class VeriStandBackend(Backend):
+    """Real hardware through the VeriStand gateway"""
+    name = "veristand"
+
+    def __init__(self, system_address=None):
+        import hil_modules
+        self._hil = hil_modules
+        self.system_address = system_address
+
+    def read_many(self, signals):
+        return self._hil.read_channels([s.path for s in signals], self.system_address)
+
+    def write_many(self, signals, values):
+        self._hil.write_channels([s.path for s in signals], values, self.system_address)
+
+
+class VirtualClock:
+    """
+    Clock of the offline backends: sleep() advances it without waiting,
+    or waits seconds / time_scale of real time when a time_scale is given
+    (e.g. 100 to watch a minutes-long timer run at 100x)
+    """
+
+    def __init__(self, time_scale=None):
+        self.time_scale = time_scale
+        self.now = 0.0
+
+    def sleep(self, seconds):
+        self.now += seconds
+        if self.time_scale:
+            time.sleep(seconds / self.time_scale)
+
+
+class MockBackend(Backend):
+    """In-memory channels keyed by path; unknown channels read as ``default``"""
+    name = "mock"
+
+    def __init__(self, initial=None, default=0.0):
+        self.values = dict(initial or {})
+        self.default = default
+
+    def read_many(self, signals):
+        return [self.values.get(s.path, self.default) for s in signals]
+
+    def write_many(self, signals, values):
+        for s, v in zip(signals, values):
+            self.values[s.path] = v
+
+
+class SimulatorBackend(Backend):
+    """
+    Ideal-ECU simulation for dry runs
+
+    ``respond(state, signal_name)`` returns the simulated value of a status
+    signal from ``state`` (signal name -> last written value), or None when
+    the model has no opinion; then the last written value of the same name
+    is returned, or None if nothing is known.
+
+    Sleeps run on a VirtualClock; ``changed_at`` (signal name -> virtual
+    time of the last change) lets a model implement ECU timers.
+    """
+    name = "simulator"
+    simulated = True
+
+    def __init__(self, respond=None, initial=None, time_scale=None):
+        self.respond = respond
+        self.state = dict(initial or {})
+        self.clock = VirtualClock(time_scale)
+        self.changed_at = {}
+
+    def read_many(self, signals):
+        values = []
+        for s in signals:
+            value = self.respond(self.state, s.name) if self.respond else None
+            values.append(self.state.get(s.name) if value is None else value)
+        return values
+
+    def write_many(self, signals, values):
+        for s, v in zip(signals, values):
+            if self.state.get(s.name) != v:
+                self.changed_at[s.name] = self.clock.now
+            self.state[s.name] = v
+
+    def elapsed(self, name):
+        """Virtual seconds since ``name`` was last changed (None if never written)"""
+        changed = self.changed_at.get(name)
+        return None if changed is None else self.clock.now - changed
+
+    def sleep(self, seconds):
+        self.clock.sleep(seconds)
+
+    def now(self):
+        return self.clock.now
+
+
+class ReplayBackend(Backend):
+    """
+    Replays a recorded run (TestReporter JSONL)
+
+    Each read of a signal returns the next recorded ``actual`` value of that
+    signal; after the recording runs out the last value is repeated. Writes
+    are accepted and ignored; sleeps advance a virtual clock.
+    """
+    name = "replay"
+
+    def __init__(self, jsonl_path, time_scale=None):
+        self.recorded = {}
+        with open(jsonl_path, encoding="utf-8") as f:
+            for line in f:
+                event = json.loads(line)
+                if event.get("type") == "check":
+                    self.recorded.setdefault(event["signal"], []).append(event.get("actual"))
+        self._cursor = {}
+        self.clock = VirtualClock(time_scale)
+
+    def read_many(self, signals):
+        values = []
+        for s in signals:
+            history = self.recorded.get(s.name)
+            if not history:
+                values.append(None)
+                continue
+            i = self._cursor.get(s.name, 0)
+            values.append(history[min(i, len(history) - 1)])
+            self._cursor[s.name] = i + 1
+        return values
+
+    def write_many(self, signals, values):
+        pass
+
+    def sleep(self, seconds):
+        self.clock.sleep(seconds)
+
+    def now(self):
+        return self.clock.now
+
+
+def make_backend(kind=None, simulate=None, replay_file=None, system_address=None):
+    """
+    Build a backend by name (default: HIL_BACKEND, else veristand);
+    HIL_TIME_SCALE sets the virtual clock speed of simulator and replay
+    """
+    kind = (kind or os.environ.get("HIL_BACKEND", "veristand")).lower()
+    time_scale = float(os.environ["HIL_TIME_SCALE"]) if os.environ.get("HIL_TIME_SCALE") else None
+    if kind == "veristand":
+        return VeriStandBackend(system_address)
+    if kind == "mock":
+        return MockBackend()
+    if kind == "simulator":
+        return SimulatorBackend(simulate, time_scale=time_scale)
+    if kind == "replay":
+        return ReplayBackend(replay_file or os.environ["HIL_REPLAY_FILE"], time_scale)
+    raise ValueError(f"Unknown HIL backend: {kind}")
@@ -0,0 +1,113 @@
+"""
+Duration tests - timer requirements (Max Defrost - Duration) without minutes of idle rig time
+
+A duration case writes its set-up, expects a status to hold its active
+value until a deadline and to show its expired value within a margin
+around it. Verdicts come from the temporal monitors:
+
+    hold      always(status, active, deadline - margin), sampled coarsely
+    expiry    eventually_within(status, expired, 2 * margin), sampled at
+              the normal poll period only around the deadline
+
+A status that drops early fails the hold monitor at once and the case ends
+there. On the simulator and replay backends the waits run on the virtual
+clock (instantly, or at HIL_TIME_SCALE x real time); on real rigs
+``run_cases`` spreads the cases over several rigs and runs them in
+parallel, one case per rig at a time. After each case the rig is reset
+(``reset`` state, default 0 for every set-up signal) and the status has
+to clear before the rig takes the next case, so no case starts on a
+timer another one already ran down.
+
+    cases = [DurationCase("Running", {"VehicleMode": 6, "MaxDefrostRequest": 1},
+                          "MaxDefrostStatus", active=1, expired=0, deadline=600)]
+    run_cases(cases, [make_backend("veristand", system_address=a) for a in rigs])
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from .monitors import always, eventually_within
+from .session import HilSession
+
+
+class DurationCase:
+    """
+    One timer expectation
+
+    Args:
+        name: label for the report
+        setup: {OUT signal: value} that starts the timer
+        signal: IN status to watch
+        active, expired: status value before and after the deadline
+        deadline: seconds from the set-up to the expected change
+        margin: accepted deviation from the deadline in seconds
+    """
+    __slots__ = ("name", "setup", "signal", "active", "expired", "deadline", "margin")
+
+    def __init__(self, name, setup, signal, active, expired, deadline, margin=1.0):
+        self.name = name
+        self.setup = dict(setup)
+        self.signal = signal
+        self.active = active
+        self.expired = expired
+        self.deadline = deadline
+        self.margin = margin
+
+    def __repr__(self):
+        return f"DurationCase({self.name!r}, {self.signal} {self.active}->{self.expired} at {self.deadline:g}s)"
+
+
+def run_case(hil, case, hold_period=1.0, period=0.05, tolerance=0.1):
+    """Run one case on a HilSession; returns True if status held and expired on time"""
+    hil.step(f"Duration: {case.name}",
+             f"{case.signal} stays {case.active} for {case.deadline:g}s, then {case.expired} "
+             f"(+/-{case.margin:g}s)")
+    with hil.tick():
+        hil.set_many(case.setup)
+    hold = max(case.deadline - case.margin, 0.0)
+    passed = hil.monitor([always(case.signal, case.active, hold, tolerance)], period=hold_period)
+    if not passed:
+        hil.note("Expired before the deadline window; expiry check skipped")
+        return False
+    return hil.monitor([eventually_within(case.signal, case.expired, 2 * case.margin, tolerance)],
+                       period=period)
+
+
+def reset_rig(hil, case, reset=None, timeout=5.0, tolerance=0.1):
+    """
+    Write ``reset`` ({OUT signal: value}, default 0 for every signal of the
+    case set-up) and wait until the status shows its expired value; returns
+    True when the rig is back at the baseline
+    """
+    hil.step(f"Reset after {case.name}", f"Back to the baseline, {case.signal} -> {case.expired}")
+    with hil.tick():
+        hil.set_many(dict.fromkeys(case.setup, 0) if reset is None else reset)
+    return hil.wait_for({case.signal: case.expired}, timeout=timeout, tolerance=tolerance)
+
+
+def run_cases(cases, backends, hil_var=None, report_dir=".", reset=None, reset_timeout=5.0, **kwargs):
+    """
+    Run ``cases`` on ``backends`` (one per rig) in parallel; each rig runs
+    one case at a time and is reset (see ``reset_rig``) before it takes the
+    next one. Returns {case name: passed}.
+    """
+    rigs = queue.Queue()
+    for backend in backends:
+        rigs.put(backend)
+
+    def run(case):
+        backend = rigs.get()
+        try:
+            name = f"Duration {case.name}"
+            with HilSession(name, hil_var=hil_var, backend=backend,
+                            report_path=f"{report_dir}/report_{name.replace(' ', '_')}.html") as hil:
+                try:
+                    return case.name, run_case(hil, case, **kwargs)
+                finally:
+                    if not reset_rig(hil, case, reset, reset_timeout, kwargs.get("tolerance", 0.1)):
+                        hil.note(f"{case.signal} did not return to {case.expired}; the next case on this rig starts from here")
+        finally:
+            rigs.put(backend)
+
+    with ThreadPoolExecutor(max_workers=max(len(backends), 1)) as pool:
+        return dict(pool.map(run, cases))
@@ -0,0 +1,95 @@
+"""
+Suite journal - crash-safe record of completed tests for resuming a run
+
+A suite run appends one JSON line per event to a write-ahead journal:
+
+    {"type": "test_start", "test": ...}
+    {"type": "step", "session": ..., "step": ...}
+    {"type": "checkpoint", "test": ..., "state": {signal: value}}
+    {"type": "test_done", "test": ..., "passed": true, "report": ...}
+
+Lines are flushed on every event and fsync'ed in batches (every
+``sync_every`` events or ``sync_interval`` seconds); ``test_done`` and
+``checkpoint`` are always synced, so a finished test is never lost. After
+a crash (gateway drop, VeriStand restart) ``--resume`` reads the journal,
+skips the completed tests and restores the last checkpoint before going
+on. A torn last line from the crash is ignored.
+"""
+
+import json
+import os
+import time
+
+_SYNCED = ("test_done", "checkpoint")
+
+
+class Journal:
+    """
+    Append-only JSONL journal
+
+    Args:
+        path: journal file (appended to, created if missing)
+        sync_every: fsync after this many events
+        sync_interval: fsync at least this often (seconds) while events arrive
+    """
+
+    def __init__(self, path, sync_every=16, sync_interval=1.0):
+        self.path = str(path)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+        self.syncs = 0
+
+    def record(self, kind, **fields):
+        self._file.write(json.dumps({"type": kind, "t": time.time(), **fields}) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if (kind in _SYNCED or self._unsynced >= self.sync_every
+                or time.monotonic() - self._synced_at >= self.sync_interval):
+            self.sync()
+
+    def sync(self):
+        if self._unsynced:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+            self.syncs += 1
+        self._synced_at = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def read_journal(path):
+    """Events of a journal; a torn (partially written) line is skipped"""
+    events = []
+    if not os.path.exists(path):
+        return events
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return events
+
+
+def resume_point(path):
+    """({test: passed} of completed tests, last checkpoint state or None)"""
+    completed, state = {}, None
+    for event in read_journal(path):
+        if event.get("type") == "test_done":
+            completed[event["test"]] = event.get("passed", False)
+        elif event.get("type") == "checkpoint":
+            state = event.get("state")
+    return completed, state
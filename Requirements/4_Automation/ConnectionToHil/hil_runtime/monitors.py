@@ -0,0 +1,217 @@
+"""
+Temporal monitors - always / never / eventually_within / stable_for on the sample stream
+
+A requirement like "MaxDefrostStatus remains active during the transitions"
+is a property of the signal over time, not of one sample taken after a
+sleep. A monitor watches one signal and is fed every sample as it is read
+(``update(t, value)``, O(1), no history kept). Its verdict is None while
+undecided and becomes True/False as soon as the samples decide it:
+
+    always(sig, v, window)           sig == v at every sample for ``window`` s
+    never(sig, v, window)            sig != v at every sample for ``window`` s
+    eventually_within(sig, v, t)     sig == v at some sample within ``t`` s
+    stable_for(sig, v, d, within)    sig == v continuously for ``d`` s,
+                                     starting within ``within`` s
+
+Time is relative to the monitor's first sample. ``v`` is a value (numeric
+compare within ``tolerance``) or a predicate. Samples of None (not received,
+update bit 0) are skipped.
+
+``MonitorSet.on_values`` has the SignalPoller ``on_values`` signature, so
+monitors can ride along on any poll loop; ``HilSession.monitor`` samples
+until every monitor has a verdict and records them as checks.
+"""
+
+import time
+
+
+def _predicate(expected, tolerance):
+    if callable(expected):
+        return expected
+    if isinstance(expected, (int, float)):
+        return lambda v: isinstance(v, (int, float)) and abs(v - expected) <= (tolerance or 0)
+    return lambda v: v == expected
+
+
+class Monitor:
+    """
+    Base class: one signal, one property, one verdict
+
+    Args:
+        signal: signal name
+        expected: value or predicate(value)
+        horizon: seconds after which the property is decided at the latest
+            (None: only when the stream ends)
+        tolerance: numeric tolerance for value compares
+    """
+    kind = "monitor"
+    __slots__ = ("signal", "expected", "predicate", "horizon", "start", "verdict", "decided_at",
+                 "last", "samples", "reason")
+
+    def __init__(self, signal, expected, horizon=None, tolerance=0.1):
+        self.signal = signal
+        self.expected = expected
+        self.predicate = _predicate(expected, tolerance)
+        self.horizon = horizon
+        self.start = None
+        self.verdict = None
+        self.decided_at = None
+        self.last = None
+        self.samples = 0
+        self.reason = ""
+
+    def update(self, t, value):
+        """Feed one sample taken at time ``t`` (seconds); returns the verdict"""
+        if self.verdict is not None or value is None:
+            return self.verdict
+        if self.start is None:
+            self.start = t
+        self.samples += 1
+        self.last = value
+        self._step(t - self.start, self.predicate(value))
+        return self.verdict
+
+    def finish(self, t=None):
+        """End of the stream: decide what is still open"""
+        if self.verdict is None:
+            elapsed = 0.0 if self.start is None or t is None else t - self.start
+            self._decide(self._at_end(), elapsed, f"stream ended after {elapsed:.2f}s")
+        return self.verdict
+
+    def _decide(self, verdict, elapsed, reason):
+        self.verdict = verdict
+        self.decided_at = elapsed
+        self.reason = reason
+
+    def _step(self, elapsed, holds):
+        raise NotImplementedError
+
+    def _at_end(self):
+        return False
+
+    def describe(self):
+        expected = getattr(self.expected, "__name__", None) if callable(self.expected) else self.expected
+        return f"{self.kind}({self.signal} == {expected}{self._window()})"
+
+    def _window(self):
+        return f", {self.horizon:g}s" if self.horizon is not None else ""
+
+    def __repr__(self):
+        return f"{self.describe()} -> {self.verdict}"
+
+
+class Always(Monitor):
+    """Property holds at every sample for ``horizon`` seconds"""
+    kind = "always"
+    __slots__ = ()
+
+    def _step(self, elapsed, holds):
+        if not holds:
+            self._decide(False, elapsed, f"violated at {elapsed:.2f}s")
+        elif elapsed >= self.horizon:
+            self._decide(True, elapsed, f"held for {elapsed:.2f}s ({self.samples} samples)")
+
+
+class Never(Always):
+    """Property fails at every sample for ``horizon`` seconds"""
+    kind = "never"
+    __slots__ = ()
+
+    def _step(self, elapsed, holds):
+        if holds:
+            self._decide(False, elapsed, f"occurred at {elapsed:.2f}s")
+        elif elapsed >= self.horizon:
+            self._decide(True, elapsed, f"absent for {elapsed:.2f}s ({self.samples} samples)")
+
+
+class EventuallyWithin(Monitor):
+    """Property holds at some sample within ``horizon`` seconds"""
+    kind = "eventually_within"
+    __slots__ = ()
+
+    def _step(self, elapsed, holds):
+        if holds and elapsed <= self.horizon:
+            self._decide(True, elapsed, f"reached after {elapsed:.2f}s")
+        elif elapsed > self.horizon:
+            self._decide(False, elapsed, f"not reached within {self.horizon:g}s")
+
+
+class StableFor(Monitor):
+    """Property holds continuously for ``duration`` seconds, starting within ``horizon``"""
+    kind = "stable_for"
+    __slots__ = ("duration", "since")
+
+    def __init__(self, signal, expected, duration, within=None, tolerance=0.1):
+        super().__init__(signal, expected, None if within is None else within + duration, tolerance)
+        self.duration = duration
+        self.since = None
+
+    def _step(self, elapsed, holds):
+        if not holds:
+            self.since = None
+        elif self.since is None:
+            self.since = elapsed
+        if self.since is not None and elapsed - self.since >= self.duration:
+            self._decide(True, elapsed, f"stable from {self.since:.2f}s to {elapsed:.2f}s")
+        elif self.horizon is not None and elapsed >= self.horizon:
+            self._decide(False, elapsed, f"not stable for {self.duration:g}s within {self.horizon:g}s")
+
+    def _window(self):
+        return f", {self.duration:g}s" + (f" within {self.horizon - self.duration:g}s"
+                                          if self.horizon is not None else "")
+
+
+def always(signal, expected, window, tolerance=0.1):
+    return Always(signal, expected, window, tolerance)
+
+
+def never(signal, expected, window, tolerance=0.1):
+    return Never(signal, expected, window, tolerance)
+
+
+def eventually_within(signal, expected, timeout, tolerance=0.1):
+    return EventuallyWithin(signal, expected, timeout, tolerance)
+
+
+def stable_for(signal, expected, duration, within=None, tolerance=0.1):
+    return StableFor(signal, expected, duration, within, tolerance)
+
+
+class MonitorSet:
+    """
+    Monitors grouped by signal, fed from a batched read
+
+    Args:
+        monitors: Monitor instances
+        clock: callable() -> seconds, the time stamp of each batch
+    """
+
+    def __init__(self, monitors, clock=time.monotonic):
+        self.monitors = list(monitors)
+        self.clock = clock
+        self.by_signal = {}
+        for monitor in self.monitors:
+            self.by_signal.setdefault(monitor.signal, []).append(monitor)
+
+    @property
+    def pending(self):
+        return [m for m in self.monitors if m.verdict is None]
+
+    def on_values(self, keys, values):
+        """Feed one batch (keys are Signal objects or names); returns its time stamp"""
+        t = self.clock()
+        for key, value in zip(keys, values):
+            for monitor in self.by_signal.get(getattr(key, "name", key), ()):
+                monitor.update(t, value)
+        return t
+
+    def within_horizon(self, t):
+        """Undecided monitors whose horizon, counted from their own first sample, has not passed at ``t``"""
+        return [m for m in self.monitors if m.verdict is None and m.start is not None
+                and m.horizon is not None and t - m.start < m.horizon]
+
+    def finish(self):
+        t = self.clock()
+        for monitor in self.monitors:
+            monitor.finish(t)
+        return all(m.verdict for m in self.monitors)
@@ -0,0 +1,76 @@
+"""
+Suite ordering - run scenarios in the order that needs the fewest rig state changes
+
+Every scenario declares the state it starts from (its pre-conditions) and,
+through its Set actions and expectations, the state it leaves behind.
+Running the suite in file order and tearing down to ignition off between
+sections pays the full set-up of every scenario - and a CCM wake-up each
+time VehicleMode has to leave 0.
+
+``order_suite`` treats the suite as an (asymmetric) travelling salesman
+problem over rig states: the cost of going from one scenario to the next is
+the weighted number of signals whose value has to change,
+
+    cost(exit state of A -> pre-conditions of B)
+
+and the route is built greedily - always the cheapest next scenario, ties
+in file order. Combined with ``HilSession.ensure_state`` a pre-condition
+that already holds is neither written nor awaited, so the skipped teardown
+and re-setup cost nothing on the rig.
+"""
+
+from .steps import Set
+
+IGNITION_OFF = {"VehicleMode": 0}
+# Relative cost of changing a signal; a VehicleMode change means a CCM
+# wake-up or shutdown and dominates everything else
+DEFAULT_COSTS = {"VehicleMode": 10.0}
+DEFAULT_COST = 1.0
+
+
+def entry_state(scenario):
+    """{signal: value} the scenario needs before it starts"""
+    return dict(scenario.preconditions)
+
+
+def exit_state(scenario, start=None):
+    """{signal: value} after the scenario ran from ``start``"""
+    state = dict(start or {})
+    state.update(scenario.preconditions)
+    for action, expects in scenario.nodes:
+        if isinstance(action, Set):
+            state[action.name] = action.value
+        state.update(expects)
+    return state
+
+
+def transition_cost(state, target, costs=None, default=DEFAULT_COST):
+    """Weighted count of the signals of ``target`` that ``state`` does not already hold"""
+    costs = DEFAULT_COSTS if costs is None else costs
+    return sum(costs.get(name, default) for name, value in target.items() if state.get(name) != value)
+
+
+def order_suite(scenarios, start=IGNITION_OFF, costs=None):
+    """
+    Greedy nearest-neighbour order of ``scenarios`` ([(key, Scenario)])
+
+    Returns (ordered [(key, Scenario)], total transition cost).
+    """
+    remaining = list(scenarios)
+    entries = [entry_state(s) for _, s in remaining]
+    state = dict(start)
+    order, total = [], 0.0
+    while remaining:
+        costs_now = [transition_cost(state, entry, costs) for entry in entries]
+        best = min(range(len(remaining)), key=costs_now.__getitem__)
+        total += costs_now[best]
+        key, scenario = remaining.pop(best)
+        entries.pop(best)
+        order.append((key, scenario))
+        state = exit_state(scenario, state)
+    return order, total
+
+
+def teardown_cost(scenarios, start=IGNITION_OFF, costs=None):
+    """Cost of the current practice: every scenario set up from ``start``"""
+    return sum(transition_cost(start, entry_state(s), costs) for _, s in scenarios)
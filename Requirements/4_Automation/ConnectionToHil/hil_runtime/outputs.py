@@ -0,0 +1,119 @@
+"""
+Change-only, coalescing output layer for OUT signals
+
+A write-through shadow of the last value written to every OUT channel:
+- a write of the value the channel already has is suppressed
+- inside ``tick()`` writes are buffered; repeated writes of one channel are
+  coalesced to the last value and everything is flushed in one batched
+  write at the end of the tick, ordered by frame so all signals of one CAN
+  frame go out in the same update
+
+Counters (``stats()``) show how many writes were sent, suppressed and
+coalesced.
+"""
+
+from contextlib import contextmanager
+
+_MISSING = object()
+
+
+def frame_of(path):
+    """Frame part of a channel path (.../Single-Point/<frame>/<signal>)"""
+    return path.rpartition("/")[0]
+
+
+class OutputCache:
+    """
+    Shadow cache in front of a backend's write_many
+
+    Args:
+        backend: Backend receiving the batched writes
+        on_flush: callable(signals, values) run after each backend write
+    """
+
+    def __init__(self, backend, on_flush=None):
+        self.backend = backend
+        self.on_flush = on_flush
+        self.shadow = {}    # path -> last written value
+        self._pending = {}  # path -> (signal, value), insertion ordered
+        self._depth = 0
+        self.requested = 0
+        self.written = 0
+        self.suppressed = 0
+        self.coalesced = 0
+        self.flushes = 0
+
+    def write(self, signals, values):
+        """Queue writes; flushed immediately unless inside tick()"""
+        for signal, value in zip(signals, values):
+            self.requested += 1
+            path = signal.path
+            if path in self._pending:
+                self.coalesced += 1
+                if self.shadow.get(path, _MISSING) == value:
+                    del self._pending[path]  # back to the value on the bus
+                else:
+                    self._pending[path] = (signal, value)
+            elif self.shadow.get(path, _MISSING) == value:
+                self.suppressed += 1
+            else:
+                self._pending[path] = (signal, value)
+        if not self._depth:
+            self.flush()
+
+    @contextmanager
+    def tick(self):
+        """Buffer all writes of the block into one batched update"""
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                self.flush()
+
+    def flush(self):
+        """Send pending writes in one batched call, grouped by frame"""
+        if not self._pending:
+            return
+        frames = {}
+        for signal, value in self._pending.values():
+            frames.setdefault(frame_of(signal.path), []).append((signal, value))
+        self._pending.clear()
+        signals, values = [], []
+        for items in frames.values():
+            for signal, value in items:
+                signals.append(signal)
+                values.append(value)
+        self.backend.write_many(signals, values)
+        for signal, value in zip(signals, values):
+            self.shadow[signal.path] = value
+        self.written += len(signals)
+        self.flushes += 1
+        if self.on_flush:
+            self.on_flush(signals, values)
+
+    def current(self, signal, default=None):
+        """Value the channel has (or will have after the pending flush)"""
+        pending = self._pending.get(signal.path)
+        if pending is not None:
+            return pending[1]
+        return self.shadow.get(signal.path, default)
+
+    def invalidate(self, paths=None):
+        """Forget shadow values (all, or ``paths``) so the next write goes out"""
+        if paths is None:
+            self.shadow.clear()
+        else:
+            for path in paths:
+                self.shadow.pop(path, None)
+
+    def stats(self):
+        return {
+            "requested": self.requested,
+            "written": self.written,
+            "suppressed": self.suppressed,
+            "coalesced": self.coalesced,
+            "flushes": self.flushes,
+        }
+
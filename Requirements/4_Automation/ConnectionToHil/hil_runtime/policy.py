@@ -0,0 +1,69 @@
+"""
+Execution policy - when a HilSession stops a test early
+
+A generated script records a failed check and carries on through every
+remaining step and sleep; with a broken pre-condition that is 30-60 s of
+rig time for a result that is already red. With a policy the session
+aborts instead: it runs a safe teardown at once, notes what was skipped,
+writes the report and raises TestAborted.
+
+Set per session (``HilSession(policy=...)``) or for a whole suite run:
+
+    HIL_FAIL_FAST=1        abort on the first failed check of a pre-condition step
+    HIL_MAX_FAILURES=N     abort after N failed checks
+
+Without an explicit teardown an abort brings the rig to ``safe_state``:
+every request the script wrote goes back to 0 and the ignition goes off.
+"""
+
+import os
+import re
+
+from .ordering import IGNITION_OFF
+
+_PRECONDITION_STEP = re.compile(r"pre-?conditions?", re.I)
+
+
+class TestAborted(Exception):
+    """Raised by HilSession when its execution policy stops the test"""
+    __test__ = False  # not a pytest test class
+
+
+def safe_state(hil):
+    """Default abort teardown: reset every OUT signal written so far to 0, ignition off"""
+    state = {name: 0 for name in hil.checkpoint()}
+    state.update((name, value) for name, value in IGNITION_OFF.items() if name in hil.signals.outputs)
+    if state:
+        with hil.tick():
+            hil.set_many(state)
+
+
+class ExecutionPolicy:
+    """
+    Args:
+        abort_on_precondition: abort at the first failed check in a step whose
+            name mentions pre-conditions
+        max_failures: abort after this many failed checks (None: never)
+        teardown: {OUT signal: value} written, or callable(hil) run, right
+            after an abort (None: safe_state; False: no teardown)
+    """
+    __slots__ = ("abort_on_precondition", "max_failures", "teardown")
+
+    def __init__(self, abort_on_precondition=False, max_failures=None, teardown=None):
+        self.abort_on_precondition = abort_on_precondition
+        self.max_failures = max_failures
+        self.teardown = safe_state if teardown is None else teardown
+
+    @classmethod
+    def from_env(cls, teardown=None):
+        fail_fast = os.environ.get("HIL_FAIL_FAST", "").lower() in ("1", "true", "yes")
+        max_failures = os.environ.get("HIL_MAX_FAILURES")
+        return cls(fail_fast, int(max_failures) if max_failures else None, teardown)
+
+    def abort_reason(self, step_name, failed_checks, failed_now):
+        """Why the test has to stop now, or None to carry on"""
+        if failed_now and self.abort_on_precondition and _PRECONDITION_STEP.search(step_name or ""):
+            return f"pre-condition failed in '{step_name}'"
+        if self.max_failures is not None and failed_checks >= self.max_failures:
+            return f"{failed_checks} failed checks (limit {self.max_failures})"
+        return None
@@ -0,0 +1,109 @@
+"""
+SignalPoller - one background poll loop serving many concurrent waits
+
+Each ``wait_for`` registers a waiter; a single poll task reads the union of
+all watched channels with one batched read per cycle and fans the values
+out to the waiters. N concurrent waits cost one gateway round trip per
+cycle instead of N. The poll task starts with the first waiter and stops
+when the last one is done.
+
+    poller = SignalPoller(backend.read_many, period=0.05)
+    results = await asyncio.gather(
+        poller.wait_for(status, lambda v: v == 1, timeout=5),
+        poller.wait_for(blower, lambda v: v == 10, timeout=5),
+    )
+"""
+
+import asyncio
+
+
+class _Waiter:
+    __slots__ = ("key", "predicate", "future", "last")
+
+    def __init__(self, key, predicate, future):
+        self.key = key
+        self.predicate = predicate
+        self.future = future
+        self.last = None
+
+
+class SignalPoller:
+    """
+    Shared poller
+
+    Args:
+        read_values: callable(keys) -> values, one batched (blocking) read;
+            keys are whatever the waits use (Signal objects, paths, names)
+        period: seconds between poll cycles
+        on_values: callable(keys, values) run after every cycle
+        abort_event: threading.Event; when set all waits end unmatched
+    """
+
+    def __init__(self, read_values, period=0.05, on_values=None, abort_event=None):
+        self.read_values = read_values
+        self.period = period
+        self.on_values = on_values
+        self.abort_event = abort_event
+        self.cycles = 0
+        self.keys_read = 0
+        self.read_errors = 0
+        self._waiters = []
+        self._task = None
+
+    async def wait_for(self, key, predicate, timeout):
+        """
+        Wait until ``predicate(value)`` holds for ``key``
+
+        Returns (matched, last value seen); last is None if never read.
+        """
+        waiter = _Waiter(key, predicate, asyncio.get_running_loop().create_future())
+        self._waiters.append(waiter)
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        try:
+            done, _ = await asyncio.wait({waiter.future}, timeout=timeout)
+        finally:
+            self._waiters.remove(waiter)
+        if done:
+            return waiter.future.result(), waiter.last
+        return False, waiter.last
+
+    async def wait_all(self, predicates, timeout):
+        """Concurrent waits for {key: predicate}; returns {key: (matched, last)}"""
+        keys = list(predicates)
+        results = await asyncio.gather(*(self.wait_for(k, predicates[k], timeout) for k in keys))
+        return dict(zip(keys, results))
+
+    async def _run(self):
+        while True:
+            active = [w for w in self._waiters if not w.future.done()]
+            if not active:
+                return
+            if self.abort_event is not None and self.abort_event.is_set():
+                for waiter in active:
+                    waiter.future.set_result(False)
+                return
+            keys = list(dict.fromkeys(w.key for w in active))
+            try:
+                # Blocking gateway call: keep the event loop free while it runs
+                values = await asyncio.to_thread(self.read_values, keys)
+            except Exception:
+                self.read_errors += 1
+                values = None
+            if values is not None:
+                self.cycles += 1
+                self.keys_read += len(keys)
+                if self.on_values:
+                    self.on_values(keys, values)
+                current = dict(zip(keys, values))
+                for waiter in active:
+                    if waiter.future.done() or waiter.key not in current:
+                        continue
+                    value = waiter.last = current[waiter.key]
+                    if value is not None and waiter.predicate(value):
+                        waiter.future.set_result(True)
+            if any(not w.future.done() for w in self._waiters):
+                await asyncio.sleep(self.period)
+
+    def stats(self):
+        return {"cycles": self.cycles, "keys_read": self.keys_read, "read_errors": self.read_errors}
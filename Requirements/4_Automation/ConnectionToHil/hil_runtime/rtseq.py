@@ -0,0 +1,190 @@
+"""
+Compile scenario steps into VeriStand real-time sequences
+
+Host-side scenarios pay a gateway round trip per ChannelReference access
+and sleep on the host clock. ``compile_steps`` turns a step list into the
+source of a ``@nivs_rt_sequence`` function (see Examples/engine_demo_*.py)
+that runs deterministically on the target with ``run_py_as_rtseq``:
+
+    Set        -> channel.value = value
+    Wait       -> wait(DoubleValue(seconds))
+    WaitUntil  -> nivs_yield() loop until in tolerance or timeout
+    Check      -> out-of-tolerance adds the check's bit to the result
+
+The sequence returns one integer: a bit per failed check/wait, so all
+verdicts come back in a single transfer. ``run_py_as_rtseq`` hands back
+nothing but that return value (parameters go to the target as constants),
+so ``run_on_target`` reads the checked channels once after the run and
+reports those values, marked as read after the sequence. Compiled sources
+are cached on disk keyed by the scenario hash (steps + channel paths), so
+an unchanged scenario is never regenerated or re-parsed.
+"""
+
+import importlib.util
+import os
+from pathlib import Path
+
+from .steps import Check, Set, Wait, WaitUntil, steps_hash
+
+MAX_RESULTS = 62  # result bits in the returned I64 (sign bit kept clear)
+DEFAULT_CACHE_DIR = os.environ.get("HIL_RTSEQ_CACHE", ".rtseq_cache")
+SOURCE_VERSION = 3  # bumped when the generated source changes; older cached files are not reused
+
+_HEADER = '''\
+# Generated by hil_runtime.rtseq - do not edit
+from niveristand import nivs_rt_sequence
+from niveristand.clientapi import ChannelReference, DoubleValue, I64Value
+from niveristand.library import nivs_yield, seqtime, wait
+
+
+@nivs_rt_sequence
+def {func}():
+    failed = I64Value(0)
+    started = DoubleValue(0)
+'''
+
+
+def _num(value):
+    return repr(float(value))
+
+
+def compile_steps(steps, paths, func_name="scenario"):
+    """
+    RT sequence source for ``steps``
+
+    Args:
+        steps: Set/Wait/WaitUntil/Check list
+        paths: signal name -> channel path
+    Returns:
+        (source, results) where results lists the Check/WaitUntil steps in
+        result-bit order
+    """
+    channels = {}
+    body = []
+    results = []
+
+    def channel(name):
+        if name not in paths:
+            raise KeyError(f"Signal '{name}' has no channel path")
+        if name not in channels:
+            channels[name] = f"ch_{len(channels)}"
+        return channels[name]
+
+    def out_of_band(var, value, tolerance):
+        return f"{var}.value < {_num(value - tolerance)} or {var}.value > {_num(value + tolerance)}"
+
+    for step in steps:
+        if isinstance(step, Set):
+            body.append(f"    {channel(step.name)}.value = {_num(step.value)}")
+        elif isinstance(step, Wait):
+            body.append(f"    wait(DoubleValue({_num(step.seconds)}))")
+        elif isinstance(step, (WaitUntil, Check)):
+            if len(results) == MAX_RESULTS:
+                raise ValueError(f"More than {MAX_RESULTS} checks in one sequence; split the scenario")
+            var = channel(step.name)
+            bit = 1 << len(results)
+            results.append(step)
+            if isinstance(step, WaitUntil):
+                body.append("    started.value = seqtime()")
+                body.append(f"    while ({out_of_band(var, step.value, step.tolerance)}) "
+                            f"and seqtime() - started.value < {_num(step.timeout)}:")
+                body.append("        nivs_yield()")
+            body.append(f"    if {out_of_band(var, step.value, step.tolerance)}:")
+            body.append(f"        failed.value = failed.value + {bit}")
+        else:
+            raise TypeError(f"Unsupported step: {step!r}")
+
+    declarations = [f"    {var} = ChannelReference({paths[name]!r})" for name, var in channels.items()]
+    source = (_HEADER.format(func=func_name) + "\n".join(declarations + body)
+              + "\n    return failed.value\n")
+    return source, results
+
+
+class CompiledSequence:
+    """A cached, compiled scenario; ``run()`` executes it on the target"""
+
+    def __init__(self, key, path, results):
+        self.key = key
+        self.path = path
+        self.results = results
+        self._func = None
+
+    def load(self):
+        """Import the generated module (needs niveristand)"""
+        if self._func is None:
+            spec = importlib.util.spec_from_file_location(f"rtseq_{self.key[:16]}", self.path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            self._func = module.scenario
+        return self._func
+
+    def run(self):
+        """Run deterministically on the target; returns [(step, passed)]"""
+        from niveristand import run_py_as_rtseq
+        failed = int(run_py_as_rtseq(self.load()))
+        return self.decode(failed)
+
+    def decode(self, failed):
+        return [(step, not failed & (1 << i)) for i, step in enumerate(self.results)]
+
+
+class SequenceCache:
+    """Compiled sequences keyed by scenario hash, in memory and on disk"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self._compiled = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, steps, paths):
+        used = {s.name: paths.get(s.name) for s in steps if hasattr(s, "name")}
+        key = steps_hash(steps, used)
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            self.hits += 1
+            return compiled
+        path = self.cache_dir / f"scenario_v{SOURCE_VERSION}_{key[:16]}.py"
+        results = [s for s in steps if isinstance(s, (WaitUntil, Check))]
+        if path.exists():
+            self.hits += 1
+        else:
+            self.misses += 1
+            source, results = compile_steps(steps, paths)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(source, encoding="utf-8")
+            os.replace(tmp, path)
+        compiled = self._compiled[key] = CompiledSequence(key, path, results)
+        return compiled
+
+
+def run_on_target(hil, steps, cache=None):
+    """
+    Compile ``steps`` against the session's signal map, run them on the
+    target and record the outcome of every check in the session report
+    """
+    cache = cache or SequenceCache()
+    paths = {}
+    for step in steps:
+        if isinstance(step, Set):
+            signal = hil.signals.output(step.name)
+        elif isinstance(step, (WaitUntil, Check)):
+            signal = hil.signals.input(step.name)
+        else:
+            continue
+        if signal is not None:
+            paths[step.name] = signal.path
+    compiled = cache.get(steps, paths)
+    hil.note(f"Running compiled sequence {compiled.key[:12]} on target ({len(steps)} steps)")
+    outcomes = compiled.run()
+    # Verdicts are from the target; the values are only what the channels hold now
+    after = hil.get_many(list(dict.fromkeys(step.name for step, _ in outcomes)), default=None)
+    all_passed = True
+    for step, passed in outcomes:
+        value = after[step.name]
+        actual = "N/A (after run)" if value is None else f"{value} (after run)"
+        hil.reporter.add_check(step.name, step.value, actual, passed, step.tolerance)
+        all_passed &= passed
+    hil._after_checks(all_passed)  # execution policy applies to on-target checks too
+    return all_passed
@@ -0,0 +1,454 @@
+"""
+Scenario DSL - run the scenario markdown files directly
+
+The scenario files (FinalTest/scenario_req_section_*.md, Scenarios/*.md)
+share one structure:
+
+    # Scenario: <title>
+    **Pre-conditions:**   - `Signal` == value
+    **Trigger:**          - Set `Signal` to value
+    **Steps:**            1. Set `Signal` to value / Wait for 5 seconds
+    **Expected Outcome:** - `Signal` == value
+                          - When `A` == x and `B` == y, then `C` == z
+
+``parse_scenario`` compiles that into a compact step graph: the actions in
+order, each carrying the expectations that become due once the state
+written so far satisfies their "When" conditions; unconditional
+expectations hang off the last action. Lines that cannot be automated are
+kept as manual notes. ``load_scenario`` caches the graph by content hash
+(memory and .scenario_cache/), so an unchanged file is parsed once.
+
+``run_scenario`` binds the graph to a HilSession: pre-conditions go through
+``ensure_state`` (only what differs is written or awaited), consecutive
+writes go out as one batched tick and consecutive expectations are awaited
+together by one poller.
+
+    python -m hil_runtime FinalTest/scenario_req_section_3_*.md --backend simulator
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from .policy import TestAborted
+from .steps import STEP_TYPES, Check, Set, Wait, WaitUntil
+
+PARSER_VERSION = 1
+DEFAULT_CACHE_DIR = os.environ.get("HIL_SCENARIO_CACHE", ".scenario_cache")
+DEFAULT_SETTLE = 1.0  # seconds for "Wait for the system to stabilize" without a number
+
+# Enumerations used by the max defrost requirement scenarios
+VEHICLE_MODE_ENUM = {
+    'Ignition Off': 0,
+    'Parked': 1,
+    'Living': 2,
+    'Accessory': 3,
+    'PreRunning': 4,
+    'Cranking': 5,
+    'Running': 6,
+}
+
+STATE_ENUM = {
+    'Released': 0,
+    'Pressed': 1,
+    'Off': 0,
+    'On': 1,
+    'Inactive': 0,
+    'Active': 1,
+    'Recirculation Off': 0,
+    'Recirculation On': 1,
+}
+
+_WORDS = {k.lower(): v for k, v in {**VEHICLE_MODE_ENUM, **STATE_ENUM, "True": 1, "False": 0}.items()}
+
+_SECTION = re.compile(r"^\*\*(Description|Pre-conditions|Trigger|Steps|Expected Outcome):\*\*\s*(.*)$")
+_ITEM = re.compile(r"^(\s*)(?:[-*]|\d+\.)\s+(.*)$")
+_ACTION = re.compile(r"\b(?:set|change|send)\b.*?`(\w+)`\s*(?:to|==|=)\s*(.+)$", re.I)
+_WAIT = re.compile(r"^wait\b", re.I)
+_SECONDS = re.compile(r"(\d+(?:\.\d+)?)\s*(?:s\b|sec)", re.I)
+_RELATION = re.compile(r"`(\w+)`\s*(?:==|=|\bis\b)\s*(.+)$", re.I)
+_QUOTED = re.compile(r"^[`'\"]([^`'\"]+)[`'\"]")
+_NUMBER = re.compile(r"^(0x[0-9a-fA-F]+|-?\d+(?:\.\d+)?)(?![\w.])")
+_PAREN_NUMBER = re.compile(r"\((-?\d+(?:\.\d+)?)\)")
+_SPLIT_AND = re.compile(r"\s+and\s+(?=`)", re.I)
+
+
+def _number(text):
+    if text.lower().startswith("0x"):
+        return int(text, 16)
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def parse_value(text):
+    """Numeric value of a scenario value expression, or None"""
+    text = text.strip().rstrip(".:;,")
+    quoted = _QUOTED.match(text)
+    if quoted:
+        token = quoted.group(1).strip()
+        if token.lower() in _WORDS:
+            return _WORDS[token.lower()]
+        if _NUMBER.match(token):
+            return _number(_NUMBER.match(token).group(1))
+    number = _NUMBER.match(text)
+    if number:
+        return _number(number.group(1))
+    paren = _PAREN_NUMBER.search(text)
+    if paren:
+        return _number(paren.group(1))
+    word = re.match(r"^[A-Za-z ]+?(?=\s*(?:\(|$))", text)
+    if word and word.group(0).strip().lower() in _WORDS:
+        return _WORDS[word.group(0).strip().lower()]
+    return None
+
+
+def parse_relation(text):
+    """(signal, value) from "`Signal` == value", or None"""
+    m = _RELATION.search(text)
+    if not m:
+        return None
+    value = parse_value(m.group(2))
+    return None if value is None else (m.group(1), value)
+
+
+class Scenario:
+    """
+    Compiled scenario graph
+
+    preconditions: [(signal, value)] - written or awaited depending on direction
+    nodes: [[action, [(signal, value), ...]]] - expectations due after the action
+    manual: lines that need a human
+    """
+    __slots__ = ("title", "test_type", "description", "preconditions", "nodes", "manual", "source_hash")
+
+    def __init__(self, title="", test_type="", description="", preconditions=None, nodes=None,
+                 manual=None, source_hash=""):
+        self.title = title
+        self.test_type = test_type
+        self.description = description
+        self.preconditions = preconditions or []
+        self.nodes = nodes or []
+        self.manual = manual or []
+        self.source_hash = source_hash
+
+    @property
+    def automated(self):
+        return self.test_type.upper() != "MANUAL"
+
+    @property
+    def expectations(self):
+        """Number of compiled expectations (0: nothing the run could verify)"""
+        return sum(len(expects) for _, expects in self.nodes)
+
+    def to_json(self):
+        data = {k: getattr(self, k) for k in self.__slots__}
+        data["nodes"] = [[[type(a).__name__, *a], expects] for a, expects in self.nodes]
+        return data
+
+    @classmethod
+    def from_json(cls, data):
+        data = dict(data)
+        data["preconditions"] = [tuple(p) for p in data["preconditions"]]
+        data["nodes"] = [[STEP_TYPES[a[0]](*a[1:]), [tuple(e) for e in expects]]
+                         for a, expects in data["nodes"]]
+        return cls(**data)
+
+
+def _sections(text):
+    sections, current = {}, None
+    for line in text.splitlines():
+        header = _SECTION.match(line.strip())
+        if header:
+            current = header.group(1)
+            sections[current] = [header.group(2)] if header.group(2) else []
+        elif current and line.strip():
+            sections[current].append(line.rstrip())
+    return sections
+
+
+def _items(lines):
+    """Top-level items, each with its indented sub-items"""
+    items = []
+    for line in lines:
+        m = _ITEM.match(line)
+        if m and not m.group(1) or (m is None and not items):
+            items.append([(m.group(2) if m else line).strip(), []])
+        elif m and items:
+            items[-1][1].append(m.group(2).strip())
+    return items
+
+
+def _action(text):
+    if _WAIT.match(text):
+        seconds = _SECONDS.search(text)
+        return Wait(float(seconds.group(1)) if seconds else DEFAULT_SETTLE)
+    m = _ACTION.search(text)
+    if m:
+        value = parse_value(m.group(2))
+        if value is not None:
+            return Set(m.group(1), value)
+    return None
+
+
+def _expectation(text, subitems):
+    """(conditions, outcomes) of one expected-outcome item, or None"""
+    body = text[len("when"):] if text.lower().startswith("when") else None
+    if body is None:
+        relation = parse_relation(text)
+        return ([], [relation]) if relation else None
+    split = re.search(r",?\s*then\b|:\s*$", body, re.I)
+    cond_text, then_text = (body[:split.start()], body[split.end():]) if split else (body, "")
+    conditions = [parse_relation(part) for part in _SPLIT_AND.split(cond_text)]
+    outcomes = [parse_relation(part) for part in ([then_text] if then_text.strip() else []) + subitems]
+    if not conditions or None in conditions or not outcomes or None in outcomes:
+        return None
+    return conditions, outcomes
+
+
+def parse_scenario(text):
+    """Compile scenario markdown into a Scenario graph"""
+    title = re.search(r"^#\s*Scenario:\s*(.+)$", text, re.M)
+    test_type = re.search(r"^#\s*Test Type:\s*(\w+)", text, re.M)
+    sections = _sections(text)
+    scenario = Scenario(title=title.group(1).strip() if title else "",
+                        test_type=test_type.group(1) if test_type else "",
+                        description=" ".join(sections.get("Description", [])).strip(),
+                        source_hash=content_hash(text))
+
+    for item, _ in _items(sections.get("Pre-conditions", [])):
+        relation = parse_relation(item)
+        if relation:
+            scenario.preconditions.append(relation)
+        else:
+            scenario.manual.append(f"Pre-condition: {item}")
+
+    actions = []
+    for item, _ in _items(sections.get("Steps", [])):
+        action = _action(item)
+        if action:
+            actions.append(action)
+        elif not re.match(r"^(verify|monitor|establish|ensure|check)\b", item, re.I):
+            scenario.manual.append(f"Step: {item}")
+    if not any(isinstance(a, Set) for a in actions):
+        # Scenarios without set steps carry the stimulus in the trigger
+        triggers = [_action(item) for item, _ in _items(sections.get("Trigger", []))]
+        actions.extend(a for a in triggers if a)
+    scenario.nodes = [[action, []] for action in actions]
+
+    for item, subitems in _items(sections.get("Expected Outcome", [])):
+        parsed = _expectation(item, subitems)
+        if parsed is None:
+            if "`" in item:
+                scenario.manual.append(f"Expected: {item}")
+            continue
+        conditions, outcomes = parsed
+        placed = _place(scenario, conditions, outcomes)
+        if not placed:
+            scenario.manual.append(f"Expected (condition never reached): {item}")
+    return scenario
+
+
+def _place(scenario, conditions, outcomes):
+    """Attach outcomes to every action after which the conditions become true"""
+    if not scenario.nodes:
+        if conditions:
+            return False
+        scenario.nodes.append([Wait(0.0), []])
+    written = {a.name for a, _ in scenario.nodes if isinstance(a, Set)}
+    # Conditions on signals the scenario never writes (statuses) cannot be tracked
+    tracked = [(s, v) for s, v in conditions if s in written]
+    if not tracked:
+        scenario.nodes[-1][1].extend(outcomes)
+        return True
+    state = dict(scenario.preconditions)
+    placed, was_true = False, False
+    for action, expects in scenario.nodes:
+        if isinstance(action, Set):
+            state[action.name] = action.value
+        now_true = all(state.get(s) == v for s, v in tracked)
+        if now_true and not was_true:
+            expects.extend(outcomes)
+            placed = True
+        was_true = now_true
+    return placed
+
+
+def content_hash(text):
+    return hashlib.sha256(f"{PARSER_VERSION}\n{text}".encode("utf-8")).hexdigest()
+
+
+_memory_cache = {}
+
+
+def load_scenario(path, cache_dir=DEFAULT_CACHE_DIR):
+    """Parsed scenario for ``path``, cached by content hash"""
+    text = Path(path).read_text(encoding="utf-8")
+    key = content_hash(text)
+    scenario = _memory_cache.get(key)
+    if scenario is not None:
+        return scenario
+    cached = Path(cache_dir) / f"{key[:24]}.json" if cache_dir else None
+    if cached is not None and cached.exists():
+        scenario = Scenario.from_json(json.loads(cached.read_text(encoding="utf-8")))
+    else:
+        scenario = parse_scenario(text)
+        if cached is not None:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cached.with_suffix(".tmp")
+            tmp.write_text(json.dumps(scenario.to_json()), encoding="utf-8")
+            os.replace(tmp, cached)
+    _memory_cache[key] = scenario
+    return scenario
+
+
+def to_blocks(scenario, signals, timeout=5.0, tolerance=0.1):
+    """
+    Bind a scenario to a SignalMap: [(label, [steps])]
+
+    Pre-conditions on OUT signals are written, the others awaited.
+    Expectations become WaitUntil steps.
+    """
+    pre_sets = [Set(s, v) for s, v in scenario.preconditions if s in signals.outputs]
+    pre_waits = [WaitUntil(s, v, timeout, tolerance) for s, v in scenario.preconditions
+                 if s not in signals.outputs]
+    blocks = [("Pre-conditions", pre_sets + pre_waits)] if scenario.preconditions else []
+    for i, (action, expects) in enumerate(scenario.nodes, 1):
+        label = f"Step {i}: " + (f"Set {action.name} = {action.value}" if isinstance(action, Set)
+                                 else f"Wait {action.seconds:g}s")
+        blocks.append((label, [action] + [WaitUntil(s, v, timeout, tolerance) for s, v in expects]))
+    return blocks
+
+
+def run_scenario(hil, scenario, timeout=5.0, tolerance=0.1):
+    """
+    Execute a scenario graph on a HilSession; returns True if all expectations held
+    (False if the session's execution policy aborted it, or if nothing could
+    be compiled into an expectation - such a run is inconclusive, not passed)
+    """
+    if not scenario.expectations:
+        hil.step("Inconclusive", "No expectation of the scenario could be automated")
+        hil.note("INCONCLUSIVE: no executable expectation; verify manually")
+        for line in scenario.manual:
+            hil.note(line)
+        hil.checks_passed = False
+        return False
+    passed = True
+    blocks = to_blocks(scenario, hil.signals, timeout, tolerance)
+    later = [label for label, _ in blocks] + (["Manual verification"] if scenario.manual else [])
+    try:
+        for n, (label, steps) in enumerate(blocks):
+            hil.pending_steps = later[n + 1:]
+            passed &= _run_block(hil, label, steps, scenario, timeout, tolerance)
+    except TestAborted:
+        return False
+    hil.pending_steps = []
+    if scenario.manual:
+        hil.step("Manual verification", "Scenario lines that could not be automated")
+        for line in scenario.manual:
+            hil.note(line)
+    return passed
+
+
+def _run_block(hil, label, steps, scenario, timeout, tolerance):
+    hil.step(label)
+    if label == "Pre-conditions":
+        return hil.ensure_state(dict(scenario.preconditions), timeout, tolerance)
+    passed = True
+    i = 0
+    while i < len(steps):
+        kind = type(steps[i])
+        j = i
+        while j < len(steps) and type(steps[j]) is kind:
+            j += 1
+        group = steps[i:j]
+        if kind is Set:
+            with hil.tick():
+                hil.set_many({s.name: s.value for s in group})
+        elif kind is Wait:
+            hil.wait(sum(s.seconds for s in group))
+        elif kind is WaitUntil:
+            passed &= hil.wait_for({s.name: s.value for s in group},
+                                   timeout=max(s.timeout for s in group), tolerance=tolerance)
+        elif kind is Check:
+            passed &= hil.check_many({s.name: s.value for s in group}, tolerance)
+        i = j
+    return passed
+
+
+def main(argv=None):
+    import argparse
+    from .backends import make_backend
+    from .journal import Journal, resume_point
+    from .session import HilSession
+
+    parser = argparse.ArgumentParser(description="Run scenario markdown files on the HIL")
+    parser.add_argument("scenarios", nargs="+", help="scenario .md files")
+    parser.add_argument("--backend", help="veristand | mock | simulator | replay (default: HIL_BACKEND)")
+    parser.add_argument("--timeout", type=float, default=5.0, help="seconds to wait for each expectation")
+    parser.add_argument("--dump", action="store_true", help="print the compiled graph instead of running")
+    parser.add_argument("--order", action="store_true",
+                        help="reorder to minimise rig state changes and keep the rig state between scenarios")
+    parser.add_argument("--journal", help="write-ahead journal of completed scenarios (JSONL)")
+    parser.add_argument("--resume", action="store_true",
+                        help="skip scenarios completed in the journal and restore its last checkpoint")
+    args = parser.parse_args(argv)
+
+    suite = []
+    for path in args.scenarios:
+        scenario = load_scenario(path)
+        if args.dump:
+            print(json.dumps(scenario.to_json(), indent=2))
+            continue
+        if not scenario.automated:
+            print(f"SKIP (manual): {path}")
+            continue
+        if not scenario.expectations:
+            print(f"INCONCLUSIVE (no executable expectation): {path}")
+        suite.append((path, scenario))
+
+    backend = None
+    if args.order:
+        from .ordering import order_suite, teardown_cost
+        before = teardown_cost(suite)
+        suite, after = order_suite(suite)
+        print(f"Suite order: transition cost {after:g} (teardown after every scenario: {before:g})")
+        backend = make_backend(args.backend)  # one rig state for the whole suite
+
+    completed, restore = {}, None
+    journal_path = args.journal or ("suite_journal.jsonl" if args.resume else None)
+    if args.resume:
+        completed, restore = resume_point(journal_path)
+        print(f"Resuming: {len(completed)} scenarios already done")
+    journal = Journal(journal_path) if journal_path else None
+
+    failed = sum(not passed for path, passed in completed.items() if path in dict(suite))
+    previous = None
+    try:
+        for path, scenario in suite:
+            if path in completed:
+                print(f"SKIP (done): {path}")
+                continue
+            with HilSession(scenario.title or Path(path).stem, scenario.description,
+                            backend=backend or make_backend(args.backend),
+                            report_path=str(Path(path).with_suffix(".html").name), journal=journal) as hil:
+                if journal:
+                    journal.record("test_start", test=path)
+                if previous is not None and args.order:
+                    hil.carry_over(previous)
+                elif restore:
+                    hil.step("Resume", "Restore the rig state checkpointed before the interruption")
+                    hil.ensure_state(restore, timeout=args.timeout)
+                restore = None
+                passed = run_scenario(hil, scenario, timeout=args.timeout)
+            if journal:
+                journal.record("checkpoint", test=path, state=hil.checkpoint())
+                journal.record("test_done", test=path, passed=passed,
+                               report=str((hil.report_paths or {}).get("html", "")))
+            previous = hil
+            failed += not passed
+    finally:
+        if journal:
+            journal.close()
+    return 1 if failed else 0
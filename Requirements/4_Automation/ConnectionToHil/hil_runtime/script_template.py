@@ -0,0 +1,127 @@
+"""
+Template for generated test scripts
+
+The generator fills in the scenario; everything else (signal I/O, mocks,
+simulation plumbing, reporting) comes from hil_runtime, so a generated
+script only contains the scenario itself. It puts the ConnectionToHil
+directory (``runtime_dir``, relative to the script) on sys.path first, so
+it runs from its own folder like the self-contained scripts did:
+
+    from hil_runtime.script_template import render_script
+    source = render_script(test_name="max_defrost_availability",
+                           title="Max Defrost Availability Test",
+                           description="...",
+                           responses='"MaxDefrostStatus": state.get("MaxDefrostRequest", 0),',
+                           body='hil.set("MaxDefrostRequest", 1)\\n'
+                                'checks_passed &= hil.check("MaxDefrostStatus", 1)')
+"""
+
+import textwrap
+from string import Template
+
+# Where generated scripts live (Requirements/FinalTest, Requirements/Generated)
+# relative to the ConnectionToHil directory
+DEFAULT_RUNTIME_DIR = "../4_Automation/ConnectionToHil"
+
+_BOOTSTRAP = '''\
+import sys
+from pathlib import Path
+
+# hil_runtime, test_reporter and hil_modules import from the ConnectionToHil directory
+RUNTIME_DIR = str((Path(__file__).resolve().parent / "$runtime_dir").resolve())
+if RUNTIME_DIR not in sys.path:
+    sys.path.insert(0, RUNTIME_DIR)
+'''
+
+SCRIPT_TEMPLATE = Template('''\
+import pytest
+''' + _BOOTSTRAP + '''
+from hil_runtime import HilSession, SimulatorBackend, load_hil_var
+
+# Dry run configuration
+DRY_RUN = True  # Set to False to run against the backend selected by HIL_BACKEND
+
+
+@pytest.fixture(scope="module")
+def hil_config():
+    """Load HIL configuration once for all tests"""
+    return load_hil_var()
+
+
+def simulate_hardware_response(state, signal_name):
+    """
+    Simulate what the CCM WOULD respond with based on test logic
+    This simulates ideal hardware behavior - real hardware may differ!
+    """
+    response_map = {
+$responses
+    }
+
+    # None: not modelled, the session assumes the expected value
+    return response_map.get(signal_name)
+
+
+def test_${test_name}(hil_config):
+    """$title"""
+    hil = HilSession(
+        "$title",
+        "$description",
+        hil_var=hil_config,
+        backend=SimulatorBackend(simulate_hardware_response) if DRY_RUN else None,
+        report_path="test_${test_name}_report.html",
+    )
+
+    checks_passed = True
+$body
+
+    hil.finish()
+    assert checks_passed, "Some checks failed"
+
+
+if __name__ == "__main__":
+    test_${test_name}(load_hil_var())
+''')
+
+
+def render_script(test_name, title, body, responses="", description="", runtime_dir=DEFAULT_RUNTIME_DIR):
+    """Source of a thin test script for one scenario"""
+    return SCRIPT_TEMPLATE.substitute(
+        test_name=test_name,
+        runtime_dir=_posix(runtime_dir),
+        title=title.replace('"', "'"),
+        description=description.replace('"', "'"),
+        responses=textwrap.indent(responses.strip(), " " * 8),
+        body=textwrap.indent(body.strip(), " " * 4),
+    )
+
+
+# Bump when SCENARIO_SCRIPT_TEMPLATE changes: generated scripts are keyed on it
+TEMPLATE_VERSION = 2
+
+SCENARIO_SCRIPT_TEMPLATE = Template('''\
+"""$title - generated from $scenario_file, do not edit"""
+
+import os
+''' + _BOOTSTRAP + '''
+from hil_runtime import HilSession, load_scenario, run_scenario
+
+SCENARIO = Path(__file__).with_name("$scenario_file")
+
+
+def test_${test_name}():
+    scenario = load_scenario(SCENARIO)
+    with HilSession(scenario.title, scenario.description,
+                    report_path=os.environ.get("HIL_REPORT_PATH", "report_${test_name}.html")) as hil:
+        assert run_scenario(hil, scenario), "Some expectations were not met"
+''')
+
+
+def render_scenario_script(test_name, scenario_file, title="", runtime_dir=DEFAULT_RUNTIME_DIR):
+    """Source of a thin script that runs ``scenario_file`` (next to it) with run_scenario"""
+    return SCENARIO_SCRIPT_TEMPLATE.substitute(test_name=test_name, scenario_file=scenario_file,
+                                               title=(title or test_name).replace('"', "'"),
+                                               runtime_dir=_posix(runtime_dir))
+
+
+def _posix(path):
+    return str(path).replace("\\", "/")
@@ -0,0 +1,449 @@
+"""
+HilSession - the shared set/check/get/report flow of every HIL test script
+
+Replaces the per-script copies of set_can_signal / check_can_signal /
+get_can_signal / simulate_hardware_response and of TestReporter. A session
+owns the signal map, the I/O backend, the reporter and the latency tracker.
+
+Writes go through an OutputCache: unchanged values are not re-sent, and
+writes inside ``with hil.tick():`` go out as one batched update.
+
+Update bits (``X_UB``) are handled here: writing ``X`` also sets its update
+bit in the same batch, and a status whose update bit reads 0 counts as
+not received (None) - the update bit is read in the same batched read.
+Besides the name-matched pairs of the config, every session knows the
+DBC group update bits (``ParkClimTimerStat_*`` -> ``ParkClimTimerStat_sg_UB``).
+
+``ensure_state`` re-establishes a target state (pre-conditions, "reset for
+next checks") by diffing it against what is known: OUT signals against the
+shadow cache, statuses against the last batched read. Only the differences
+are written and awaited, so a redundant reset costs no I/O.
+"""
+
+import asyncio
+import threading
+
+from test_reporter import TestReporter
+from signal_latency import LatencyTracker
+
+from .backends import make_backend
+from .monitors import MonitorSet
+from .outputs import OutputCache
+from .policy import ExecutionPolicy, TestAborted
+from .poller import SignalPoller
+from .signals import SignalMap
+
+
+def load_hil_var(config_file="projectConfig.json"):
+    """Signal configuration ('variables') from projectConfig.json"""
+    from hil_modules import read_project_config
+    return read_project_config(config_file)[3]
+
+
+_db_update_bits = {}
+_db_lock = threading.Lock()  # run_cases opens its sessions from several threads
+
+
+def load_update_bits(db_dir=None):
+    """{signal: update bit} pairs of the DBC/LDF databases, parsed once per process"""
+    import signal_db
+    root = signal_db.DEFAULT_DB_DIR if db_dir is None else db_dir
+    key = str(root)
+    with _db_lock:
+        if key not in _db_update_bits:
+            _db_update_bits[key] = (signal_db.update_bits(signal_db.load_db(root))
+                                    if signal_db.db_files(root) else {})
+        return _db_update_bits[key]
+
+
+def values_match(actual, expected, tolerance):
+    """Numeric compare within tolerance, equality otherwise"""
+    if isinstance(actual, (int, float)) and isinstance(expected, (int, float)):
+        return abs(actual - expected) <= (tolerance or 0)
+    return actual == expected
+
+
+class HilSession:
+    """
+    One test run against a backend
+
+    Args:
+        test_name, description: report header
+        hil_var: signal configuration (default: loaded from projectConfig.json)
+        backend: Backend instance (default: make_backend(simulate=simulate))
+        simulate: response model for the simulator backend
+        report_path: report base path written by finish()
+        update_bits: extra {signal: update bit} pairs on top of those of the
+            config and the DBC (load_update_bits); False turns update bit
+            handling off
+        policy: ExecutionPolicy (default: from HIL_FAIL_FAST / HIL_MAX_FAILURES)
+        journal: Journal that records every step (suite runs with --resume)
+    """
+
+    def __init__(self, test_name, description="", hil_var=None, backend=None,
+                 simulate=None, report_path=None, update_bits=None, policy=None,
+                 journal=None):
+        self.signals = SignalMap(hil_var if hil_var is not None else load_hil_var())
+        if update_bits is False:
+            self.signals.update_bits.clear()
+        else:
+            if update_bits:
+                self.signals.add_update_bits(update_bits)
+            self.signals.add_update_bits(load_update_bits())
+        self.backend = backend if backend is not None else make_backend(simulate=simulate)
+        self.reporter = TestReporter(test_name, description)
+        self.latency = LatencyTracker(known_status=self.signals.inputs.keys())
+        self.reporter.latency = self.latency
+        self.outputs = OutputCache(self.backend, on_flush=self._on_flush)
+        self.report_path = report_path or f"report_{test_name.replace(' ', '_')}.html"
+        self.checks_passed = True
+        self.report_paths = None
+        self.ub_written = 0
+        self.ub_filtered = 0
+        self.ub_not_set = set()  # IN signals whose latest read was dropped (update bit 0)
+        self.last_read = {}  # IN path -> (value, output flushes at the time of the read)
+        self.policy = policy if policy is not None else ExecutionPolicy.from_env()
+        self.failed_checks = 0
+        self.aborted = None
+        self.pending_steps = []  # labels of the steps still ahead, listed as skipped on abort
+        self.test_name = test_name
+        self.journal = journal
+
+    @property
+    def tag(self):
+        return f"[{self.backend.name.upper()}] " if self.backend.simulated else ""
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def step(self, name, description=""):
+        """Start a new report step"""
+        print(f"\n{self.tag}{name}")
+        print("-" * 70)
+        if self.journal is not None:
+            self.journal.record("step", session=self.test_name, step=name)
+        return self.reporter.add_step(name, description)
+
+    def note(self, text):
+        """Add a note to the current step"""
+        print(f"  NOTE: {text}")
+        self.reporter.add_note(text)
+
+    # ------------------------------------------------------------------
+    # Signal I/O
+    # ------------------------------------------------------------------
+    def set(self, signal_name, value):
+        """Write one OUT signal"""
+        self.set_many({signal_name: value})
+
+    def set_many(self, values):
+        """Write several OUT signals in one batched write"""
+        signals, data = [], []
+        for name, value in values.items():
+            signal = self.signals.output(name)
+            if signal is None:
+                print(f"  WARNING: Signal '{name}' not found in OUT configuration")
+                self.reporter.add_note(f"WARNING: Signal '{name}' not found")
+                continue
+            if signal.direction == "IN":
+                self.reporter.add_note(f"WARNING: Setting IN signal '{name}' may have no effect on real hardware")
+            signals.append(signal)
+            data.append(value)
+        if not signals:
+            return
+        updates = self._update_bits_of(signals)
+        self.outputs.write(signals + updates, data + [1] * len(updates))
+        self.ub_written += len(updates)
+        for signal, value in zip(signals, data):
+            print(f"  {self.tag}SET: {signal.name} = {value}")
+            self.reporter.add_set(signal.name, value)
+
+    def _update_bits_of(self, signals):
+        """Update bits to set along with ``signals`` (those not written explicitly)"""
+        written = {s.name for s in signals}
+        updates = []
+        for signal in signals:
+            ub = self.signals.update_bit(signal)
+            if ub is not None and ub.name not in written:
+                written.add(ub.name)
+                updates.append(ub)
+        return updates
+
+    def tick(self):
+        """Context manager: coalesce all writes of the block into one update"""
+        return self.outputs.tick()
+
+    def _on_flush(self, signals, values):
+        for signal, value in zip(signals, values):
+            self.latency.on_write(signal.name, value)
+
+    def read_many(self, signals):
+        """
+        One batched backend read of ``signals`` and their update bits;
+        a value whose update bit reads 0 is returned as None
+        """
+        signals = list(signals)
+        ubs = [self.signals.update_bit(s) for s in signals]
+        names = {s.name for s in signals}
+        extra = []
+        for ub in ubs:
+            if ub is not None and ub.name not in names:
+                names.add(ub.name)
+                extra.append(ub)
+        values = self.backend.read_many(signals + extra)
+        read = {s.name: v for s, v in zip(signals + extra, values)}
+        result = values[:len(signals)]
+        for i, ub in enumerate(ubs):
+            if ub is not None and read[ub.name] == 0 and result[i] is not None:
+                result[i] = None
+                self.ub_filtered += 1
+                self.ub_not_set.add(signals[i].name)
+            else:
+                self.ub_not_set.discard(signals[i].name)
+        for signal, value in zip(signals, result):
+            if value is None:
+                self.last_read.pop(signal.path, None)
+            else:
+                self.last_read[signal.path] = (value, self.outputs.flushes)
+        return result
+
+    def get_many(self, names, default=0.0):
+        """Read several IN signals in one batched read; unknown names give default"""
+        signals = [self.signals.input(n) for n in names]
+        known = [s for s in signals if s is not None]
+        values = iter(self.read_many(known) if known else [])
+        result = {}
+        for name, signal in zip(names, signals):
+            value = next(values) if signal is not None else default
+            if signal is not None and value is not None:
+                self.latency.on_read(signal.name, value)
+            result[name] = default if value is None else value
+        return result
+
+    def get(self, signal_name, default=0.0):
+        """Read one IN signal"""
+        return self.get_many([signal_name], default)[signal_name]
+
+    def check(self, signal_name, expected_value, tolerance=0.1):
+        """Read one IN signal and record a check against expected_value"""
+        return self.check_many({signal_name: expected_value}, tolerance)
+
+    def check_many(self, expected, tolerance=0.1):
+        """Read several IN signals in one batched read and check each one"""
+        names = self._known_inputs(expected, tolerance)
+        actual = self.get_many(names, default=None) if names else {}
+        return self._record_checks(names, actual, expected, tolerance, len(names) == len(expected))
+
+    def wait_for(self, expected, timeout=5.0, tolerance=0.1, period=0.05, abort_event=None):
+        """
+        Wait until every IN signal in ``expected`` shows its value, then check
+
+        All signals are waited on concurrently by one poller: each cycle is
+        a single batched read of the signals still pending. A signal that
+        does not reach its value within ``timeout`` fails with the last
+        value seen.
+        """
+        if self.backend.simulated:
+            return self.check_many(expected, tolerance)  # responses are immediate
+        names = self._known_inputs(expected, tolerance)
+        signals = {name: self.signals.input(name) for name in names}
+        predicates = {signals[name]: (lambda v, e=expected[name]: values_match(v, e, tolerance))
+                      for name in names}
+        poller = SignalPoller(self.read_many, period, on_values=self._on_values,
+                              abort_event=abort_event)
+        results = asyncio.run(poller.wait_all(predicates, timeout)) if names else {}
+        actual = {name: results[signals[name]][1] for name in names}
+        return self._record_checks(names, actual, expected, tolerance, len(names) == len(expected))
+
+    def ensure_state(self, target, timeout=5.0, tolerance=0.1, settle=0.0):
+        """
+        Bring the bench to ``target`` ({signal: value}), touching only what differs
+
+        OUT signals are written (in one tick) only where the shadow cache
+        holds another value. IN signals are awaited only where the last
+        batched read does not already show the value, or was taken before
+        the latest write. ``settle`` seconds are waited only if something
+        was written. Returns True if all awaited statuses hold.
+        """
+        writes = {}
+        for name, value in target.items():
+            signal = self.signals.outputs.get(name)
+            if signal is not None and not values_match(self.outputs.current(signal), value, 0):
+                writes[name] = value
+        if writes:
+            with self.tick():
+                self.set_many(writes)
+            self.wait(settle)
+
+        expected, in_place = {}, 0
+        for name, value in target.items():
+            if name in self.signals.outputs:
+                in_place += name not in writes
+                continue
+            signal = self.signals.input(name)
+            seen = self.last_read.get(signal.path) if signal is not None else None
+            if (seen is not None and seen[1] == self.outputs.flushes
+                    and values_match(seen[0], value, tolerance)):
+                in_place += 1
+            else:
+                expected[name] = value
+        self.note(f"ensure_state: {len(writes)} written, {len(expected)} awaited, "
+                  f"{in_place} already in place")
+        return self.wait_for(expected, timeout, tolerance) if expected else True
+
+    def checkpoint(self):
+        """{OUT signal: value} of everything written so far, to restore with ensure_state"""
+        names = {signal.path: name for name, signal in self.signals.outputs.items()}
+        return {names[path]: value for path, value in self.outputs.shadow.items() if path in names}
+
+    def carry_over(self, previous):
+        """
+        Continue from the rig state ``previous`` (a session on the same
+        backend) left behind: its shadow cache and last reads, so
+        ``ensure_state`` skips what already holds
+        """
+        self.outputs.shadow.update(previous.outputs.shadow)
+        flushes = previous.outputs.flushes
+        for path, (value, seen) in previous.last_read.items():
+            if seen == flushes:  # read after the last write: still current
+                self.last_read[path] = (value, self.outputs.flushes)
+
+    def _on_values(self, signals, values):
+        for signal, value in zip(signals, values):
+            if value is not None:
+                self.latency.on_read(signal.name, value)
+
+    def _known_inputs(self, expected, tolerance):
+        """Names of ``expected`` that exist; missing ones are recorded as failed"""
+        names = []
+        for name in expected:
+            if self.signals.input(name) is not None:
+                names.append(name)
+                continue
+            print(f"  WARNING: Signal '{name}' not found in IN configuration")
+            self.reporter.add_note(f"WARNING: Signal '{name}' not found")
+            self.reporter.add_check(name, expected[name], "N/A (Signal Not Found)", False, tolerance)
+        return names
+
+    def _record_checks(self, names, actual, expected, tolerance, all_passed):
+        for name in names:
+            value = actual[name]
+            if value is None and self.signals.input(name).name in self.ub_not_set:
+                # Dropped because the update bit reads 0: a failure, never an assumption
+                print(f"  {self.tag}[FAIL] CHECK: {name} = N/A (update bit not set) (expected {expected[name]})")
+                self.reporter.add_check(name, expected[name], "N/A (update bit not set)", False, tolerance)
+                all_passed = False
+                continue
+            if value is None and self.backend.simulated:
+                # Not modelled by the simulator: assume the ideal response
+                value = expected[name]
+                self.reporter.add_note(f"{name} not modelled by simulator; assumed {value}")
+            passed = value is not None and values_match(value, expected[name], tolerance)
+            mark = "[PASS]" if passed else "[FAIL]"
+            print(f"  {self.tag}{mark} CHECK: {name} = {value} (expected {expected[name]})")
+            self.reporter.add_check(name, expected[name], "N/A (Read Error)" if value is None else value,
+                                    passed, tolerance)
+            all_passed &= passed
+        self._after_checks(all_passed)
+        return all_passed
+
+    def monitor(self, monitors, timeout=None, period=0.05):
+        """
+        Sample the signals of ``monitors`` (monitors.always, ...) until each
+        has a verdict, then record every verdict as a check
+
+        Each cycle is one batched read of the signals still undecided; the
+        run ends as soon as all verdicts are in, at the latest ``timeout``
+        (default: the longest monitor horizon) after the first sample and
+        once every monitor's horizon has passed since its own first sample.
+        """
+        names = self._known_inputs({m.signal: m.describe() for m in monitors}, None)
+        signals = {name: self.signals.input(name) for name in names}
+        active = MonitorSet([m for m in monitors if m.signal in signals], self.backend.now)
+        if timeout is None:
+            timeout = max((m.horizon for m in active.monitors if m.horizon is not None), default=0.0)
+        first = None
+        pending = active.pending
+        while pending:
+            keys = list(dict.fromkeys(signals[m.signal] for m in pending))
+            values = self.read_many(keys)
+            self._on_values(keys, values)
+            t = active.on_values(keys, values)  # time stamp after the read, as the monitors see it
+            first = t if first is None else first
+            pending = active.pending
+            if not pending or (t - first >= timeout and not active.within_horizon(t)):
+                break
+            self.backend.sleep(period)
+        active.finish()
+        all_passed = len(names) == len({m.signal for m in monitors})
+        for m in active.monitors:
+            mark = "[PASS]" if m.verdict else "[FAIL]"
+            print(f"  {self.tag}{mark} MONITOR: {m.describe()}: {m.reason}")
+            self.reporter.add_check(m.signal, m.describe(), f"{m.last} ({m.reason})", m.verdict)
+            all_passed &= m.verdict
+        self._after_checks(all_passed)
+        return all_passed
+
+    def _after_checks(self, all_passed):
+        self.checks_passed &= all_passed
+        self.failed_checks = len(self.reporter.checks) - self.reporter.passed_count
+        step = self.reporter.current_step
+        reason = self.policy.abort_reason(step.name if step else "", self.failed_checks, not all_passed)
+        if reason and self.aborted is None:
+            self.abort(reason)
+
+    def abort(self, reason):
+        """
+        Stop the test now: safe teardown, note what is skipped, write the
+        report and raise TestAborted
+        """
+        self.aborted = reason
+        self.note(f"ABORTED: {reason}")
+        teardown = self.policy.teardown
+        if teardown:
+            self.step("Teardown (abort)", "Safe state after the early abort")
+            if callable(teardown):
+                teardown(self)
+            else:
+                with self.tick():
+                    self.set_many(teardown)
+        self.step("Skipped", "Not run because the test was aborted")
+        for label in self.pending_steps:
+            self.note(f"SKIPPED: {label}")
+        if not self.pending_steps:
+            self.note("SKIPPED: remaining steps of the script")
+        self.finish()
+        raise TestAborted(reason)
+
+    def wait(self, seconds):
+        """Wait on the backend's clock (virtual on simulator/replay)"""
+        self.backend.sleep(seconds)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def finish(self, report_path=None):
+        """Write reports (formats per HIL_REPORT_FORMATS) and close the backend"""
+        if self.report_paths is not None:
+            return self.checks_passed  # already finished (abort)
+        self.outputs.flush()
+        stats = self.outputs.stats()
+        self.reporter.add_note(f"Output writes: {stats['written']} sent, {stats['suppressed']} suppressed "
+                               f"(unchanged), {stats['coalesced']} coalesced, {stats['flushes']} batches")
+        if self.ub_written or self.ub_filtered:
+            self.reporter.add_note(f"Update bits: {self.ub_written} set with their signals, "
+                                   f"{self.ub_filtered} reads ignored (update bit not set)")
+        self.report_paths = self.reporter.generate_reports(report_path or self.report_path)
+        for fmt, path in self.report_paths.items():
+            print(f"\n{fmt.upper()} Report: {path}")
+        self.backend.close()
+        return self.checks_passed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.reporter.add_note(f"Error: {exc}")
+        self.finish()
+        return False
@@ -0,0 +1,70 @@
+"""
+Signal name -> channel path resolution
+
+Understands both config layouts found in this repo:
+    {"CAN": {"OUT": {...}, "IN": {...}}}           (generated scripts)
+    {"CAN_OUT": {...}, "CAN_IN": {...}}             (projectConfig.json)
+plus LIN buses ({"LIN28": {"OUT": {...}, "IN": {...}}}).
+
+Update bits: a signal ``X`` whose ``X_UB`` is mapped in the same direction
+gets it as its update bit. Pairs the names do not show (group update bits
+such as ``GPSData_sg_UB``) come from the DBC via ``add_update_bits``.
+"""
+
+import sys
+
+
+class Signal:
+    """A named channel with its VeriStand path and direction (OUT/IN)"""
+    __slots__ = ("name", "path", "direction")
+
+    def __init__(self, name, path, direction):
+        self.name = sys.intern(name)
+        self.path = path
+        self.direction = direction
+
+    def __repr__(self):
+        return f"Signal({self.name!r}, {self.direction})"
+
+
+class SignalMap:
+    """Lookup of OUT (written by the rig) and IN (read from the ECU) signals"""
+
+    def __init__(self, hil_var):
+        self.outputs = {}
+        self.inputs = {}
+        self.update_bits = {}
+        hil_var = hil_var or {}
+        # CAN first so a LIN signal with the same name never shadows it
+        self._add(hil_var.get("CAN", {}).get("OUT", {}), hil_var.get("CAN", {}).get("IN", {}))
+        self._add(hil_var.get("CAN_OUT", {}), hil_var.get("CAN_IN", {}))
+        for key, bus in hil_var.items():
+            if key.startswith("LIN") and isinstance(bus, dict):
+                self._add(bus.get("OUT", {}), bus.get("IN", {}))
+        self.add_update_bits({name[:-3]: name for name in list(self.outputs) + list(self.inputs)
+                              if name.endswith("_UB")})
+
+    def add_update_bits(self, pairs):
+        """Register {signal name: update bit name} (e.g. signal_db.update_bits(db))"""
+        for name, ub in pairs.items():
+            if name != ub:
+                self.update_bits.setdefault(name, ub)
+
+    def _add(self, outputs, inputs):
+        for name, path in outputs.items():
+            self.outputs.setdefault(name, Signal(name, path, "OUT"))
+        for name, path in inputs.items():
+            self.inputs.setdefault(name, Signal(name, path, "IN"))
+
+    def output(self, name):
+        """Signal to write: OUT first, IN as a fallback (may have no effect)"""
+        return self.outputs.get(name) or self.inputs.get(name)
+
+    def input(self, name):
+        """Signal to read: IN first, OUT as a fallback (reads back the request)"""
+        return self.inputs.get(name) or self.outputs.get(name)
+
+    def update_bit(self, signal):
+        """Mapped update bit of ``signal`` in the same direction, or None"""
+        ub = self.update_bits.get(signal.name)
+        return (self.outputs if signal.direction == "OUT" else self.inputs).get(ub) if ub else None
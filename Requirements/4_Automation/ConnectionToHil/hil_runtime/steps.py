@@ -0,0 +1,27 @@
+"""
+Scenario steps - the flat set/wait/check vocabulary shared by the host
+executor and the real-time sequence compiler
+
+    Set("MaxDefrostRequest", 1)
+    Wait(0.5)
+    WaitUntil("MaxDefrostStatus", 1, timeout=5)
+    Check("HVACBlowerLevelStat_BlowerLevel", 10)
+"""
+
+from collections import namedtuple
+import hashlib
+import json
+
+Set = namedtuple("Set", "name value")
+Wait = namedtuple("Wait", "seconds")
+WaitUntil = namedtuple("WaitUntil", "name value timeout tolerance", defaults=(5.0, 0.1))
+Check = namedtuple("Check", "name value tolerance", defaults=(0.1,))
+
+STEP_TYPES = {cls.__name__: cls for cls in (Set, Wait, WaitUntil, Check)}
+
+
+def steps_hash(steps, extra=None):
+    """Stable content hash of a step list (plus anything it was resolved against)"""
+    payload = json.dumps([[type(s).__name__, *s] for s in steps] + [extra],
+                         sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,339 @@
+"""
+Impact Index - Which tests and requirement sections touch which signals and frames
+
+The index is built by static analysis, nothing is executed:
+
+    test scripts (test_*.py with test functions): string literals passed to
+        the I/O helpers that name a known signal (set_can_signal(hil_var,
+        "VehicleMode", ...), hil.set(...), hil.check_many({...}); response
+        maps and mock configs do not count)
+    scenario files (*.md): signal names in the text
+
+A signal name is "known" when projectConfig.json maps it or the DBC/LDF
+index defines it. Signals resolve to frames through the signal DB and the
+channel paths (".../CIOM_Cab_02P (284262208)/VehicleMode"). Files carry
+their requirement section from the file name (req_section_<n>).
+
+``--changed-since <git-rev>`` turns a diff into changed signals and frames:
+
+    projectConfig.json   signals whose channel was added, removed or moved
+    *.dbc / *.ldf        frames whose layout, timing or signals changed
+    *.nivssdf            channels and frames around the changed lines
+    indexed files        the file itself
+
+and selects only the tests that touch one of them. A change to the library
+code of this package (hil_modules.py, hil_runtime/, ...) selects everything.
+
+Usage:
+    python impact_index.py --changed-since HEAD~3 [--run]
+    python impact_index.py --dump index.json
+"""
+
+from pathlib import Path
+import argparse
+import ast
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+
+from generation_pipeline import REQUIREMENTS_DIR, read_requirements
+from hil_runtime.signals import SignalMap
+from signal_db import DEFAULT_DB_DIR, SignalDB, load_db, parse_dbc, parse_ldf
+
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_CONFIG = HERE / "projectConfig.json"
+SCRIPT_DIRS = [HERE, REQUIREMENTS_DIR / "FinalTest", REQUIREMENTS_DIR / "Generated"]
+SCENARIO_DIRS = [REQUIREMENTS_DIR / "FinalTest", REQUIREMENTS_DIR / "Scenarios", REQUIREMENTS_DIR / "Generated"]
+
+_SECTION = re.compile(r"req_section_(\d+)")
+_WORD = re.compile(r"\w+")
+_FRAME_DIR = re.compile(r"^(\w+) \(\d+\)$")
+_XML_NAME = re.compile(r'<(Channel|Section)\s+Name="([^"]+)"')
+_IO_FUNCTIONS = {"set_can_signal", "check_can_signal", "get_can_signal", "wait_for_signal"}
+_IO_METHODS = re.compile(r"^((set|check|get)(_many)?|wait_for|ensure_state)$")
+
+
+def section_of(path):
+    m = _SECTION.search(Path(path).name)
+    return f"req_section_{m.group(1)}" if m else None
+
+
+def frame_of_path(channel_path):
+    """Frame name from a VeriStand channel path (".../CIOM_Cab_02P (284262208)/VehicleMode")"""
+    parts = channel_path.replace("\\", "/").split("/")
+    m = _FRAME_DIR.match(parts[-2]) if len(parts) > 1 else None
+    return m.group(1) if m else None
+
+
+def _is_test_script(tree):
+    return any(isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test_")
+               for node in ast.walk(tree))
+
+
+def _is_io_call(node):
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id in _IO_FUNCTIONS
+    if isinstance(func, ast.Attribute):
+        return func.attr in _IO_FUNCTIONS or (isinstance(func.value, ast.Name) and func.value.id == "hil"
+                                              and _IO_METHODS.match(func.attr) is not None)
+    return False
+
+
+def _literals(node):
+    """String literals of an argument: the string itself, dict keys, list/tuple/set items"""
+    if isinstance(node, ast.Constant):
+        return {node.value} if isinstance(node.value, str) else set()
+    if isinstance(node, ast.Dict):
+        return set().union(*(_literals(key) for key in node.keys if key is not None))
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return set().union(*(_literals(item) for item in node.elts))
+    return set()
+
+
+def script_names(source):
+    """String arguments of the I/O helper calls of a test script, or None if it has no test functions"""
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+    if not _is_test_script(tree):
+        return None
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and _is_io_call(node):
+            for arg in node.args + [kw.value for kw in node.keywords]:
+                names |= _literals(arg)
+    return names
+
+
+class ImpactIndex:
+    """
+    Signal and frame sets per test file and per requirement section
+
+    Args:
+        db: SignalDB
+        hil_var: config variables (channel paths give frames for unmapped DB signals)
+    """
+
+    def __init__(self, db, hil_var=None):
+        self.db = db
+        channels = SignalMap(hil_var)
+        self.frames_of = {}
+        for signal in list(channels.outputs.values()) + list(channels.inputs.values()):
+            frame = frame_of_path(signal.path)
+            if frame:
+                self.frames_of.setdefault(signal.name, set()).add(frame)
+        for name, signal in db.signals.items():
+            if signal.frame:
+                self.frames_of.setdefault(name, set()).add(signal.frame)
+        self.known = set(self.frames_of) | set(channels.outputs) | set(channels.inputs)
+        self.files = {}
+
+    def add_file(self, path):
+        """Index one test script or scenario file; returns its entry or None"""
+        path = Path(path)
+        text = path.read_text(encoding="utf-8", errors="replace")
+        if path.suffix == ".py":
+            names = script_names(text)
+            if names is None:
+                return None
+            signals = names & self.known
+        else:
+            signals = set(_WORD.findall(text)) & self.known
+        entry = {
+            "kind": "script" if path.suffix == ".py" else "scenario",
+            "section": section_of(path),
+            "signals": sorted(signals),
+            "frames": sorted(set().union(*(self.frames_of.get(s, ()) for s in signals))),
+        }
+        self.files[str(path.resolve())] = entry
+        return entry
+
+    def scan(self, script_dirs=SCRIPT_DIRS, scenario_dirs=SCENARIO_DIRS):
+        for d in map(Path, script_dirs):
+            for path in sorted(d.glob("test_*.py")) if d.is_dir() else ():
+                self.add_file(path)
+        for d in map(Path, scenario_dirs):
+            for path in sorted(d.glob("*.md")) if d.is_dir() else ():
+                if "Error_Log" not in path.name and section_of(path):
+                    self.add_file(path)
+        return self
+
+    def sections(self, requirements=None):
+        """{section: {"files", "signals", "frames"}}; limited to ``requirements`` when given"""
+        result = {}
+        for path, entry in self.files.items():
+            section = entry["section"]
+            if section is None or (requirements is not None and section not in requirements):
+                continue
+            merged = result.setdefault(section, {"files": [], "signals": set(), "frames": set()})
+            merged["files"].append(path)
+            merged["signals"].update(entry["signals"])
+            merged["frames"].update(entry["frames"])
+        return {s: {"files": sorted(m["files"]), "signals": sorted(m["signals"]), "frames": sorted(m["frames"])}
+                for s, m in sorted(result.items())}
+
+    def select(self, changed):
+        """
+        (test scripts to run, changed library modules) for changes_since();
+        a changed module of this package selects every script
+        """
+        code = sorted(f for f in changed["files"] if f.endswith(".py") and f not in self.files
+                      and HERE in Path(f).parents and "tests" not in Path(f).relative_to(HERE).parts)
+        if code:
+            return sorted(p for p, e in self.files.items() if e["kind"] == "script"), code
+        return self.affected(changed["signals"], changed["frames"], changed["files"]), code
+
+    def affected(self, signals=(), frames=(), files=()):
+        """Indexed test scripts that touch any of the changed signals, frames or files"""
+        signals, frames = set(signals), set(frames)
+        files = {str(Path(f).resolve()) for f in files}
+        # A changed scenario re-runs the scripts of its section
+        sections = {self.files[f]["section"] for f in files if f in self.files}
+        return sorted(path for path, entry in self.files.items() if entry["kind"] == "script" and (
+            path in files or entry["section"] in sections - {None}
+            or signals.intersection(entry["signals"]) or frames.intersection(entry["frames"])))
+
+    def to_json(self, requirements=None):
+        return {"files": self.files, "sections": self.sections(requirements)}
+
+
+# Change detection
+
+def _git(repo, *args):
+    result = subprocess.run(["git", *args], cwd=repo, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"git {' '.join(args)}: {result.stderr.strip()}")
+    return result.stdout
+
+
+def _old_text(repo, rev, rel_path):
+    try:
+        return _git(repo, "show", f"{rev}:{rel_path}")
+    except RuntimeError:
+        return ""  # file did not exist at rev
+
+
+def config_changes(old_text, new_text):
+    """Signal names whose channel mapping differs between two projectConfig.json versions"""
+    def channels(text):
+        if not text.strip():
+            return {}
+        maps = SignalMap(json.loads(text).get("variables"))
+        return {(s.direction, s.name): s.path for s in list(maps.outputs.values()) + list(maps.inputs.values())}
+    old, new = channels(old_text), channels(new_text)
+    return {name for direction, name in old.keys() | new.keys()
+            if old.get((direction, name)) != new.get((direction, name))}
+
+
+def _frame_layouts(db):
+    return {name: (frame.id, frame.length, frame.transmitter, frame.cycle_ms,
+                   tuple((s, tuple(getattr(db.signals[s], a) for a in ("frame", "start", "length", "factor",
+                                                                       "offset", "minimum", "maximum", "initial")))
+                         for s in frame.signals if s in db.signals))
+            for name, frame in db.frames.items()}
+
+
+def db_changes(old_text, new_text, suffix):
+    """(signals, frames) that differ between two versions of a DBC/LDF file"""
+    parse = parse_dbc if suffix == ".dbc" else parse_ldf
+    old_db, new_db = parse(old_text, SignalDB()), parse(new_text, SignalDB())
+    old, new = _frame_layouts(old_db), _frame_layouts(new_db)
+    frames = {name for name in old.keys() | new.keys() if old.get(name) != new.get(name)}
+    signals = set()
+    for db in (old_db, new_db):
+        for frame in frames:
+            signals.update(db.frames[frame].signals if frame in db.frames else ())
+    return signals, frames
+
+
+def sdf_changes(diff_text, new_text):
+    """(signals, frames) around the lines changed in a .nivssdf diff (git diff -U0)"""
+    lines = new_text.splitlines()
+    signals, frames = set(), set()
+    for m in re.finditer(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@", diff_text, re.M):
+        start, count = int(m.group(1)), int(m.group(2) or 1)
+        for number in range(start, start + max(count, 1)):
+            channel = None
+            for line in reversed(lines[:min(number, len(lines))]):
+                element = _XML_NAME.search(line)
+                if element is None:
+                    continue
+                frame = _FRAME_DIR.match(element.group(2))
+                if element.group(1) == "Channel" and channel is None:
+                    channel = element.group(2)
+                elif frame:
+                    frames.add(frame.group(1))
+                    break
+            if channel:
+                signals.add(channel)
+        # Removed lines name what they removed
+        hunk_end = diff_text.find("\n@@", m.end())
+        for removed in re.findall(r"^-.*$", diff_text[m.end():hunk_end if hunk_end >= 0 else None], re.M):
+            for kind, name in _XML_NAME.findall(removed):
+                frame = _FRAME_DIR.match(name)
+                if frame:
+                    frames.add(frame.group(1))
+                else:
+                    signals.add(name)
+    return signals, frames
+
+
+def changes_since(rev, repo=None):
+    """{"signals", "frames", "files"} changed between ``rev`` and the working tree"""
+    repo = Path(repo or _git(HERE, "rev-parse", "--show-toplevel").strip())
+    changed = {"signals": set(), "frames": set(), "files": set()}
+    for rel in _git(repo, "diff", "--name-only", rev, "--").splitlines():
+        path = repo / rel
+        new_text = path.read_text(encoding="utf-8", errors="replace") if path.exists() else ""
+        suffix = path.suffix.lower()
+        if path.name == "projectConfig.json":
+            changed["signals"] |= config_changes(_old_text(repo, rev, rel), new_text)
+        elif suffix in (".dbc", ".ldf"):
+            signals, frames = db_changes(_old_text(repo, rev, rel), new_text, suffix)
+            changed["signals"] |= signals
+            changed["frames"] |= frames
+        elif suffix == ".nivssdf":
+            signals, frames = sdf_changes(_git(repo, "diff", "-U0", rev, "--", rel), new_text)
+            changed["signals"] |= signals
+            changed["frames"] |= frames
+        else:
+            changed["files"].add(str(path.resolve()))
+    return changed
+
+
+def load_index(db_dir=DEFAULT_DB_DIR, config=DEFAULT_CONFIG):
+    hil_var = json.loads(Path(config).read_text(encoding="utf-8")).get("variables") if Path(config).exists() else None
+    return ImpactIndex(load_db(db_dir), hil_var).scan()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Requirement/test -> signal impact index")
+    parser.add_argument("--changed-since", metavar="REV", help="Select the tests affected since this git revision")
+    parser.add_argument("--run", action="store_true", help="Run the selected tests with pytest")
+    parser.add_argument("--dump", metavar="JSON", help="Write the index (files and sections) to this file")
+    parser.add_argument("--requirements", default=str(REQUIREMENTS_DIR / "requirements.csv"))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    index = load_index()
+    if args.dump:
+        requirements = read_requirements(args.requirements) if Path(args.requirements).exists() else None
+        Path(args.dump).write_text(json.dumps(index.to_json(requirements), indent=1), encoding="utf-8")
+    if args.changed_since:
+        changed = changes_since(args.changed_since)
+        selected, code = index.select(changed)
+        if code:
+            logging.info(f"Code changed ({', '.join(Path(f).name for f in code)}): selecting all tests")
+        logging.info(f"{len(changed['signals'])} signals, {len(changed['frames'])} frames changed: "
+                     f"{len(selected)} of {sum(e['kind'] == 'script' for e in index.files.values())} tests selected")
+        for path in selected:
+            print(path)
+        if args.run and selected:
+            env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(HERE), os.environ.get("PYTHONPATH")])))
+            sys.exit(subprocess.run([sys.executable, "-m", "pytest", "-q", *selected], cwd=HERE, env=env).returncode)
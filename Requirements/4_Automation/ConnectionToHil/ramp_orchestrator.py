@@ -0,0 +1,161 @@
+"""
+Ramp Orchestrator - Drive several signals concurrently along declarative profiles
+
+Instead of ramping one signal after another with a sleep per level, every
+signal follows its own profile on a shared clock. On each tick the target
+values of all profiles are evaluated, interlocks are applied, and the values
+that actually changed are sent in one batched write.
+
+Profiles:
+    Linear(start, end, duration)
+    Stepped(levels, dwell)
+    SCurve(start, end, duration)      (smoothstep: gentle start and end)
+
+Interlocks adjust the evaluated values before they are written, e.g.
+    not_above("CabHeatManReq", "HVACBlowerRequest")
+keeps the heater request at or below the blower request at every tick.
+
+A ramp aborts as soon as ``abort_event`` (e.g. SafetyWatchdog.tripped) is
+set; the orchestrator waits on the event, so there is no extra tick delay.
+"""
+
+import threading
+import time
+
+
+class Profile:
+    """Base profile: value as a function of elapsed time"""
+    duration = 0.0
+    integer = True
+
+    def value_at(self, t):
+        raise NotImplementedError
+
+    def _out(self, value):
+        return int(round(value)) if self.integer else value
+
+
+class Linear(Profile):
+    """Straight line from start to end over duration seconds"""
+
+    def __init__(self, start, end, duration, integer=True):
+        self.start, self.end, self.duration, self.integer = start, end, duration, integer
+
+    def value_at(self, t):
+        if t >= self.duration or self.duration <= 0:
+            return self._out(self.end)
+        return self._out(self.start + (self.end - self.start) * t / self.duration)
+
+
+class SCurve(Profile):
+    """Smoothstep from start to end over duration seconds"""
+
+    def __init__(self, start, end, duration, integer=True):
+        self.start, self.end, self.duration, self.integer = start, end, duration, integer
+
+    def value_at(self, t):
+        if t >= self.duration or self.duration <= 0:
+            return self._out(self.end)
+        x = t / self.duration
+        return self._out(self.start + (self.end - self.start) * x * x * (3 - 2 * x))
+
+
+class Stepped(Profile):
+    """Hold each level for dwell seconds; the last level is held at the end"""
+
+    def __init__(self, levels, dwell, integer=True):
+        self.levels = list(levels)
+        self.dwell = dwell
+        self.duration = dwell * (len(self.levels) - 1)
+        self.integer = integer
+
+    def value_at(self, t):
+        index = min(int(t / self.dwell) if self.dwell > 0 else len(self.levels), len(self.levels) - 1)
+        return self._out(self.levels[index])
+
+
+def not_above(follower, leader, margin=0):
+    """Interlock: follower <= leader + margin at every tick"""
+    def interlock(values):
+        if follower in values and leader in values:
+            values[follower] = min(values[follower], values[leader] + margin)
+    interlock.__name__ = f"{follower}<={leader}+{margin}"
+    return interlock
+
+
+def not_below(follower, leader, margin=0):
+    """Interlock: follower >= leader - margin at every tick"""
+    def interlock(values):
+        if follower in values and leader in values:
+            values[follower] = max(values[follower], values[leader] - margin)
+    interlock.__name__ = f"{follower}>={leader}-{margin}"
+    return interlock
+
+
+class RampOrchestrator:
+    """
+    Run several profiles on one clock with one coalesced write per tick
+
+    Args:
+        write_values: callable(dict name -> value) doing one batched write
+        tick: seconds between ticks
+        abort_event: threading.Event that aborts the ramp when set
+        interlocks: callables(values) adjusting the tick's values in place
+        clock: callable() -> seconds, the ramp's time source
+        wait: callable(seconds) -> True if aborted meanwhile
+            (default: abort_event.wait; inject both to run on virtual time)
+    """
+
+    def __init__(self, write_values, tick=0.1, abort_event=None, interlocks=(), clock=time.perf_counter,
+                 wait=None):
+        self.write_values = write_values
+        self.tick = tick
+        self.abort_event = abort_event if abort_event is not None else threading.Event()
+        self.clock = clock
+        self.wait = wait if wait is not None else self.abort_event.wait
+        self.interlocks = list(interlocks)
+        self.profiles = {}
+        self.ticks = 0
+        self.writes = 0
+        self.aborted = False
+
+    def add(self, signal_name, profile):
+        """Drive signal_name along profile; returns self for chaining"""
+        self.profiles[signal_name] = profile
+        return self
+
+    def values_at(self, t):
+        """Target values of all profiles at t, after interlocks"""
+        values = {name: p.value_at(t) for name, p in self.profiles.items()}
+        for interlock in self.interlocks:
+            interlock(values)
+        return values
+
+    def run(self):
+        """
+        Execute the ramp; returns True when all profiles finished,
+        False when aborted
+        """
+        duration = max((p.duration for p in self.profiles.values()), default=0.0)
+        last = {}
+        start = self.clock()
+        tick_no = 0
+        while True:
+            if self.abort_event.is_set():
+                self.aborted = True
+                return False
+            t = min(tick_no * self.tick, duration)
+            values = self.values_at(t)
+            changed = {k: v for k, v in values.items() if last.get(k) != v}
+            if changed:
+                self.write_values(changed)
+                self.writes += 1
+                last.update(changed)
+            self.ticks += 1
+            if t >= duration:
+                return True
+            tick_no += 1
+            delay = start + tick_no * self.tick - self.clock()
+            if delay > 0 and self.wait(delay):
+                self.aborted = True
+                return False
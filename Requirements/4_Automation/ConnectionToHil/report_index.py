@@ -0,0 +1,461 @@
+"""
+Report Index - Cross-run aggregation of HIL test reports
+
+Incrementally indexes report outputs into a local SQLite database and
+generates one static trend page per requirement section with:
+- Pass-rate history
+- Per-check latency (time from step start to the check)
+- Flaky checks (checks that flip between pass and fail across runs)
+
+JSON Lines reports written by TestReporter.generate_jsonl are the primary
+input. Legacy HTML reports (report_*.html) are parsed as well so the
+existing history in FinalTest/ and Tests/ is not lost.
+
+Only files whose size or modification time changed since the last run are
+read, and files with identical content (e.g. copies under FinalTest/Newadded)
+are indexed once. A run written in several formats (HIL_REPORT_FORMATS=html,jsonl)
+is one run: runs are identified by section, test name and start time (to the
+second), and the JSONL copy, which carries check timing, wins over the HTML.
+
+Usage:
+    python report_index.py ../../FinalTest ../../Tests --db report_index.sqlite --out trends
+"""
+
+from datetime import datetime
+from pathlib import Path
+import argparse
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+import sqlite3
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    section TEXT NOT NULL,
+    test_name TEXT,
+    started TEXT NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    duration REAL
+);
+CREATE TABLE IF NOT EXISTS checks (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    step TEXT,
+    signal TEXT NOT NULL,
+    expected TEXT,
+    actual TEXT,
+    passed INTEGER NOT NULL,
+    latency REAL
+);
+CREATE INDEX IF NOT EXISTS runs_section_started ON runs(section, started);
+CREATE INDEX IF NOT EXISTS checks_run ON checks(run_id);
+"""
+
+REPORT_SUFFIXES = (".jsonl", ".html")
+SECTION_RE = re.compile(r"req_section_(\d+)")
+FILE_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2}-\d{2}-\d{2})")
+
+# Legacy HTML layout produced by TestReporter.generate_html
+HTML_STATUS_RE = re.compile(r'<h3>Status</h3>\s*<div class="value">(\w+)</div>')
+HTML_DURATION_RE = re.compile(r'<h3>Duration</h3>\s*<div class="value">([\d.]+)s</div>')
+HTML_TITLE_RE = re.compile(r"<title>Test Report - (.*?)</title>", re.S)
+HTML_STARTED_RE = re.compile(r"Test started at (\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})")
+HTML_STEP_RE = re.compile(r'<div class="step-header">\s*<h3>(.*?)</h3>')
+HTML_CHECK_RE = re.compile(
+    r'<div class="check-item (passed|failed)">\s*'
+    r'<div class="check-signal">(.*?)</div>\s*'
+    r'<div class="check-expected">Expected: (.*?)</div>\s*'
+    r'<div class="check-actual">Actual: (.*?)</div>', re.S)
+
+
+class ReportRun:
+    """One parsed report: run metadata plus its check rows"""
+    __slots__ = ("section", "test_name", "started", "status", "duration", "checks")
+
+    def __init__(self, section, test_name, started, status, duration, checks):
+        self.section = section
+        self.test_name = test_name
+        self.started = started
+        self.status = status
+        self.duration = duration
+        self.checks = checks  # [(step, signal, expected, actual, passed, latency)]
+
+
+def section_of(path, test_name=""):
+    """Requirement section key for a report file, e.g. 'req_section_4'"""
+    match = SECTION_RE.search(path.name) or SECTION_RE.search(test_name or "")
+    if match:
+        return f"req_section_{int(match.group(1))}"
+    stem = path.stem
+    return stem[len("report_"):] if stem.startswith("report_") else stem
+
+
+def started_fallback(path):
+    """Run start time from the file name date, or the file mtime"""
+    match = FILE_DATE_RE.search(path.name)
+    if match:
+        return datetime.strptime(match.group(1), "%Y-%m-%d-%H-%M").isoformat()
+    return datetime.fromtimestamp(path.stat().st_mtime).isoformat(timespec="seconds")
+
+
+def parse_jsonl(path, text):
+    """Parse a TestReporter JSON Lines event stream"""
+    run_info, summary = {}, {}
+    checks = []
+    step_names, step_t = {}, {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        event = json.loads(line)
+        kind = event.get("type")
+        if kind == "check":
+            step = event.get("step")
+            latency = event["t"] - step_t[step] if step in step_t else None
+            checks.append((step_names.get(step), event["signal"],
+                           json.dumps(event.get("expected")), json.dumps(event.get("actual")),
+                           1 if event.get("passed") else 0, latency))
+        elif kind == "step":
+            step_names[event["step"]] = event.get("name")
+            step_t[event["step"]] = event.get("t", 0.0)
+        elif kind == "run":
+            run_info = event
+        elif kind == "summary":
+            summary = event
+
+    test_name = run_info.get("test", "")
+    passed = sum(c[4] for c in checks)
+    status = summary.get("status") or ("FAILED" if passed < len(checks) else "PASSED")
+    return ReportRun(section_of(path, test_name), test_name,
+                     run_info.get("start") or started_fallback(path),
+                     status, summary.get("duration"), checks)
+
+
+def parse_html(path, text):
+    """Parse a legacy TestReporter HTML page (no per-check timing available)"""
+    status = HTML_STATUS_RE.search(text)
+    if not status:
+        return None
+    duration = HTML_DURATION_RE.search(text)
+    title = HTML_TITLE_RE.search(text)
+    started = HTML_STARTED_RE.search(text)
+    test_name = html.unescape(title.group(1)) if title else ""
+
+    # Attribute each check to the closest preceding step header
+    steps = [(m.start(), html.unescape(m.group(1))) for m in HTML_STEP_RE.finditer(text)]
+    checks = []
+    step_idx = -1
+    for m in HTML_CHECK_RE.finditer(text):
+        while step_idx + 1 < len(steps) and steps[step_idx + 1][0] < m.start():
+            step_idx += 1
+        step = steps[step_idx][1] if step_idx >= 0 else None
+        checks.append((step, html.unescape(m.group(2)), html.unescape(m.group(3)),
+                       html.unescape(m.group(4)), 1 if m.group(1) == "passed" else 0, None))
+
+    return ReportRun(section_of(path, test_name), test_name,
+                     started.group(1).replace(" ", "T") if started else started_fallback(path),
+                     status.group(1), float(duration.group(1)) if duration else None, checks)
+
+
+def iter_report_files(roots):
+    """
+    Yield (path, stat) of the report files below ``roots``
+
+    Directories are walked with scandir, so only report files are stat'ed
+    (``DirEntry.stat``, one call per report for its size and mtime).
+    """
+    stack = [Path(r) for r in roots]
+    while stack:
+        current = stack.pop()
+        if current.is_file():
+            yield os.fspath(current), current.stat()
+            continue
+        try:
+            entries = os.scandir(current)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != "__pycache__":
+                        stack.append(Path(entry.path))
+                elif entry.name.startswith("report") and entry.name.endswith(REPORT_SUFFIXES):
+                    yield entry.path, entry.stat()
+
+
+def open_index(db_path):
+    """Open (and create if needed) the SQLite index"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def same_run(conn, run):
+    """(id, source) of an indexed run with the identity of ``run``, or None"""
+    return conn.execute(
+        "SELECT id, source FROM runs WHERE section = ? AND test_name IS ? AND substr(started, 1, 19) = ?",
+        (run.section, run.test_name, run.started[:19])).fetchone()
+
+
+def index_reports(conn, roots):
+    """
+    Index new or changed report files below ``roots``
+
+    Returns the set of sections that received new runs.
+    """
+    known = {path: (size, mtime) for path, size, mtime in
+             conn.execute("SELECT path, size, mtime_ns FROM files")}
+    known_hashes = {h for (h,) in conn.execute("SELECT content_hash FROM runs")}
+    touched = set()
+    new_files = 0
+
+    with conn:
+        for path, st in iter_report_files(roots):
+            path = os.path.abspath(path)
+            if known.get(path) == (st.st_size, st.st_mtime_ns):
+                continue
+            new_files += 1
+            data = Path(path).read_bytes()
+            digest = hashlib.sha1(data).hexdigest()
+            conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                         (path, st.st_size, st.st_mtime_ns, digest))
+            if digest in known_hashes:
+                continue
+            known_hashes.add(digest)
+
+            text = data.decode("utf-8", errors="replace")
+            try:
+                run = parse_jsonl(Path(path), text) if path.endswith(".jsonl") \
+                    else parse_html(Path(path), text)
+            except (ValueError, KeyError) as e:
+                logging.warning(f"Skipping unreadable report {path}: {e}")
+                continue
+            if run is None:
+                continue
+            indexed = same_run(conn, run)
+            if indexed is not None:
+                run_id, source = indexed
+                if source.endswith(".jsonl") or not path.endswith(".jsonl"):
+                    continue  # the same run from another report format
+                conn.execute("DELETE FROM checks WHERE run_id = ?", (run_id,))
+                conn.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+
+            passed = sum(c[4] for c in run.checks)
+            cursor = conn.execute(
+                "INSERT INTO runs (content_hash, section, test_name, started, source, status,"
+                " total, passed, failed, duration) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (digest, run.section, run.test_name, run.started, path, run.status,
+                 len(run.checks), passed, len(run.checks) - passed, run.duration))
+            conn.executemany(
+                "INSERT INTO checks (run_id, step, signal, expected, actual, passed, latency)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(cursor.lastrowid,) + c for c in run.checks])
+            touched.add(run.section)
+
+    logging.info(f"Indexed {new_files} new/changed file(s), {len(touched)} section(s) updated")
+    return touched
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    k = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[k]
+
+
+def section_trends(conn, section, history=200):
+    """Collect pass-rate history, check latencies and flaky checks of a section"""
+    runs = conn.execute(
+        "SELECT id, started, status, total, passed, failed FROM runs"
+        " WHERE section = ? ORDER BY started DESC, id DESC LIMIT ?",
+        (section, history)).fetchall()[::-1]
+    run_ids = [r[0] for r in runs]
+    order = {run_id: i for i, run_id in enumerate(run_ids)}
+
+    latencies = {}
+    outcomes = {}
+    if run_ids:
+        placeholders = ",".join("?" * len(run_ids))
+        for run_id, step, signal, passed, latency in conn.execute(
+                f"SELECT run_id, step, signal, passed, latency FROM checks"
+                f" WHERE run_id IN ({placeholders})", run_ids):
+            if latency is not None:
+                latencies.setdefault(signal, []).append(latency)
+            outcomes.setdefault((step or "", signal), []).append((order[run_id], passed))
+
+    latency_rows = []
+    for signal, values in sorted(latencies.items()):
+        values.sort()
+        latency_rows.append((signal, len(values), percentile(values, 50),
+                             percentile(values, 95), values[-1]))
+
+    flaky_rows = []
+    for (step, signal), results in outcomes.items():
+        results.sort()
+        fails = sum(1 for _, p in results if not p)
+        if 0 < fails < len(results):
+            flips = sum(1 for a, b in zip(results, results[1:]) if a[1] != b[1])
+            flaky_rows.append((step, signal, len(results), fails, flips))
+    flaky_rows.sort(key=lambda r: (-r[4], -r[3], r[1]))
+
+    return runs, latency_rows, flaky_rows
+
+
+PAGE_STYLE = """
+        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: #f5f5f5; padding: 20px; color: #333; }
+        .container { max-width: 1200px; margin: 0 auto; background: white; box-shadow: 0 2px 10px rgba(0,0,0,0.1); border-radius: 8px; padding: 30px; }
+        h1 { font-size: 26px; margin-bottom: 6px; }
+        h2 { font-size: 18px; margin: 30px 0 10px; color: #495057; }
+        table { border-collapse: collapse; width: 100%; font-size: 13px; }
+        th, td { text-align: left; padding: 6px 10px; border-bottom: 1px solid #dee2e6; }
+        th { background: #f8f9fa; text-transform: uppercase; font-size: 12px; color: #6c757d; }
+        td.num { font-family: 'Courier New', monospace; text-align: right; }
+        .passed { color: #28a745; } .failed { color: #dc3545; }
+        .muted { color: #6c757d; font-size: 13px; }
+"""
+
+
+def _page(title, body):
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>{html.escape(title)}</title>
+    <style>{PAGE_STYLE}    </style>
+</head>
+<body>
+    <div class="container">
+{body}
+    </div>
+</body>
+</html>
+"""
+
+
+def _pass_rate_svg(runs, width=1100, height=160):
+    """Bar chart of per-run pass rate (green = passed, red = failed)"""
+    if not runs:
+        return '<p class="muted">No runs indexed.</p>'
+    bar = width / len(runs)
+    parts = [f'<svg width="{width}" height="{height + 20}" role="img">']
+    for i, (_, started, status, total, passed, _) in enumerate(runs):
+        rate = passed / total if total else 0.0
+        h = max(1.0, rate * height)
+        color = "#28a745" if status == "PASSED" else "#dc3545"
+        parts.append(f'<rect x="{i * bar:.1f}" y="{height - h:.1f}" width="{max(bar - 1, 1):.1f}"'
+                     f' height="{h:.1f}" fill="{color}"><title>{html.escape(started)}:'
+                     f' {passed}/{total}</title></rect>')
+    parts.append(f'<line x1="0" y1="{height}" x2="{width}" y2="{height}" stroke="#dee2e6"/></svg>')
+    return "".join(parts)
+
+
+def _fmt(value):
+    return "-" if value is None else f"{value * 1000:.1f} ms"
+
+
+def write_section_page(conn, section, out_dir, history=200):
+    """Write trends/<section>.html and return its path"""
+    runs, latency_rows, flaky_rows = section_trends(conn, section, history)
+    passed_runs = sum(1 for r in runs if r[2] == "PASSED")
+    body = [f"        <h1>{html.escape(section)}</h1>",
+            f'        <p class="muted">{len(runs)} run(s) shown, {passed_runs} passed'
+            f" &middot; generated {datetime.now():%Y-%m-%d %H:%M:%S}</p>",
+            "        <h2>Pass-rate history</h2>",
+            "        " + _pass_rate_svg(runs),
+            "        <table><tr><th>Started</th><th>Status</th><th>Checks</th><th>Passed</th><th>Failed</th></tr>"]
+    for _, started, status, total, passed, failed in reversed(runs):
+        body.append(f'        <tr><td>{html.escape(started)}</td><td class="{status.lower()}">{status}</td>'
+                    f'<td class="num">{total}</td><td class="num">{passed}</td><td class="num">{failed}</td></tr>')
+    body.append("        </table>")
+
+    body.append("        <h2>Per-check latency</h2>")
+    if latency_rows:
+        body.append("        <table><tr><th>Signal</th><th>Samples</th><th>p50</th><th>p95</th><th>Max</th></tr>")
+        for signal, count, p50, p95, worst in latency_rows:
+            body.append(f"        <tr><td>{html.escape(signal)}</td><td class=\"num\">{count}</td>"
+                        f'<td class="num">{_fmt(p50)}</td><td class="num">{_fmt(p95)}</td>'
+                        f'<td class="num">{_fmt(worst)}</td></tr>')
+        body.append("        </table>")
+    else:
+        body.append('        <p class="muted">No timing data (legacy HTML reports only).</p>')
+
+    body.append("        <h2>Flaky checks</h2>")
+    if flaky_rows:
+        body.append("        <table><tr><th>Step</th><th>Signal</th><th>Runs</th><th>Failures</th><th>Flips</th></tr>")
+        for step, signal, count, fails, flips in flaky_rows:
+            body.append(f"        <tr><td>{html.escape(step)}</td><td>{html.escape(signal)}</td>"
+                        f'<td class="num">{count}</td><td class="num">{fails}</td><td class="num">{flips}</td></tr>')
+        body.append("        </table>")
+    else:
+        body.append('        <p class="muted">No flaky checks.</p>')
+
+    out_file = Path(out_dir, f"{section}.html")
+    out_file.write_text(_page(f"Trends - {section}", "\n".join(body)), encoding="utf-8")
+    return str(out_file)
+
+
+def write_overview_page(conn, out_dir):
+    """Write trends/index.html linking every section page"""
+    rows = conn.execute(
+        "SELECT section, COUNT(*), SUM(status = 'PASSED'), MAX(started) FROM runs GROUP BY section"
+    ).fetchall()
+
+    def sort_key(row):
+        match = SECTION_RE.fullmatch(row[0])
+        return (0, int(match.group(1)), "") if match else (1, 0, row[0])
+
+    body = ["        <h1>HIL report trends</h1>",
+            "        <table><tr><th>Section</th><th>Runs</th><th>Passed</th><th>Last run</th></tr>"]
+    for section, count, passed, last in sorted(rows, key=sort_key):
+        body.append(f'        <tr><td><a href="{html.escape(section)}.html">{html.escape(section)}</a></td>'
+                    f'<td class="num">{count}</td><td class="num">{passed}</td><td>{html.escape(last)}</td></tr>')
+    body.append("        </table>")
+    out_file = Path(out_dir, "index.html")
+    out_file.write_text(_page("HIL report trends", "\n".join(body)), encoding="utf-8")
+    return str(out_file)
+
+
+def build(roots, db_path="report_index.sqlite", out_dir="trends", history=200, rebuild_pages=False):
+    """Index ``roots`` and regenerate the trend pages of every updated section"""
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    conn = open_index(db_path)
+    try:
+        touched = index_reports(conn, roots)
+        if rebuild_pages:
+            touched = {s for (s,) in conn.execute("SELECT DISTINCT section FROM runs")}
+        for section in sorted(touched):
+            write_section_page(conn, section, out_dir, history)
+        write_overview_page(conn, out_dir)
+    finally:
+        conn.close()
+    return touched
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index HIL reports and generate trend pages")
+    parser.add_argument("roots", nargs="*", default=["."], help="Report files or directories to scan")
+    parser.add_argument("--db", default="report_index.sqlite", help="SQLite index file")
+    parser.add_argument("--out", default="trends", help="Output directory for trend pages")
+    parser.add_argument("--history", type=int, default=200, help="Runs per section shown on trend pages")
+    parser.add_argument("--all", action="store_true", help="Regenerate every section page")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    build(args.roots, args.db, args.out, args.history, args.all)
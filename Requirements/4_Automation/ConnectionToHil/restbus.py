@@ -0,0 +1,237 @@
+"""
+Rest-Bus Simulator - Send every frame the ECU under test receives, at its DBC cycle time
+
+The HIL tests only poke a few single-point channels; a real vehicle sends
+the CCM dozens of cyclic frames. The simulator takes every CAN frame from
+another node that carries a signal the CCM receives, initialises its
+payload from GenSigStartValue and transmits it:
+
+    Cyclic frames         every GenMsgCycleTime ms, phases spread over the cycle
+    other send types      once at start and whenever one of their signals is set
+
+Scheduling runs on a hashed timer wheel with 1 ms slots: each tick costs
+one slot lookup, independent of the number of frames. The clock thread
+sleeps coarse and spins the last half millisecond (like SafetyWatchdog)
+and reports its own jitter (actual tick start vs. scheduled start).
+
+Frames go to a bus object with ``send(frame_id, data, timestamp)``;
+``MemoryBus`` is the in-process stand-in that records traffic and bus load
+for offline runs.
+"""
+
+import logging
+import threading
+import time
+
+from signal_db import DUT_NODES, encode_frame
+from signal_latency import LatencyHistogram
+
+
+class TimerWheel:
+    """Hashed timer wheel: schedule(ticks, item), advance() -> items due now"""
+
+    def __init__(self, slots=1024):
+        self.slots = [[] for _ in range(slots)]
+        self.now = 0
+
+    def schedule(self, ticks, item):
+        due = self.now + max(int(ticks), 1)
+        self.slots[due % len(self.slots)].append((due, item))
+
+    def advance(self):
+        self.now += 1
+        slot = self.slots[self.now % len(self.slots)]
+        if not slot:
+            return []
+        due = [item for when, item in slot if when == self.now]
+        if len(due) != len(slot):
+            slot[:] = [entry for entry in slot if entry[0] != self.now]  # later rounds stay
+        else:
+            slot.clear()
+        return due
+
+
+def frame_bits(length, extended=True):
+    """Worst-case bits on the wire of a classic CAN frame (with bit stuffing)"""
+    overhead = 67 if extended else 47
+    return overhead + 8 * length + (overhead - 13 + 8 * length - 1) // 4
+
+
+class MemoryBus:
+    """In-memory bus: last payload per frame id, counters, optional listeners"""
+
+    def __init__(self, bitrate=500_000):
+        self.bitrate = bitrate
+        self.last = {}
+        self.counts = {}
+        self.bits = 0
+        self.listeners = []
+        self.first_t = self.last_t = None
+
+    def send(self, frame_id, data, timestamp):
+        self.last[frame_id] = (data, timestamp)
+        self.counts[frame_id] = self.counts.get(frame_id, 0) + 1
+        self.bits += frame_bits(len(data))
+        self.first_t = timestamp if self.first_t is None else self.first_t
+        self.last_t = timestamp
+        for listener in self.listeners:
+            listener(frame_id, data, timestamp)
+
+    def load(self):
+        """Share of the bitrate used so far (0..1)"""
+        if self.first_t is None or self.last_t <= self.first_t:
+            return 0.0
+        return self.bits / (self.bitrate * (self.last_t - self.first_t))
+
+
+def received_frames(db, dut_nodes=DUT_NODES, bus="CAN"):
+    """Frames of other nodes that carry at least one signal a DUT node receives"""
+    return [frame for frame in db.frames.values()
+            if frame.bus == bus and frame.transmitter not in dut_nodes
+            and any(set(dut_nodes) & set(db.signals[s].receivers) for s in frame.signals if s in db.signals)]
+
+
+class RestBusSimulator:
+    """
+    Periodic transmission of the DUT's input frames
+
+    Args:
+        db: SignalDB
+        bus: object with send(frame_id, data, timestamp) (MemoryBus by default)
+        frames: frames to simulate (default: received_frames(db))
+        tick: wheel resolution in seconds
+    """
+
+    def __init__(self, db, bus=None, frames=None, tick=0.001):
+        self.db = db
+        self.bus = bus if bus is not None else MemoryBus()
+        self.tick = tick
+        self.frames = {f.name: f for f in (frames if frames is not None else received_frames(db))}
+        self.frame_of = {s: f for f in self.frames.values() for s in f.signals}
+        self.payloads = {}
+        for frame in self.frames.values():
+            initial = {s: db.signals[s].initial for s in frame.signals
+                       if s in db.signals and db.signals[s].initial is not None and db.signals[s].length <= 64}
+            self.payloads[frame.name] = encode_frame(db, frame, initial)
+        periods = [self._period(f) or 0 for f in self.frames.values()]
+        self.wheel = TimerWheel(max([1024] + [p + 1 for p in periods]))
+        self._pending = []
+        for i, frame in enumerate(self.frames.values()):
+            period = self._period(frame)
+            if period is None:
+                self._pending.append(frame)  # sent once at start
+            else:
+                # Spread the first transmissions over the cycle instead of one burst
+                self.wheel.schedule(i % period, frame)
+
+        self.sent = 0
+        self.late_ticks = 0
+        self.jitter = LatencyHistogram()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_ns = None
+
+    def _period(self, frame):
+        """Cycle in ticks, or None for frames sent on change only"""
+        if frame.send_type != "Cyclic" or not frame.cycle_ms:
+            return None
+        return max(1, round(frame.cycle_ms / 1000 / self.tick))
+
+    def set(self, name, value):
+        """Update a signal; frames without a cycle go out on the next tick"""
+        frame = self.frame_of[name]
+        with self._lock:
+            self.payloads[frame.name] = encode_frame(self.db, frame, {name: value}, self.payloads[frame.name])
+            if self._period(frame) is None:
+                self._pending.append(frame)
+
+    def set_many(self, values):
+        for name, value in values.items():
+            self.set(name, value)
+
+    def advance(self, ticks=1):
+        """Run ``ticks`` wheel ticks without waiting (virtual time); returns frames sent"""
+        sent = 0
+        for _ in range(ticks):
+            sent += self._tick((self.wheel.now + 1) * self.tick)
+        return sent
+
+    def _tick(self, timestamp):
+        with self._lock:
+            due = self.wheel.advance()
+            if self._pending:
+                due.extend(self._pending)
+                self._pending = []
+            for frame in due:
+                self.bus.send(frame.id, self.payloads[frame.name], timestamp)
+                period = self._period(frame)
+                if period is not None:
+                    self.wheel.schedule(period, frame)
+        self.sent += len(due)
+        return len(due)
+
+    def start(self):
+        """Start transmitting in real time from a background thread"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="RestBusSimulator", daemon=True)
+            self._thread.start()
+            logging.debug(f"Rest-bus simulation of {len(self.frames)} frames started")
+        return self
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _run(self):
+        tick_ns = int(self.tick * 1e9)
+        self._started_ns = start = time.perf_counter_ns()
+        next_tick = start + tick_ns
+        while not self._stop.is_set():
+            now = time.perf_counter_ns()
+            if now < next_tick:
+                remaining = next_tick - now
+                if remaining > 1_000_000:
+                    self._stop.wait((remaining - 500_000) / 1e9)
+                    if self._stop.is_set():
+                        break
+                while time.perf_counter_ns() < next_tick:
+                    pass
+                now = time.perf_counter_ns()
+            self.jitter.record((now - next_tick) // 1000)
+            self._tick((now - start) / 1e9)
+            next_tick += tick_ns
+            behind = time.perf_counter_ns() - next_tick
+            if behind > tick_ns:
+                # Overran: process the missed ticks now so no cycle is lost
+                missed = behind // tick_ns
+                self.late_ticks += missed
+                for _ in range(missed):
+                    self._tick((time.perf_counter_ns() - start) / 1e9)
+                next_tick += missed * tick_ns
+
+    def stats(self):
+        """Traffic and timing summary (milliseconds) for the report"""
+        to_ms = lambda us: None if us is None else us / 1000
+        elapsed = None if self._started_ns is None else (time.perf_counter_ns() - self._started_ns) / 1e9
+        return {
+            "frames": len(self.frames),
+            "cyclic_frames": sum(self._period(f) is not None for f in self.frames.values()),
+            "sent": self.sent,
+            "frames_per_s": None if not elapsed else self.sent / elapsed,
+            "late_ticks": self.late_ticks,
+            "jitter_p50_ms": to_ms(self.jitter.percentile(50)),
+            "jitter_p99_ms": to_ms(self.jitter.percentile(99)),
+            "jitter_max_ms": to_ms(self.jitter.max),
+            "bus_load": self.bus.load() if hasattr(self.bus, "load") else None,
+        }
@@ -0,0 +1,144 @@
+"""
+Safety Watchdog - High-rate hardware protection independent of the test flow
+
+Runs in its own daemon thread, samples the safety-relevant channels at a
+fixed rate with one batched read per cycle, evaluates them and triggers the
+shutdown callback as soon as a sample is unsafe. The test body only has to
+look at ``tripped`` - it no longer decides when safety is checked.
+
+The watchdog reports its own timing:
+- sampling jitter (actual cycle start vs. scheduled start)
+- trip latency (unsafe sample read -> shutdown callback finished)
+"""
+
+import logging
+import threading
+import time
+
+from signal_latency import LatencyHistogram
+
+
+class SafetyWatchdog:
+    """
+    Periodic safety monitor
+
+    Args:
+        read_values: callable(names) -> list of values, one batched read
+        signal_names: channels to sample every cycle
+        evaluate: callable(dict name -> value) -> list of warning strings
+        on_trip: callable(reason) run once when the first warning appears
+        rate_hz: sampling rate
+    """
+
+    def __init__(self, read_values, signal_names, evaluate, on_trip, rate_hz=50.0):
+        self.read_values = read_values
+        self.signal_names = list(signal_names)
+        self.evaluate = evaluate
+        self.on_trip = on_trip
+        self.period = 1.0 / rate_hz
+        self.rate_hz = rate_hz
+
+        self.tripped = threading.Event()
+        self.trip_reason = ""
+        self.trip_latency = None
+        self.samples = 0
+        self.missed_cycles = 0
+        self.read_errors = 0
+        self.jitter = LatencyHistogram()
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling in a background thread"""
+        if self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._run, name="SafetyWatchdog", daemon=True)
+        self._thread.start()
+        logging.debug(f"Safety watchdog started at {self.rate_hz:.0f} Hz")
+        return self
+
+    def stop(self, timeout=1.0):
+        """Stop sampling and wait for the thread to exit"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _run(self):
+        period_ns = int(self.period * 1e9)
+        next_tick = time.perf_counter_ns()
+        while not self._stop.is_set():
+            now = time.perf_counter_ns()
+            if now < next_tick:
+                # Sleep coarse, then spin the last half millisecond for a tight start
+                remaining = next_tick - now
+                if remaining > 1_000_000:
+                    self._stop.wait((remaining - 500_000) / 1e9)
+                    if self._stop.is_set():
+                        break
+                while time.perf_counter_ns() < next_tick:
+                    pass
+                now = time.perf_counter_ns()
+            self.jitter.record((now - next_tick) // 1000)
+
+            self._sample()
+            if self.tripped.is_set():
+                break
+
+            next_tick += period_ns
+            behind = time.perf_counter_ns() - next_tick
+            if behind > 0:
+                # Overran one or more cycles: skip them instead of bursting
+                skipped = behind // period_ns + 1
+                self.missed_cycles += skipped
+                next_tick += skipped * period_ns
+
+    def _sample(self):
+        try:
+            values = self.read_values(self.signal_names)
+        except Exception as e:  # gateway hiccup: count it, keep watching
+            self.read_errors += 1
+            logging.warning(f"Safety watchdog read failed: {e}")
+            return
+        sampled_ns = time.perf_counter_ns()
+        self.samples += 1
+
+        warnings = self.evaluate(dict(zip(self.signal_names, values)))
+        if warnings:
+            self.trip("; ".join(warnings), sampled_ns)
+
+    def trip(self, reason, sampled_ns=None):
+        """Run the shutdown callback once; safe to call from any thread"""
+        if self.tripped.is_set():
+            return
+        self.tripped.set()
+        self.trip_reason = reason
+        sampled_ns = time.perf_counter_ns() if sampled_ns is None else sampled_ns
+        try:
+            self.on_trip(reason)
+        finally:
+            self.trip_latency = (time.perf_counter_ns() - sampled_ns) / 1e9
+
+    def stats(self):
+        """Timing summary (milliseconds) for the report"""
+        to_ms = lambda us: None if us is None else us / 1000
+        return {
+            "rate_hz": self.rate_hz,
+            "samples": self.samples,
+            "missed_cycles": self.missed_cycles,
+            "read_errors": self.read_errors,
+            "jitter_p50_ms": to_ms(self.jitter.percentile(50)),
+            "jitter_p99_ms": to_ms(self.jitter.percentile(99)),
+            "jitter_max_ms": to_ms(self.jitter.max),
+            "tripped": self.tripped.is_set(),
+            "trip_reason": self.trip_reason,
+            "trip_latency_ms": None if self.trip_latency is None else self.trip_latency * 1000,
+        }
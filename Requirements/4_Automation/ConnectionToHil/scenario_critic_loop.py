@@ -0,0 +1,157 @@
+"""
+Scenario Critic Loop - Writer/critic rounds per requirement section, in parallel
+
+For every requirement row the writer drafts a scenario, the draft is
+checked and the findings go back to the writer until the draft is accepted
+or ``max_attempts`` is used up. Two checks run on each draft:
+
+1. the FeasibilityOracle (signal_db.py): unknown signals, sets on read-only
+   IN signals, out-of-range values. Deterministic and local, so a draft with
+   such findings goes straight back to the writer.
+2. the critic - only for drafts the oracle has nothing against.
+
+Sections are independent and run in a process pool; every worker loads the
+signal index once (from the load_db cache). Results are written the way
+the old generator wrote them, so generation_pipeline.py adopts them:
+
+    scenario_<section>_<timestamp>.md
+    Scenario_Writer_Critic_Error_Log_<section>_<timestamp>.md   (when rejected at least once)
+
+Writer and critic are "module:function" callables:
+    writer(row, feedback) -> markdown          (feedback: list of findings so far)
+    critic(row, markdown) -> list of findings  (empty list: accepted)
+
+Usage:
+    python scenario_critic_loop.py --writer my_llm:write --critic my_llm:critique [--jobs 8]
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+import argparse
+import importlib
+import json
+import logging
+import os
+
+from generation_pipeline import REQUIREMENTS_DIR, read_requirements
+from signal_db import DEFAULT_CACHE_DIR, DEFAULT_DB_DIR, FeasibilityOracle, load_db
+
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_CONFIG = HERE / "projectConfig.json"
+DEFAULT_OUT_DIR = REQUIREMENTS_DIR / "FinalTest"
+MAX_ATTEMPTS = 6
+
+_oracle = None
+
+
+def load_callable(spec):
+    module_name, _, func_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def load_oracle(db_dir=DEFAULT_DB_DIR, config=DEFAULT_CONFIG, cache_dir=DEFAULT_CACHE_DIR):
+    hil_var = None
+    if config and Path(config).exists():
+        hil_var = json.loads(Path(config).read_text(encoding="utf-8")).get("variables")
+    return FeasibilityOracle(load_db(db_dir, cache_dir), hil_var)
+
+
+def _init_worker(db_dir, config, cache_dir):
+    global _oracle
+    _oracle = load_oracle(db_dir, config, cache_dir)
+
+
+def refine(row, writer, critic, oracle, max_attempts=MAX_ATTEMPTS):
+    """
+    Writer/critic rounds for one requirement row
+
+    Returns a dict with the accepted flag, the last draft, the findings per
+    attempt and how often the oracle and the critic rejected.
+    """
+    feedback, attempts = [], []
+    draft, accepted = None, False
+    oracle_rejections = critic_calls = 0
+    for attempt in range(1, max_attempts + 1):
+        draft = writer(row, list(feedback))
+        if not draft or not draft.strip():
+            findings = ["The draft scenario is empty."]
+        else:
+            findings = ["Feasibility Error: " + p for p in oracle.check_text(draft)]
+            if findings:
+                oracle_rejections += 1
+            else:
+                critic_calls += 1
+                findings = list(critic(row, draft))
+        if not findings:
+            accepted = True
+            break
+        message = " ".join(findings)
+        attempts.append(message)
+        feedback.append(f"[Attempt #{attempt}] {message}")
+    return {"section": row.get("chunk_id", ""), "accepted": accepted, "draft": draft,
+            "attempts": attempts, "oracle_rejections": oracle_rejections, "critic_calls": critic_calls}
+
+
+def _run_section(row, writer_spec, critic_spec, max_attempts):
+    return refine(row, load_callable(writer_spec), load_callable(critic_spec), _oracle, max_attempts)
+
+
+def write_outputs(result, row, out_dir, stamp):
+    """Scenario and error log files in the generator's naming scheme; returns their paths"""
+    section = result["section"]
+    paths = []
+    if result["accepted"]:
+        path = Path(out_dir) / f"scenario_{section}_{stamp}.md"
+        path.write_text(result["draft"], encoding="utf-8")
+        paths.append(path)
+    if result["attempts"]:
+        path = Path(out_dir) / f"Scenario_Writer_Critic_Error_Log_{section}_{stamp}.md"
+        path.write_text(
+            f"This is the Error logs for {section}.\n"
+            f"Requirement text:\n{row.get('source', '')}\n\n"
+            f"Test scenario Draft\n{result['draft'] or ''}\n\n"
+            + ",".join(f"[Attempt #{i}] {m}" for i, m in enumerate(result["attempts"], 1)) + "\n",
+            encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def run(requirements, writer_spec, critic_spec, out_dir=DEFAULT_OUT_DIR, sections=None, jobs=None,
+        max_attempts=MAX_ATTEMPTS, db_dir=DEFAULT_DB_DIR, config=DEFAULT_CONFIG, cache_dir=DEFAULT_CACHE_DIR):
+    """Refine ``sections`` (default: all) in a process pool; returns the per-section results"""
+    sections = list(sections or requirements)
+    load_db(db_dir, cache_dir)  # parse once here so the workers start from the cache
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y-%m-%d-%H-%M")
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(db_dir, config, cache_dir)) as pool:
+        futures = [pool.submit(_run_section, requirements[s], writer_spec, critic_spec, max_attempts)
+                   for s in sections]
+        for section, future in zip(sections, futures):
+            result = future.result()
+            write_outputs(result, requirements[section], out_dir, stamp)
+            logging.info(f"{section}: {'accepted' if result['accepted'] else 'rejected'} after "
+                         f"{len(result['attempts']) + result['accepted']} attempts "
+                         f"({result['oracle_rejections']} by the oracle, {result['critic_calls']} critic calls)")
+            results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel scenario writer/critic loop")
+    parser.add_argument("requirements", nargs="?", default=str(REQUIREMENTS_DIR / "requirements.csv"),
+                        help="requirements.csv (title, source, chunk_id)")
+    parser.add_argument("--writer", required=True, help="module:function(row, feedback) -> markdown")
+    parser.add_argument("--critic", required=True, help="module:function(row, markdown) -> findings")
+    parser.add_argument("--out", default=str(DEFAULT_OUT_DIR), help="Output directory")
+    parser.add_argument("--sections", nargs="*", help="Only these sections (e.g. req_section_3)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Sections refined in parallel")
+    parser.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    run(read_requirements(args.requirements), args.writer, args.critic, args.out, args.sections,
+        args.jobs, args.max_attempts)
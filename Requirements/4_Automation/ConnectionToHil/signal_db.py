@@ -0,0 +1,468 @@
+"""
+Signal DB - Index over the DBC/LDF databases and projectConfig.json
+
+Parses the communication databases in DB/ once into plain lookup tables:
+
+    frames:  name -> Frame (id, length, transmitter, send type, cycle time, signals)
+    signals: name -> DbSignal (frame, bit layout, scaling, range, value table)
+    groups:  name -> (frame id, [signal names])       (DBC SIG_GROUP_)
+    e2e:     signal name -> {"data_id", "data_length", "profile"}  (E2E* attributes)
+
+Direction follows the rig's point of view: signals sent by the ECU under
+test (CCM, the LIN master) are IN (read only), everything else is
+simulated by the rig and therefore OUT. projectConfig.json overrides this
+for the signals it maps to VeriStand channels.
+
+``load_db`` caches the parsed index (pickle, keyed by the hash of the
+database files) so a worker process pays a file read instead of a parse.
+
+``encode_frame``/``decode_frame`` pack physical values into a payload and
+back (Intel and Motorola byte order).
+
+``FeasibilityOracle`` answers "does it exist / can the rig write it / which
+values are valid" for a signal with one dict lookup, and checks a whole
+scenario before anybody spends time critiquing it.
+"""
+
+from pathlib import Path
+import hashlib
+import os
+import pickle
+import re
+
+from hil_runtime.scenario import parse_scenario
+from hil_runtime.signals import SignalMap
+from hil_runtime.steps import Set
+
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_DB_DIR = HERE.parent.parent.parent / "DB"
+DEFAULT_CACHE_DIR = os.environ.get("HIL_SIGNAL_DB_CACHE", ".signal_db_cache")
+DUT_NODES = ("CCM",)
+INDEX_VERSION = 3
+
+
+class Frame:
+    """One CAN or LIN frame"""
+    __slots__ = ("name", "id", "length", "transmitter", "send_type", "cycle_ms", "cycle_fast_ms", "signals", "bus")
+
+    def __init__(self, name, frame_id, length, transmitter, bus):
+        self.name = name
+        self.id = frame_id
+        self.length = length
+        self.transmitter = transmitter
+        self.send_type = "Cyclic"
+        self.cycle_ms = None
+        self.cycle_fast_ms = None
+        self.signals = []
+        self.bus = bus
+
+    def __repr__(self):
+        return f"Frame({self.name!r}, {self.bus}, id={self.id})"
+
+
+class DbSignal:
+    """One signal of a frame, with scaling and the valid physical range"""
+    __slots__ = ("name", "frame", "start", "length", "little_endian", "signed", "factor", "offset",
+                 "minimum", "maximum", "unit", "receivers", "initial", "values", "direction")
+
+    def __init__(self, name, frame, start, length, little_endian=True, signed=False, factor=1.0,
+                 offset=0.0, minimum=None, maximum=None, unit="", receivers=(), initial=None):
+        self.name = name
+        self.frame = frame
+        self.start = start
+        self.length = length
+        self.little_endian = little_endian
+        self.signed = signed
+        self.factor = factor
+        self.offset = offset
+        raw_lo, raw_hi = ((-(1 << (length - 1)), (1 << (length - 1)) - 1) if signed
+                          else (0, (1 << length) - 1))
+        if length > 64:
+            minimum = maximum = None  # byte arrays (free text) have no numeric range
+        elif minimum is None or maximum is None or minimum == maximum:
+            # [0|0] in the DBC means "not specified": the raw range applies
+            minimum, maximum = sorted((raw_lo * factor + offset, raw_hi * factor + offset))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.unit = unit
+        self.receivers = tuple(receivers)
+        self.initial = initial
+        self.values = {}
+        self.direction = "OUT"
+
+    def __repr__(self):
+        return f"DbSignal({self.name!r}, {self.frame}, {self.direction})"
+
+
+class SignalDB:
+    """Merged index over several databases; the first definition of a name wins"""
+
+    def __init__(self):
+        self.frames = {}
+        self.signals = {}
+        self.groups = {}
+        self.e2e = {}
+
+    def add_frame(self, frame):
+        self.frames.setdefault(frame.name, frame)
+
+    def add_signal(self, signal):
+        self.signals.setdefault(signal.name, signal)
+
+    def frame_of(self, signal_name):
+        signal = self.signals.get(signal_name)
+        return None if signal is None else self.frames.get(signal.frame)
+
+
+_NUMBER = r"[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?"
+_DBC_FRAME = re.compile(r"^BO_\s+(\d+)\s+(\w+)\s*:\s*(\d+)\s+(\w+)")
+_DBC_SIGNAL = re.compile(
+    rf"^\s+SG_\s+(\w+)\s*(?:\w+\s*)?:\s*(\d+)\|(\d+)@([01])([+-])\s*\(({_NUMBER}),({_NUMBER})\)"
+    rf"\s*\[({_NUMBER})\|({_NUMBER})\]\s*\"([^\"]*)\"\s*(.*)$")
+_DBC_FRAME_ATTR = re.compile(r'^BA_\s+"(GenMsgCycleTime|GenMsgCycleTimeFast|GenMsgSendType)"\s+BO_\s+(\d+)\s+(\d+)\s*;')
+_DBC_SEND_TYPES = re.compile(r'^BA_DEF_\s+BO_\s+"GenMsgSendType"\s+ENUM\s+(.*);')
+_DBC_START = re.compile(rf'^BA_\s+"GenSigStartValue"\s+SG_\s+(\d+)\s+(\w+)\s+({_NUMBER})\s*;')
+_DBC_VALUES = re.compile(r"^VAL_\s+(\d+)\s+(\w+)\s+(.*);")
+_DBC_E2E = re.compile(r'^BA_\s+"E2E(DataId|DataLength|Profile)"\s+SG_\s+\d+\s+(\w+)\s+"?(\w+)"?\s*;')
+_DBC_GROUP = re.compile(r"^SIG_GROUP_\s+(\d+)\s+(\w+)\s+\d+\s*:\s*(.*);")
+_VALUE_PAIR = re.compile(rf'({_NUMBER})\s+"([^"]*)"')
+
+
+def parse_dbc(text, db=None, bus="CAN", dut_nodes=DUT_NODES):
+    """Add the frames, signals and signal groups of a DBC file to ``db``"""
+    db = db if db is not None else SignalDB()
+    by_id, frame = {}, None
+    send_types = []
+    for line in text.splitlines():
+        m = _DBC_FRAME.match(line)
+        if m:
+            frame = Frame(m.group(2), int(m.group(1)), int(m.group(3)), m.group(4), bus)
+            by_id[frame.id] = frame
+            db.add_frame(frame)
+            continue
+        m = _DBC_SIGNAL.match(line)
+        if m and frame is not None:
+            signal = DbSignal(m.group(1), frame.name, int(m.group(2)), int(m.group(3)),
+                              little_endian=m.group(4) == "1", signed=m.group(5) == "-",
+                              factor=float(m.group(6)), offset=float(m.group(7)),
+                              minimum=float(m.group(8)), maximum=float(m.group(9)), unit=m.group(10),
+                              receivers=[r for r in re.split(r"[,\s]+", m.group(11)) if r])
+            signal.direction = "IN" if frame.transmitter in dut_nodes else "OUT"
+            frame.signals.append(signal.name)
+            db.add_signal(signal)
+            continue
+        if not line.startswith(("BA_", "VAL_ ", "SIG_GROUP_ ")):
+            frame = None if line.strip() == "" else frame
+            continue
+        frame = None
+        m = _DBC_SEND_TYPES.match(line)
+        if m:
+            send_types = re.findall(r'"([^"]*)"', m.group(1))
+        m = _DBC_FRAME_ATTR.match(line)
+        if m and int(m.group(2)) in by_id:
+            target, value = by_id[int(m.group(2))], int(m.group(3))
+            if m.group(1) == "GenMsgSendType":
+                target.send_type = send_types[value] if value < len(send_types) else str(value)
+            elif m.group(1) == "GenMsgCycleTime":
+                target.cycle_ms = value or None
+            else:
+                target.cycle_fast_ms = value or None
+        m = _DBC_START.match(line) or _DBC_VALUES.match(line)
+        if m and m.group(2) in db.signals:
+            signal = db.signals[m.group(2)]
+            if line.startswith("VAL_"):
+                signal.values = {int(float(v)): label for v, label in _VALUE_PAIR.findall(m.group(3))}
+            else:
+                signal.initial = float(m.group(3)) * signal.factor + signal.offset
+        m = _DBC_E2E.match(line)
+        if m:
+            key = {"DataId": "data_id", "DataLength": "data_length", "Profile": "profile"}[m.group(1)]
+            db.e2e.setdefault(m.group(2), {})[key] = m.group(3) if key == "profile" else int(m.group(3))
+        m = _DBC_GROUP.match(line)
+        if m:
+            db.groups.setdefault(m.group(2), (int(m.group(1)), m.group(3).split()))
+    return db
+
+
+def to_raw(signal, value):
+    """Raw (unsigned, masked) field value of a physical value"""
+    raw = int(round((value - signal.offset) / signal.factor))
+    return raw & ((1 << signal.length) - 1)
+
+
+def from_raw(signal, raw):
+    if signal.signed and raw & (1 << (signal.length - 1)):
+        raw -= 1 << signal.length
+    return raw * signal.factor + signal.offset
+
+
+def _shift(signal, frame_length):
+    """Bit offset of the signal's LSB in the payload read as one integer"""
+    if signal.little_endian:
+        return signal.start  # payload as a little-endian integer
+    msb = 8 * (signal.start // 8) + 7 - signal.start % 8  # big-endian bit index of the MSB
+    return 8 * frame_length - msb - signal.length
+
+
+def encode_frame(db, frame, values, payload=None):
+    """Payload bytes of ``frame`` with ``values`` (name -> physical) packed in"""
+    data = bytes(payload) if payload is not None else bytes(frame.length)
+    for name, value in values.items():
+        signal = db.signals[name]
+        order = "little" if signal.little_endian else "big"
+        shift = _shift(signal, frame.length)
+        word = int.from_bytes(data, order) & ~(((1 << signal.length) - 1) << shift)
+        data = (word | to_raw(signal, value) << shift).to_bytes(frame.length, order)
+    return data
+
+
+def decode_frame(db, frame, data):
+    """name -> physical value for every signal of ``frame``"""
+    little, big = int.from_bytes(data, "little"), int.from_bytes(data, "big")
+    values = {}
+    for name in frame.signals:
+        signal = db.signals.get(name)
+        if signal is None or signal.start is None or signal.length > 64:
+            continue
+        raw = (little if signal.little_endian else big) >> _shift(signal, frame.length)
+        values[name] = from_raw(signal, raw & ((1 << signal.length) - 1))
+    return values
+
+
+def update_bits(db):
+    """
+    {signal name: update bit name}: ``X_UB`` covers signal ``X``, a group
+    update bit ``G_UB`` covers every member of signal group ``G``
+    """
+    pairs = {}
+    for name in db.signals:
+        if not name.endswith("_UB"):
+            continue
+        base = name[:-3]
+        if base in db.signals:
+            pairs[base] = name
+        elif base in db.groups:
+            for member in db.groups[base][1]:
+                if member != name:
+                    pairs.setdefault(member, name)
+    return pairs
+
+
+def _ldf_blocks(text):
+    """Top-level LDF blocks ("Signals", "Frames", ...) -> body text"""
+    blocks, i = {}, 0
+    for m in re.finditer(r"^(\w+)\s*\{", text, re.M):
+        if m.start() < i:
+            continue
+        depth, j = 0, m.end() - 1
+        while j < len(text):
+            depth += {"{": 1, "}": -1}.get(text[j], 0)
+            if depth == 0:
+                break
+            j += 1
+        blocks[m.group(1)] = text[m.end():j]
+        i = j
+    return blocks
+
+
+def parse_ldf(text, db=None, bus="LIN", dut_nodes=DUT_NODES):
+    """Add the frames and signals of an LDF file to ``db``"""
+    db = db if db is not None else SignalDB()
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = re.sub(r"//[^\n]*|/\*.*?\*/", "", text, flags=re.S)
+    blocks = _ldf_blocks(text)
+
+    layout = {}
+    for m in re.finditer(r"(\w+)\s*:\s*(\d+)\s*,\s*(\w+)\s*,\s*(\d+)\s*\{([^}]*)\}", blocks.get("Frames", "")):
+        frame = Frame(m.group(1), int(m.group(2)), int(m.group(4)), m.group(3), bus)
+        db.add_frame(frame)
+        for name, offset in re.findall(r"(\w+)\s*,\s*(\d+)\s*;", m.group(5)):
+            frame.signals.append(name)
+            layout.setdefault(name, (frame.name, int(offset)))
+
+    encodings = {}
+    for m in re.finditer(r"(\w+)\s*\{([^}]*)\}", blocks.get("Signal_encoding_types", "")):
+        logical = {int(v): label for v, label in
+                   re.findall(r'logical_value\s*,\s*(\d+)\s*,\s*"([^"]*)"', m.group(2))}
+        physical = [tuple(float(x) for x in p) for p in re.findall(
+            rf"physical_value\s*,\s*(\d+)\s*,\s*(\d+)\s*,\s*({_NUMBER})\s*,\s*({_NUMBER})", m.group(2))]
+        encodings[m.group(1)] = (logical, physical)
+    representation = {}
+    for m in re.finditer(r"(\w+)\s*:\s*([^;]*);", blocks.get("Signal_representation", "")):
+        for name in re.split(r"[,\s]+", m.group(2).strip()):
+            representation[name] = m.group(1)
+
+    for m in re.finditer(r"(\w+)\s*:\s*(\d+)\s*,\s*(\{[^}]*\}|\d+)\s*,\s*(\w+)\s*((?:,\s*\w+\s*)*);",
+                         blocks.get("Signals", "")):
+        name, size, init, publisher = m.group(1), int(m.group(2)), m.group(3), m.group(4)
+        frame_name, offset = layout.get(name, (None, None))
+        logical, physical = encodings.get(representation.get(name), ({}, []))
+        minimum = maximum = None
+        factor, scale_offset = 1.0, 0.0
+        if physical:
+            raw_lo, raw_hi, factor, scale_offset = physical[0]
+            ends = [lo * f + o for lo, hi, f, o in physical] + [hi * f + o for lo, hi, f, o in physical]
+            minimum, maximum = min(ends), max(ends)
+            if logical:
+                minimum, maximum = min(minimum, *logical), max(maximum, *logical)
+        signal = DbSignal(name, frame_name, offset, size, factor=factor, offset=scale_offset,
+                          minimum=minimum, maximum=maximum,
+                          receivers=[r for r in re.split(r"[,\s]+", m.group(5)) if r],
+                          initial=int(init) if init.isdigit() else None)
+        signal.values = logical
+        signal.direction = "IN" if publisher in dut_nodes else "OUT"
+        db.add_signal(signal)
+    return db
+
+
+def db_files(root=DEFAULT_DB_DIR):
+    root = Path(root)
+    files = sorted(root.iterdir()) if root.is_dir() else [root]
+    return [f for f in files if f.suffix.lower() in (".dbc", ".ldf")]
+
+
+def parse_files(paths):
+    """SignalDB over DBC/LDF files; the bus name is taken from the file name (LIN28_CCM.ldf -> LIN28)"""
+    db = SignalDB()
+    for path in paths:
+        path = Path(path)
+        text = path.read_text(encoding="utf-8", errors="replace")
+        if path.suffix.lower() == ".dbc":
+            parse_dbc(text, db)
+        else:
+            parse_ldf(text, db, bus=path.stem.split("_")[0])
+    return db
+
+
+def load_db(root=DEFAULT_DB_DIR, cache_dir=DEFAULT_CACHE_DIR):
+    """Parsed SignalDB for the databases under ``root``, cached by content hash"""
+    paths = db_files(root)
+    digest = hashlib.sha256(str(INDEX_VERSION).encode())
+    for path in paths:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    cached = Path(cache_dir) / f"{digest.hexdigest()[:24]}.pickle" if cache_dir else None
+    if cached is not None and cached.exists():
+        with open(cached, "rb") as f:
+            return pickle.load(f)
+    db = parse_files(paths)
+    if cached is not None:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_suffix(f".{os.getpid()}.tmp")  # parallel workers must not share it
+        with open(tmp, "wb") as f:
+            pickle.dump(db, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cached)
+    return db
+
+
+_CODE_NAME = re.compile(r"`(\w+)`")
+_MANUAL_SET = re.compile(r"^Step:\s*Set\s+`(\w+)`", re.I)
+
+
+class Feasibility:
+    """Oracle answer for one signal name"""
+    __slots__ = ("name", "exists", "mapped", "writable", "minimum", "maximum", "values", "source")
+
+    def __init__(self, name, exists=False, mapped=False, writable=False, minimum=None, maximum=None,
+                 values=None, source=""):
+        self.name = name
+        self.exists = exists
+        self.mapped = mapped
+        self.writable = writable
+        self.minimum = minimum
+        self.maximum = maximum
+        self.values = values or {}
+        self.source = source
+
+    def in_range(self, value):
+        if not isinstance(value, (int, float)) or self.minimum is None:
+            return True
+        return self.minimum <= value <= self.maximum
+
+    def __repr__(self):
+        return (f"Feasibility({self.name!r}, exists={self.exists}, writable={self.writable}, "
+                f"range=[{self.minimum}, {self.maximum}])")
+
+
+class FeasibilityOracle:
+    """
+    Deterministic signal feasibility checks over a SignalDB and a config
+
+    Args:
+        db: SignalDB (load_db())
+        hil_var: config variables; mapped signals take their direction from here
+    """
+
+    def __init__(self, db, hil_var=None):
+        self.db = db
+        self.channels = SignalMap(hil_var)
+        self._answers = {}
+
+    def lookup(self, name):
+        """Feasibility of one signal (memoised)"""
+        answer = self._answers.get(name)
+        if answer is None:
+            answer = self._answers[name] = self._lookup(name)
+        return answer
+
+    def _lookup(self, name):
+        signal = self.db.signals.get(name)
+        mapped = name in self.channels.outputs or name in self.channels.inputs
+        if signal is None and not mapped:
+            return Feasibility(name)
+        writable = name in self.channels.outputs if mapped else signal.direction == "OUT"
+        if signal is None:
+            return Feasibility(name, True, True, writable, source="config")
+        frame = self.db.frames.get(signal.frame)
+        return Feasibility(name, True, mapped, writable, signal.minimum, signal.maximum, signal.values,
+                           source=f"{frame.bus}/{frame.name}" if frame else "")
+
+    def check(self, scenario):
+        """
+        Problems that make an automated scenario infeasible, as critic-style
+        messages; an empty list means the scenario can be run as written
+        """
+        if not scenario.automated:
+            return []
+        problems = []
+        seen = set()
+
+        def report(message):
+            if message not in seen:
+                seen.add(message)
+                problems.append(message)
+
+        def check_value(answer, value):
+            if not answer.in_range(value):
+                report(f"Value {value} of '{answer.name}' is outside its range "
+                       f"[{answer.minimum:g}, {answer.maximum:g}].")
+
+        def check_signal(name, value, write):
+            answer = self.lookup(name)
+            if not answer.exists:
+                report(f"Signal '{name}' not found in DB.")
+                return
+            if not answer.mapped:
+                report(f"Signal '{name}' has no HIL channel in projectConfig.json.")
+            if write and not answer.writable:
+                report(f"Cannot set incoming signal '{name}'; it is sent by the ECU and read-only.")
+            check_value(answer, value)
+
+        for name, value in scenario.preconditions:
+            check_signal(name, value, write=False)
+        for action, expects in scenario.nodes:
+            if isinstance(action, Set):
+                check_signal(action.name, action.value, write=True)
+            for name, value in expects:
+                check_signal(name, value, write=False)
+        # Lines the parser could not compile (e.g. "Set `X` to Maximum_Value") still name signals
+        for line in scenario.manual:
+            for name in _CODE_NAME.findall(line):
+                check_signal(name, None, write=_MANUAL_SET.match(line) is not None
+                             and _MANUAL_SET.match(line).group(1) == name)
+        return problems
+
+    def check_text(self, markdown):
+        """``check`` for scenario markdown"""
+        return self.check(parse_scenario(markdown))
@@ -0,0 +1,169 @@
+"""
+Signal Latency - Request -> status response time measurement
+
+Every write of a request signal (e.g. MaxDefrostRequest) is timestamped and
+the first following read of the paired status signal (MaxDefrostStatus) that
+shows the written value closes the measurement. Latencies are kept per pair
+in HDR-style log-linear histograms, so memory stays constant no matter how
+many samples are recorded, and p50/p95/p99 are available for the report.
+
+Pairs are derived from the signal names:
+    XRequest     -> XStatus          (MaxDefrostRequest -> MaxDefrostStatus)
+    XRequest_Y   -> XStatus_Y        (ClimateAirDistRequest_Floor -> ClimateAirDistStatus_Floor)
+    XReq         -> XStatus          (CabHeatManReq -> CabHeatManStatus)
+Pairs that do not follow the naming are listed in PAIR_OVERRIDES.
+"""
+
+from array import array
+import math
+import time
+
+
+PAIR_OVERRIDES = {
+    "HVACBlowerRequest": "HVACBlowerLevelStat_BlowerLevel",
+    "BunkHVACBlowerRequest": "BunkHVACBlwrLvlStat_BlowerLevel",
+}
+
+SUB_BUCKET_BITS = 7  # 128 sub-buckets per power of two -> < 1% value error
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+
+
+def status_candidates(request_name):
+    """Possible status names for a request signal, most specific first"""
+    if request_name in PAIR_OVERRIDES:
+        return [PAIR_OVERRIDES[request_name]]
+    candidates = []
+    for marker in ("Request", "Req"):
+        head, sep, tail = request_name.rpartition(marker)
+        if sep and (not tail or tail.startswith("_")):
+            candidates.append(f"{head}Status{tail}")
+            break
+    return candidates
+
+
+def paired_status(request_name, known_status=None):
+    """
+    Status signal paired with ``request_name``, or None
+
+    When ``known_status`` (e.g. the CAN IN signal names) is given, only a
+    candidate that exists there is returned.
+    """
+    for candidate in status_candidates(request_name):
+        if known_status is None or candidate in known_status:
+            return candidate
+    return None
+
+
+class LatencyHistogram:
+    """Log-linear (HDR-style) histogram of integer microsecond values"""
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = array("Q")
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def _index(value):
+        if value < SUB_BUCKET_COUNT:
+            return value
+        shift = value.bit_length() - SUB_BUCKET_BITS - 1
+        return (shift + 1) * SUB_BUCKET_COUNT + (value >> shift) - SUB_BUCKET_COUNT
+
+    @staticmethod
+    def _value(index):
+        """Midpoint of the value range covered by bucket ``index``"""
+        if index < SUB_BUCKET_COUNT:
+            return index
+        shift = index // SUB_BUCKET_COUNT - 1
+        low = (index % SUB_BUCKET_COUNT + SUB_BUCKET_COUNT) << shift
+        return low + ((1 << shift) >> 1)
+
+    def record(self, value_us):
+        """Add one sample (microseconds)"""
+        value_us = max(0, int(value_us))
+        index = self._index(value_us)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value_us
+        self.min = value_us if self.min is None else min(self.min, value_us)
+        self.max = value_us if self.max is None else max(self.max, value_us)
+
+    def percentile(self, q):
+        """Value (microseconds) at percentile ``q`` (0-100), or None if empty"""
+        if not self.count:
+            return None
+        target = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for index, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+
+class LatencyTracker:
+    """Pairs request writes with the first matching status read"""
+
+    def __init__(self, known_status=None, tolerance=0.1):
+        self.known_status = set(known_status) if known_status is not None else None
+        self.tolerance = tolerance
+        self.histograms = {}  # (request, status) -> LatencyHistogram
+        self._pending = {}    # status -> (request, value, t_ns)
+        self._pair_cache = {}
+
+    def _status_for(self, request_name):
+        try:
+            return self._pair_cache[request_name]
+        except KeyError:
+            status = paired_status(request_name, self.known_status)
+            self._pair_cache[request_name] = status
+            return status
+
+    def on_write(self, signal_name, value, t_ns=None):
+        """Start (or restart) a measurement if ``signal_name`` has a status pair"""
+        status = self._status_for(signal_name)
+        if status is not None:
+            self._pending[status] = (signal_name, value,
+                                     time.perf_counter_ns() if t_ns is None else t_ns)
+
+    def on_read(self, signal_name, value, t_ns=None):
+        """
+        Close the pending measurement for ``signal_name`` if ``value`` matches
+
+        Returns the latency in seconds when a measurement was closed.
+        """
+        pending = self._pending.get(signal_name)
+        if pending is None:
+            return None
+        request, expected, start_ns = pending
+        try:
+            matched = abs(value - expected) <= self.tolerance
+        except TypeError:
+            matched = value == expected
+        if not matched:
+            return None
+        del self._pending[signal_name]
+        elapsed_ns = (time.perf_counter_ns() if t_ns is None else t_ns) - start_ns
+        histogram = self.histograms.get((request, signal_name))
+        if histogram is None:
+            histogram = self.histograms[(request, signal_name)] = LatencyHistogram()
+        histogram.record(elapsed_ns // 1000)
+        return elapsed_ns / 1e9
+
+    def summary(self):
+        """Rows of (request, status, count, p50_ms, p95_ms, p99_ms, max_ms)"""
+        rows = []
+        for (request, status), h in sorted(self.histograms.items()):
+            rows.append((request, status, h.count,
+                         h.percentile(50) / 1000, h.percentile(95) / 1000,
+                         h.percentile(99) / 1000, h.max / 1000))
+        return rows
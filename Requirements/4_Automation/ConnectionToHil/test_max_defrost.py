@@ -16,7 +16,7 @@ Converted: 2025-12-22
 
 import pytest
 import asyncio
-from niveristand.clientapi import ChannelReference
+import hil_modules
 from hil_modules import read_project_config
 from test_reporter import TestReporter
 
@@ -39,7 +39,7 @@ def set_can_signal(hil_var, signal_name, value):
     """Helper function to set CAN OUT signals"""
     try:
         signal_path = hil_var["CAN"]["OUT"][signal_name]
-        ChannelReference(signal_path).value = value
+        hil_modules.ChannelReference(signal_path).value = value
         print(f"  SET: {signal_name} = {value}")
         if reporter:
             reporter.add_set(signal_name, value)
@@ -221,7 +221,7 @@ def test_max_defrost(hil_config):
     async def check_max_defrost_on():
         try:
             signal_path = hil_var["CAN"]["IN"]["MaxDefrostStatus"]
-            value = ChannelReference(signal_path).value
+            value = hil_modules.ChannelReference(signal_path).value
             return abs(value - 1.0) <= 0.1
         except:
             return False
@@ -256,8 +256,8 @@ def test_max_defrost(hil_config):
     
     # Verify cabin heater at maximum
     checks_passed &= check_can_signal(hil_var, "CabHeatManStatus", 10)
-    # Generate HTML report
-    report_path = reporter.generate_html("test_max_defrost_report.html")
+    # Generate reports (HTML / JUnit / JSONL per HIL_REPORT_FORMATS)
+    report_paths = reporter.generate_reports("test_max_defrost_report.html")
     
     if checks_passed:
         print("\n" + "="*70)
@@ -268,7 +268,8 @@ def test_max_defrost(hil_config):
         print("✗ MAX DEFROST TEST - FAILED")
         print("="*70)
     
-    print(f"\n📊 HTML Report generated: {report_path}")
+    for fmt, report_path in report_paths.items():
+        print(f"\n📊 {fmt.upper()} Report generated: {report_path}")
     print(f"   Open in browser to see detailed results\n")
     else:
         print("\n" + "="*70)
@@ -7,75 +7,170 @@ Creates detailed, visual HTML reports with:
 - Pass/Fail status with color coding
 - Timestamps for each step
 - Summary statistics
+- Request -> status response latency percentiles (when a tracker is attached)
+
+Besides HTML, the same run can be written as JUnit XML (for CI test result
+ingestion) and as a JSON Lines event stream with one record per
+set/check/note. Set ``HIL_REPORT_FORMATS`` (e.g. ``junit,jsonl``) to choose
+which formats ``generate_reports`` writes; leaving ``html`` out skips the
+HTML page entirely.
+
+Records are kept in compact ``__slots__`` objects in one canonical store per
+kind (sets, checks, notes). Steps only remember index ranges into those
+stores, and timestamps are monotonic ``perf_counter_ns`` values that are
+converted to wall-clock time when the report is rendered. Recording is
+thread-safe, so a safety watchdog thread can add notes and sets while the
+test body runs.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
 import json
+import os
+import sys
+import threading
+import time
+
+
+REPORT_FORMATS = ("html", "junit", "jsonl")
+REPORT_SUFFIXES = {"html": ".html", "junit": ".xml", "jsonl": ".jsonl"}
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+class StepRecord:
+    """A test step; owns index ranges into the reporter's record stores"""
+    __slots__ = ("name", "description", "t_ns",
+                 "set_start", "set_end",
+                 "check_start", "check_end",
+                 "note_start", "note_end")
+
+    def __init__(self, name, description, t_ns, set_start, check_start, note_start):
+        self.name = name
+        self.description = description
+        self.t_ns = t_ns
+        self.set_start = self.set_end = set_start
+        self.check_start = self.check_end = check_start
+        self.note_start = self.note_end = note_start
+
+
+class SetRecord:
+    """A single signal write"""
+    __slots__ = ("signal", "value", "t_ns")
+
+    def __init__(self, signal, value, t_ns):
+        self.signal = signal
+        self.value = value
+        self.t_ns = t_ns
+
+
+class CheckRecord:
+    """A single signal check (expected vs actual)"""
+    __slots__ = ("signal", "expected", "actual", "passed", "tolerance", "t_ns")
+
+    def __init__(self, signal, expected, actual, passed, tolerance, t_ns):
+        self.signal = signal
+        self.expected = expected
+        self.actual = actual
+        self.passed = passed
+        self.tolerance = tolerance
+        self.t_ns = t_ns
+
+
+class NoteRecord:
+    """A free-text note attached to a step"""
+    __slots__ = ("text", "t_ns")
+
+    def __init__(self, text, t_ns):
+        self.text = text
+        self.t_ns = t_ns
 
 
 class TestReporter:
     """Generates detailed HTML reports for test execution"""
+    __test__ = False  # not a pytest test class
     
-    def __init__(self, test_name, description=""):
+    def __init__(self, test_name, description="", formats=None):
         self.test_name = test_name
         self.description = description
+        if formats is None:
+            formats = os.environ.get("HIL_REPORT_FORMATS", "html").split(",")
+        self.formats = tuple(f.strip().lower() for f in formats if f.strip())
+        unknown = set(self.formats) - set(REPORT_FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown report format(s): {', '.join(sorted(unknown))}")
         self.start_time = datetime.now()
+        self._start_ns = time.perf_counter_ns()
         self.steps = []
+        self.sets = []
         self.checks = []
+        self.notes = []
         self.current_step = None
         self.failed = False
-        
+        self._passed_count = 0
+        self._lock = threading.Lock()
+        self.latency = None  # optional signal_latency.LatencyTracker
+        
+    @property
+    def passed_count(self):
+        """Number of checks recorded as passed"""
+        return self._passed_count
+    
+    def wall_time(self, t_ns):
+        """Convert a perf_counter_ns timestamp into a wall-clock datetime"""
+        return self.start_time + timedelta(microseconds=(t_ns - self._start_ns) // 1000)
+    
     def add_step(self, step_name, description=""):
         """Add a new test step"""
-        step = {
-            "name": step_name,
-            "description": description,
-            "timestamp": datetime.now(),
-            "checks": [],
-            "sets": []
-        }
-        self.steps.append(step)
-        self.current_step = step
+        with self._lock:
+            step = StepRecord(step_name, description, time.perf_counter_ns(),
+                              len(self.sets), len(self.checks), len(self.notes))
+            self.steps.append(step)
+            self.current_step = step
         return step
     
     def add_set(self, signal_name, value):
         """Record a signal set operation"""
-        if self.current_step:
-            self.current_step["sets"].append({
-                "signal": signal_name,
-                "value": value,
-                "timestamp": datetime.now()
-            })
+        with self._lock:
+            step = self.current_step
+            if step:
+                self.sets.append(SetRecord(sys.intern(signal_name), value, time.perf_counter_ns()))
+                step.set_end = len(self.sets)
     
     def add_check(self, signal_name, expected, actual, passed, tolerance=None):
         """Record a signal check operation"""
-        check = {
-            "signal": signal_name,
-            "expected": expected,
-            "actual": actual,
-            "passed": passed,
-            "tolerance": tolerance,
-            "timestamp": datetime.now()
-        }
-        
-        if self.current_step:
-            self.current_step["checks"].append(check)
-        
-        self.checks.append(check)
-        
-        if not passed:
-            self.failed = True
+        with self._lock:
+            self.checks.append(CheckRecord(sys.intern(signal_name), expected, actual,
+                                           passed, tolerance, time.perf_counter_ns()))
+            
+            step = self.current_step
+            if step:
+                step.check_end = len(self.checks)
+            
+            if passed:
+                self._passed_count += 1
+            else:
+                self.failed = True
     
     def add_note(self, note):
         """Add a note to current step"""
-        if self.current_step:
-            if "notes" not in self.current_step:
-                self.current_step["notes"] = []
-            self.current_step["notes"].append({
-                "text": note,
-                "timestamp": datetime.now()
-            })
+        with self._lock:
+            step = self.current_step
+            if step:
+                self.notes.append(NoteRecord(note, time.perf_counter_ns()))
+                step.note_end = len(self.notes)
+    
+    def step_sets(self, step):
+        """Sets recorded while ``step`` was current"""
+        return self.sets[step.set_start:step.set_end]
+    
+    def step_checks(self, step):
+        """Checks recorded while ``step`` was current"""
+        return self.checks[step.check_start:step.check_end]
+    
+    def step_notes(self, step):
+        """Notes recorded while ``step`` was current"""
+        return self.notes[step.note_start:step.note_end]
     
     def generate_html(self, output_path="test_report.html"):
         """Generate HTML report file"""
@@ -83,7 +178,7 @@ class TestReporter:
         duration = (end_time - self.start_time).total_seconds()
         
         total_checks = len(self.checks)
-        passed_checks = sum(1 for c in self.checks if c["passed"])
+        passed_checks = self._passed_count
         failed_checks = total_checks - passed_checks
         
         status = "FAILED" if self.failed else "PASSED"
@@ -363,32 +458,35 @@ class TestReporter:
         
         # Add steps
         for step in self.steps:
-            step_time = step["timestamp"].strftime("%H:%M:%S.%f")[:-3]
+            step_time = self.wall_time(step.t_ns).strftime("%H:%M:%S.%f")[:-3]
+            sets = self.step_sets(step)
+            checks = self.step_checks(step)
+            notes = self.step_notes(step)
             
             html += f"""
             <div class="step">
                 <div class="step-header">
-                    <h3>{step["name"]}</h3>
+                    <h3>{step.name}</h3>
                     <span class="step-time">{step_time}</span>
                 </div>
                 <div class="step-body">
 """
             
-            if step["description"]:
+            if step.description:
                 html += f"""
-                    <p class="step-description">{step["description"]}</p>
+                    <p class="step-description">{step.description}</p>
 """
             
             # Add sets
-            if step["sets"]:
+            if sets:
                 html += """
                     <div class="sets">
                         <h4>Signal Sets</h4>
 """
-                for s in step["sets"]:
+                for s in sets:
                     html += f"""
                         <div class="set-item">
-                            <span class="signal">{s["signal"]}</span> = {s["value"]}
+                            <span class="signal">{s.signal}</span> = {s.value}
                         </div>
 """
                 html += """
@@ -396,22 +494,22 @@ class TestReporter:
 """
             
             # Add checks
-            if step["checks"]:
+            if checks:
                 html += """
                     <div class="checks">
                         <h4>Signal Checks</h4>
 """
-                for c in step["checks"]:
-                    status_class = "passed" if c["passed"] else "failed"
-                    status_text = "✓ PASS" if c["passed"] else "✗ FAIL"
+                for c in checks:
+                    status_class = "passed" if c.passed else "failed"
+                    status_text = "✓ PASS" if c.passed else "✗ FAIL"
                     
-                    tolerance_text = f" (±{c['tolerance']})" if c['tolerance'] else ""
+                    tolerance_text = f" (±{c.tolerance})" if c.tolerance else ""
                     
                     html += f"""
                         <div class="check-item {status_class}">
-                            <div class="check-signal">{c["signal"]}</div>
-                            <div class="check-expected">Expected: {c["expected"]}{tolerance_text}</div>
-                            <div class="check-actual">Actual: {c["actual"]}</div>
+                            <div class="check-signal">{c.signal}</div>
+                            <div class="check-expected">Expected: {c.expected}{tolerance_text}</div>
+                            <div class="check-actual">Actual: {c.actual}</div>
                             <div class="check-status">{status_text}</div>
                         </div>
 """
@@ -420,14 +518,14 @@ class TestReporter:
 """
             
             # Add notes
-            if "notes" in step:
+            if notes:
                 html += """
                     <div class="notes">
                         <h4>Notes</h4>
 """
-                for note in step["notes"]:
+                for note in notes:
                     html += f"""
-                        <div class="note-item">• {note["text"]}</div>
+                        <div class="note-item">• {note.text}</div>
 """
                 html += """
                     </div>
@@ -438,6 +536,31 @@ class TestReporter:
             </div>
 """
         
+        # Add request -> status response latencies
+        latency_rows = self.latency.summary() if self.latency else []
+        if latency_rows:
+            html += """
+            <div class="step">
+                <div class="step-header">
+                    <h3>Response Latency</h3>
+                    <span class="step-time">request write &rarr; first matching status read</span>
+                </div>
+                <div class="step-body">
+                    <div class="checks">
+"""
+            for request, status_signal, count, p50, p95, p99, worst in latency_rows:
+                html += f"""
+                        <div class="set-item">
+                            <span class="signal">{request} &rarr; {status_signal}</span>
+                            n={count} | p50 {p50:.1f} ms | p95 {p95:.1f} ms | p99 {p99:.1f} ms | max {worst:.1f} ms
+                        </div>
+"""
+            html += """
+                    </div>
+                </div>
+            </div>
+"""
+        
         html += f"""
         </div>
         
@@ -456,3 +579,127 @@ class TestReporter:
         output_file.write_text(html, encoding='utf-8')
         
         return str(output_file.absolute())
+
+    def generate_reports(self, output_path="test_report.html"):
+        """
+        Write every configured report format next to ``output_path``
+
+        The suffix of ``output_path`` is replaced per format (.html, .xml,
+        .jsonl). Returns a dict of format -> absolute path written.
+        """
+        base = Path(output_path)
+        writers = {
+            "html": self.generate_html,
+            "junit": self.generate_junit,
+            "jsonl": self.generate_jsonl,
+        }
+        return {fmt: writers[fmt](str(base.with_suffix(REPORT_SUFFIXES[fmt])))
+                for fmt in self.formats}
+
+    def _step_index(self):
+        """Map each check position to the step that owns it"""
+        owner = [None] * len(self.checks)
+        for step in self.steps:
+            for i in range(step.check_start, step.check_end):
+                owner[i] = step
+        return owner
+
+    def generate_junit(self, output_path="test_report.xml"):
+        """Generate a JUnit XML file with one testcase per signal check"""
+        end_time = datetime.now()
+        duration = (end_time - self.start_time).total_seconds()
+        total_checks = len(self.checks)
+        failed_checks = total_checks - self._passed_count
+        suite = quoteattr(self.test_name)
+        owners = self._step_index()
+
+        output_file = Path(output_path)
+        with open(output_file, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write(f'<testsuites tests="{total_checks}" failures="{failed_checks}" '
+                    f'time="{duration:.3f}">\n')
+            f.write(f'  <testsuite name={suite} tests="{total_checks}" '
+                    f'failures="{failed_checks}" errors="0" skipped="0" '
+                    f'time="{duration:.3f}" '
+                    f'timestamp="{self.start_time.isoformat(timespec="seconds")}">\n')
+            for c, step in zip(self.checks, owners):
+                step_name = step.name if step else self.test_name
+                elapsed = (c.t_ns - step.t_ns) / 1e9 if step else 0.0
+                f.write(f'    <testcase classname={quoteattr(step_name)} '
+                        f'name={quoteattr(c.signal)} time="{elapsed:.3f}"')
+                if c.passed:
+                    f.write('/>\n')
+                    continue
+                tolerance_text = f" (±{c.tolerance})" if c.tolerance else ""
+                message = f"expected {c.expected}{tolerance_text}, actual {c.actual}"
+                f.write(f'>\n      <failure message={quoteattr(message)}>'
+                        f'{escape(message)}</failure>\n    </testcase>\n')
+            f.write('    <system-out>')
+            for step in self.steps:
+                f.write(escape(f"[{step.name}]\n"))
+                for s in self.step_sets(step):
+                    f.write(escape(f"  SET {s.signal} = {s.value}\n"))
+                for n in self.step_notes(step):
+                    f.write(escape(f"  NOTE {n.text}\n"))
+            f.write('</system-out>\n  </testsuite>\n</testsuites>\n')
+
+        return str(output_file.absolute())
+
+    def generate_jsonl(self, output_path="test_report.jsonl"):
+        """
+        Generate a JSON Lines event stream
+
+        The first line describes the run, then one line per step, set, check
+        and note in chronological order, one line per request/status latency
+        pair (if a tracker is attached), and a final summary line.
+        """
+        end_time = datetime.now()
+        start_ns = self._start_ns
+        dumps = json.JSONEncoder(ensure_ascii=False, default=str).encode
+
+        def event(kind, step_no, t_ns, **fields):
+            record = {"type": kind, "step": step_no,
+                      "time": self.wall_time(t_ns).isoformat(timespec="microseconds"),
+                      "t": round((t_ns - start_ns) / 1e9, 6)}
+            record.update(fields)
+            return dumps(record) + "\n"
+
+        output_file = Path(output_path)
+        with open(output_file, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(dumps({"type": "run", "test": self.test_name,
+                           "description": self.description,
+                           "start": self.start_time.isoformat(timespec="microseconds")}) + "\n")
+            # Checks recorded before the first step have no owner
+            first_check = self.steps[0].check_start if self.steps else len(self.checks)
+            f.writelines(
+                event("check", None, c.t_ns, signal=c.signal, expected=c.expected,
+                      actual=c.actual, passed=c.passed, tolerance=c.tolerance)
+                for c in self.checks[:first_check])
+            for step_no, step in enumerate(self.steps):
+                f.write(event("step", step_no, step.t_ns, name=step.name,
+                              description=step.description))
+                records = sorted(
+                    [(s.t_ns, 0, s) for s in self.step_sets(step)]
+                    + [(c.t_ns, 1, c) for c in self.step_checks(step)]
+                    + [(n.t_ns, 2, n) for n in self.step_notes(step)],
+                    key=lambda r: (r[0], r[1]))
+                for t_ns, kind, r in records:
+                    if kind == 0:
+                        f.write(event("set", step_no, t_ns, signal=r.signal, value=r.value))
+                    elif kind == 1:
+                        f.write(event("check", step_no, t_ns, signal=r.signal,
+                                      expected=r.expected, actual=r.actual,
+                                      passed=r.passed, tolerance=r.tolerance))
+                    else:
+                        f.write(event("note", step_no, t_ns, text=r.text))
+            if self.latency:
+                for request, status_signal, count, p50, p95, p99, worst in self.latency.summary():
+                    f.write(dumps({"type": "latency", "request": request, "status": status_signal,
+                                   "count": count, "p50_ms": p50, "p95_ms": p95,
+                                   "p99_ms": p99, "max_ms": worst}) + "\n")
+            f.write(dumps({"type": "summary", "status": "FAILED" if self.failed else "PASSED",
+                           "total": len(self.checks), "passed": self._passed_count,
+                           "failed": len(self.checks) - self._passed_count,
+                           "duration": (end_time - self.start_time).total_seconds()}) + "\n")
+
+        return str(output_file.absolute())
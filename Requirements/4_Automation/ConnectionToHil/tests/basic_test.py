@@ -1,4 +1,4 @@
-from ConnectionToHil.hil_modules import connect_hil, disconnect_hil, read_project_config, connect_to_veristand, check_if_already_connected
+from hil_modules import connect_hil, disconnect_hil, read_project_config, connect_to_veristand, check_if_already_connected
 from niveristand.clientapi import BooleanValue, ChannelReference, DoubleValue
 from niveristand.library import wait
 from niveristand.legacy import NIVeriStand
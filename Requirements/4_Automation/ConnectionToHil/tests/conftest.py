@@ -1,3 +1,13 @@
+import sys
+from pathlib import Path
+
+# Import root of the tests, scripts and hil_runtime: the ConnectionToHil directory
+# (from hil_runtime import ..., from test_reporter import ...), whatever the cwd
+ROOT = str(Path(__file__).resolve().parent.parent)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
 # import pytest
 # from Hil_lab_project import read_project_config
 # from niveristand.legacy import NIVeriStand
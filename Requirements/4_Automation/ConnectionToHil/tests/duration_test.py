@@ -0,0 +1,68 @@
+import time
+
+from hil_runtime import Backend, SimulatorBackend
+from hil_runtime.duration import DurationCase, run_cases
+
+
+HIL_VAR = {"CAN_OUT": {"MaxDefrostRequest": "out/MaxDefrostRequest", "VehicleMode": "out/VehicleMode"},
+           "CAN_IN": {"MaxDefrostStatus": "in/MaxDefrostStatus"}}
+
+
+def timed_rig(timeout):
+    """Simulated CCM that ends Max Defrost ``timeout`` s after the request"""
+    def respond(state, name):
+        if name == "MaxDefrostStatus":
+            elapsed = backend.elapsed("MaxDefrostRequest")
+            return int(state.get("MaxDefrostRequest") == 1 and elapsed is not None and elapsed < timeout)
+        return None
+    backend = SimulatorBackend(respond)
+    return backend
+
+
+# tests
+
+def test_duration_cases_run_on_the_virtual_clock_in_parallel(tmp_path):
+    setup = {"VehicleMode": 6, "MaxDefrostRequest": 1}
+    cases = [DurationCase("on time", setup, "MaxDefrostStatus", 1, 0, deadline=600, margin=2),
+             DurationCase("too early", setup, "MaxDefrostStatus", 1, 0, deadline=900, margin=2)]
+    rigs = [timed_rig(600), timed_rig(600)]
+    started = time.perf_counter()
+    results = run_cases(cases, rigs, hil_var=HIL_VAR, report_dir=str(tmp_path))
+    assert results == {"on time": True, "too early": False}
+    assert time.perf_counter() - started < 5  # 25 virtual minutes
+    assert sorted(round(rig.now()) for rig in rigs) == [600, 600]  # both ended at the timer expiry
+
+
+def test_rig_is_reset_between_cases(tmp_path):
+    setup = {"VehicleMode": 6, "MaxDefrostRequest": 1}
+    cases = [DurationCase(f"c{i}", setup, "MaxDefrostStatus", 1, 0, deadline=600, margin=2) for i in range(3)]
+    rig = timed_rig(600)
+    results = run_cases(cases, [rig], hil_var=HIL_VAR, report_dir=str(tmp_path))
+    assert results == {"c0": True, "c1": True, "c2": True}
+    assert rig.state["MaxDefrostRequest"] == 0 and rig.state["VehicleMode"] == 0
+
+
+class SlowTimedRig(Backend):
+    """Real-time rig: reads take ``latency`` s, the status drops ``timeout`` s after the request"""
+
+    def __init__(self, timeout, latency):
+        self.timeout = timeout
+        self.latency = latency
+        self.requested_at = None
+
+    def read_many(self, signals):
+        time.sleep(self.latency)
+        active = self.requested_at is not None and time.monotonic() - self.requested_at < self.timeout
+        return [int(active) for _ in signals]
+
+    def write_many(self, signals, values):
+        if dict(zip((s.name for s in signals), values)).get("MaxDefrostRequest") == 1:
+            self.requested_at = time.monotonic()
+
+
+def test_duration_hold_is_not_cut_short_by_read_latency(tmp_path):
+    case = DurationCase("slow reads", {"MaxDefrostRequest": 1}, "MaxDefrostStatus", 1, 0,
+                        deadline=0.6, margin=0.2)
+    results = run_cases([case], [SlowTimedRig(0.6, latency=0.03)], hil_var=HIL_VAR,
+                        report_dir=str(tmp_path), hold_period=0.1)
+    assert results == {"slow reads": True}
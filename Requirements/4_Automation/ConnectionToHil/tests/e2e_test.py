@@ -0,0 +1,74 @@
+from e2e import E2EEngine, StampingBus, crc8, layouts
+from restbus import MemoryBus, RestBusSimulator
+from signal_db import parse_dbc
+
+
+DBC = """BO_ 2432689747 CIOM_Cab_20P: 8 CIOM
+ SG_ SideColliAccidentStat_RightSide : 15|3@1+ (1,0) [0|0] ""  CCM
+ SG_ SideColliAccidentStat_LeftSide : 12|3@1+ (1,0) [0|0] ""  CCM
+ SG_ SideColliAccidentStat_CRC : 0|8@1+ (1,0) [0|255] ""  CCM
+ SG_ SideColliAccidentStat_SqC : 8|4@1+ (1,0) [0|14] "NotApplicable"  CCM
+
+BO_ 2499788607 CIOM_Cab_21P: 8 CIOM
+ SG_ TrafficAccShutDownReq_CRC : 48|8@1+ (1,0) [0|255] ""  CCM
+ SG_ TrafficAccShutDownReq_Rqst : 60|2@1+ (1,0) [0|0] ""  CCM
+ SG_ TrafficAccShutDownReq_SqC : 56|4@1+ (1,0) [0|14] "NotApplicable"  CCM
+
+BA_ "GenMsgCycleTime" BO_ 2432689747 10;
+BA_ "E2EDataId" SG_ 2432689747 SideColliAccidentStat_CRC 426;
+BA_ "E2EDataLength" SG_ 2432689747 SideColliAccidentStat_CRC 24;
+BA_ "E2EProfile" SG_ 2432689747 SideColliAccidentStat_CRC "P01";
+BA_ "E2EDataId" SG_ 2499788607 TrafficAccShutDownReq_CRC 10;
+SIG_GROUP_ 2432689747 SideColliAccidentStat_sg 1 : SideColliAccidentStat_RightSide SideColliAccidentStat_LeftSide SideColliAccidentStat_CRC SideColliAccidentStat_SqC;
+SIG_GROUP_ 2499788607 TrafficAccShutDownReq_sg 1 : TrafficAccShutDownReq_CRC TrafficAccShutDownReq_Rqst TrafficAccShutDownReq_SqC;
+"""
+
+
+def reference(layout, payload):
+    return crc8(bytes([layout.data_id & 0xFF, layout.data_id >> 8]) + bytes(payload[b] for b in layout.data))
+
+
+# tests
+
+def test_crc8_is_sae_j1850():
+    assert crc8(b"123456789", 0xFF) ^ 0xFF == 0x4B
+
+
+def test_layouts_come_from_the_dbc():
+    side, shutdown = layouts(parse_dbc(DBC)).values()
+    assert (side.data_id, side.crc_byte, side.data, side.counter_byte) == (426, 0, [1, 2], 1)
+    assert (shutdown.data_id, shutdown.crc_byte, shutdown.data, shutdown.counter_byte) == (10, 6, [7], 7)
+
+
+def test_batched_protect_matches_frame_by_frame_crc():
+    engine = E2EEngine(parse_dbc(DBC))
+    layout = engine.layouts["TrafficAccShutDownReq_sg"]
+    payloads = [bytes([i, 0, 0, 0, 0, 0, 0xAA, 0x30 | (i & 0xF)]) for i in range(40)]
+    protected = engine.protect("TrafficAccShutDownReq_sg", payloads)
+
+    assert engine.counters_of("TrafficAccShutDownReq_sg", protected) == [i % 15 for i in range(40)]
+    assert all(p[6] == reference(layout, p) for p in protected)
+    assert all(p[7] >> 4 == 0x3 and p[0] == i for i, p in enumerate(protected))  # other bits kept
+    assert engine.counters["TrafficAccShutDownReq_sg"] == 40 % 15
+
+
+def test_verify_reports_receiver_status():
+    engine = E2EEngine(parse_dbc(DBC))
+    frames = engine.protect("SideColliAccidentStat_sg", [bytes(8)] * 10)
+    assert engine.verify("SideColliAccidentStat_sg", frames, last_counter=14) == ["OK"] * 10
+
+    frames[2] = bytes([frames[2][0] ^ 0x01]) + frames[2][1:]
+    frames[5] = frames[4]
+    frames[9] = engine.protect("SideColliAccidentStat_sg", [bytes(8)], counter=13)[0]
+    assert engine.verify("SideColliAccidentStat_sg", frames) == [
+        "OK", "OK", "CRC_ERROR", "OK", "OK", "REPEATED", "OK", "OK", "OK", "WRONG_SEQUENCE"]
+
+
+def test_rest_bus_frames_are_stamped():
+    db = parse_dbc(DBC)
+    engine = E2EEngine(db)
+    bus = MemoryBus()
+    RestBusSimulator(db, StampingBus(engine, bus)).advance(50)
+    data, _ = bus.last[2432689747]
+    assert bus.counts[2432689747] == 5
+    assert engine.verify("SideColliAccidentStat_sg", [data], last_counter=3) == ["OK"]
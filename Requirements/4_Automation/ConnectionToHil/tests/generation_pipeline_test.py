@@ -0,0 +1,70 @@
+import generation_pipeline
+from generation_pipeline import AdoptExistingWriter, Pipeline, read_requirements
+
+import os
+import subprocess
+import sys
+
+
+SCENARIO = """# Test Type: AUTOMATED
+# Scenario: Section {n}
+**Steps:**
+1. Set `MaxDefrostRequest` to 1.
+**Expected Outcome:**
+- `MaxDefrostStatus` == {n}
+"""
+
+
+def make_tree(tmp_path):
+    csv_path = tmp_path / "requirements.csv"
+    csv_path.write_text("title,source,chunk_id\nFirst,x.pdf,req_section_1\nSecond,x.pdf,req_section_2\n"
+                        "Third,x.pdf,req_section_12\n", encoding="utf-8")
+    scenarios = tmp_path / "scenarios"
+    scenarios.mkdir()
+    (scenarios / "req_section_1_scenario.md").write_text("old")
+    (scenarios / "req_section_1_scenario_2026-02-11-15-43.md").write_text(SCENARIO.format(n=1))
+    (scenarios / "scenario_req_section_2_2026-02-16-10-29.md").write_text(SCENARIO.format(n=2))
+    db = tmp_path / "db.dbc"
+    db.write_text("BO_ 1 Frame: 8 CCM")
+    return read_requirements(csv_path), scenarios, db
+
+
+# tests
+
+def test_only_stale_artifacts_are_rebuilt(tmp_path, monkeypatch):
+    requirements, scenarios, db = make_tree(tmp_path)
+    out = tmp_path / "out"
+
+    def pipeline():
+        return Pipeline(requirements, out, writer=AdoptExistingWriter([scenarios]), db_files=[db])
+
+    first = pipeline().build(jobs=2)
+    assert sorted(first) == ["req_section_1/scenario", "req_section_1/script",
+                             "req_section_2/scenario", "req_section_2/script"]  # 12 has no scenario
+    assert "MaxDefrostStatus` == 1" in (out / "scenario_req_section_1.md").read_text()  # newest adopted
+    assert 'with_name("scenario_req_section_2.md")' in (out / "test_req_section_2.py").read_text()
+
+    assert pipeline().build() == []
+
+    (scenarios / "scenario_req_section_2_2026-02-16-10-29.md").write_text(SCENARIO.format(n=3))
+    assert sorted(pipeline().build()) == ["req_section_2/scenario", "req_section_2/script"]
+
+    (out / "test_req_section_1.py").unlink()
+    assert pipeline().build() == ["req_section_1/script"]
+
+    db.write_text("BO_ 2 Other: 8 CCM")  # DB change: every scenario is re-derived
+    assert len(pipeline().build()) == 2
+
+    monkeypatch.setattr(generation_pipeline, "TEMPLATE_VERSION", 99)
+    assert sorted(pipeline().build()) == ["req_section_1/script", "req_section_2/script"]
+
+
+def test_generated_script_imports_from_its_own_folder(tmp_path):
+    requirements, scenarios, db = make_tree(tmp_path)
+    out = tmp_path / "Generated"
+    Pipeline(requirements, out, writer=AdoptExistingWriter([scenarios]), db_files=[db]).build(["req_section_1"])
+
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONPATH"}
+    result = subprocess.run([sys.executable, "-c", "import test_req_section_1"], cwd=out, env=env,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,84 @@
+import hil_modules
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+# tests
+
+def test_import_does_not_load_veristand():
+    code = ("import sys, hil_modules; hil_modules.read_project_config(); "
+            "print(any(m.startswith('niveristand') for m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=Path(hil_modules.__file__).parent)
+    assert out.stdout.strip() == "False"
+
+
+def test_read_project_config_offline(tmp_path, monkeypatch):
+    config = tmp_path / "projectConfig.json"
+    config.write_text(json.dumps({"projectpath": "p.nivsproj", "Systemadress": "localhost",
+                                  "variables": {"CAN_OUT": {"A": "path/A"}}}))
+    monkeypatch.setenv("CI_PROJECT_DIR", str(tmp_path))
+    _, _, address, variables = hil_modules.read_project_config(str(config))
+    assert address == "localhost"
+    assert variables == {"CAN_OUT": {"A": "path/A"}}
+
+
+def test_unknown_attribute_is_not_a_backend_import():
+    with pytest.raises(AttributeError):
+        hil_modules.NotAVeriStandName
+
+
+class FakeRig:
+    """Channels of a rig whose statuses follow their request after two reads"""
+
+    def __init__(self, values, follows):
+        self.values = dict(values)
+        self.follows = follows  # status path -> request path
+        self.lag = {}
+        self.reads = self.writes = 0
+
+    def read(self, paths, system_address=None):
+        self.reads += 1
+        self.last_paths = list(paths)
+        for status, request in self.follows.items():
+            if self.values[status] != self.values[request]:
+                self.lag[status] = self.lag.get(status, 2) - 1
+                if not self.lag[status]:
+                    self.values[status] = self.values[request]
+                    del self.lag[status]
+        return [self.values[p] for p in paths]
+
+    def write(self, paths, values, system_address=None):
+        self.writes += 1
+        self.values.update(zip(paths, values))
+
+
+def test_checkpoint_restore_writes_and_verifies_only_changes(tmp_path):
+    variables = {"CAN_OUT": {"MaxDefrostRequest": "out/MaxDefrost", "CabTempRequest": "out/CabTemp"},
+                 "CAN_IN": {"MaxDefrostStatus": "in/MaxDefrost", "CabTempStatus": "in/CabTemp"},
+                 "LIN28": {"OUT": {"SeatHeatReq": "lin/SeatHeat"}, "IN": {}}}
+    rig = FakeRig({"out/MaxDefrost": 0, "out/CabTemp": 22, "lin/SeatHeat": 1,
+                   "in/MaxDefrost": 0, "in/CabTemp": 22},
+                  {"in/MaxDefrost": "out/MaxDefrost", "in/CabTemp": "out/CabTemp"})
+    cp = hil_modules.checkpoint(variables, read=rig.read)
+    assert rig.reads == 1 and set(cp.outputs) == {"out/MaxDefrost", "out/CabTemp", "lin/SeatHeat"}
+    cp.save(tmp_path / "baseline.json")
+
+    rig.write(["out/MaxDefrost"], [1])
+    rig.read(["in/MaxDefrost"]), rig.read(["in/MaxDefrost"])  # the status follows
+    rig.reads = rig.writes = 0
+
+    cp = hil_modules.Checkpoint.load(tmp_path / "baseline.json")
+    assert hil_modules.restore(cp, period=0, read=rig.read, write=rig.write) == {}
+    assert rig.writes == 1 and rig.values["out/MaxDefrost"] == 0
+    assert rig.reads == 3  # state read + polls of the single changed status
+    assert rig.last_paths == ["in/MaxDefrost"]
+
+    rig.reads = rig.writes = 0
+    assert hil_modules.restore(cp, period=0, read=rig.read, write=rig.write) == {}
+    assert (rig.reads, rig.writes) == (1, 0)  # already at the checkpoint
@@ -0,0 +1,216 @@
+from hil_runtime import (ExecutionPolicy, HilSession, MockBackend, ReplayBackend, SignalMap,
+                         SimulatorBackend, TestAborted, make_backend)
+
+import json
+
+import pytest
+
+
+HIL_VAR = {
+    "CAN_OUT": {"MaxDefrostRequest": "Targets/CAN_OUT/MaxDefrostRequest",
+                "HVACBlowerRequest": "Targets/CAN_OUT/HVACBlowerRequest"},
+    "CAN_IN": {"MaxDefrostStatus": "Targets/CAN_IN/MaxDefrostStatus",
+               "HVACBlowerLevelStat_BlowerLevel": "Targets/CAN_IN/HVACBlowerLevelStat_BlowerLevel"},
+    "LIN28": {"OUT": {"SeatHeatReq": "Targets/LIN28/SeatHeatReq"}, "IN": {}},
+}
+
+
+class CountingBackend(MockBackend):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reads = self.writes = 0
+
+    def read_many(self, signals):
+        self.reads += 1
+        return super().read_many(signals)
+
+    def write_many(self, signals, values):
+        self.writes += 1
+        super().write_many(signals, values)
+
+
+def max_defrost_model(state, name):
+    if name == "MaxDefrostStatus":
+        return state.get("MaxDefrostRequest", 0)
+    if name == "HVACBlowerLevelStat_BlowerLevel":
+        return 10 if state.get("MaxDefrostRequest") == 1 else state.get("HVACBlowerRequest")
+    return None
+
+
+# tests
+
+def test_signal_map_understands_both_layouts():
+    generated = SignalMap({"CAN": {"OUT": {"A": "p/A"}, "IN": {"B": "p/B"}}})
+    assert generated.output("A").path == "p/A" and generated.input("B").path == "p/B"
+
+    config = SignalMap(HIL_VAR)
+    assert config.output("SeatHeatReq").path == "Targets/LIN28/SeatHeatReq"
+    assert config.input("MaxDefrostStatus").direction == "IN"
+    assert config.input("MaxDefrostRequest").direction == "OUT"  # reads back the request
+    assert config.output("Nope") is None
+
+
+def test_set_many_and_check_many_are_batched(tmp_path):
+    backend = CountingBackend()
+    hil = HilSession("Batched", hil_var=HIL_VAR, backend=backend,
+                     report_path=str(tmp_path / "batched.html"))
+    hil.step("Step 1")
+    hil.set_many({"MaxDefrostRequest": 1, "HVACBlowerRequest": 10})
+    backend.values["Targets/CAN_IN/MaxDefrostStatus"] = 1
+    backend.values["Targets/CAN_IN/HVACBlowerLevelStat_BlowerLevel"] = 10
+
+    assert hil.check_many({"MaxDefrostStatus": 1, "HVACBlowerLevelStat_BlowerLevel": 10})
+    assert (backend.writes, backend.reads) == (1, 1)
+    assert not hil.check("UnknownStatus", 1)
+    assert backend.reads == 1
+    assert hil.reporter.checks[-1].actual == "N/A (Signal Not Found)"
+    assert not hil.finish()
+
+
+def test_simulator_backend_drives_a_dry_run(tmp_path, monkeypatch):
+    monkeypatch.setenv("HIL_REPORT_FORMATS", "html,jsonl")
+    with HilSession("Dry Run", hil_var=HIL_VAR, backend=SimulatorBackend(max_defrost_model),
+                    report_path=str(tmp_path / "dry.html")) as hil:
+        hil.set_many({"MaxDefrostRequest": 0, "HVACBlowerRequest": 1})
+        assert hil.check_many({"MaxDefrostStatus": 0, "HVACBlowerLevelStat_BlowerLevel": 1})
+        hil.set("MaxDefrostRequest", 1)
+        hil.wait(60)  # skipped by the simulator
+        assert hil.check("HVACBlowerLevelStat_BlowerLevel", 10)
+    assert set(hil.report_paths) == {"html", "jsonl"}
+    assert hil.latency.summary()[0][:3] == ("HVACBlowerRequest", "HVACBlowerLevelStat_BlowerLevel", 1)
+
+
+def test_replay_backend_returns_recorded_values(tmp_path):
+    recording = tmp_path / "run.jsonl"
+    recording.write_text("\n".join(json.dumps(e) for e in [
+        {"type": "set", "signal": "MaxDefrostRequest", "value": 1},
+        {"type": "check", "signal": "MaxDefrostStatus", "actual": 0},
+        {"type": "check", "signal": "MaxDefrostStatus", "actual": 1},
+    ]) + "\n")
+    backend = make_backend("replay", replay_file=str(recording))
+    assert isinstance(backend, ReplayBackend)
+
+    hil = HilSession("Replay", hil_var=HIL_VAR, backend=backend,
+                     report_path=str(tmp_path / "replay.html"))
+    assert not hil.check("MaxDefrostStatus", 1)
+    assert hil.check("MaxDefrostStatus", 1)
+    assert hil.check("MaxDefrostStatus", 1)  # last value repeats
+
+
+def test_rendered_script_compiles():
+    from hil_runtime.script_template import render_script
+
+    source = render_script("example", "Example Test",
+                           'hil.set("MaxDefrostRequest", 1)\nchecks_passed &= hil.check("MaxDefrostStatus", 1)',
+                           responses='"MaxDefrostStatus": state.get("MaxDefrostRequest", 0),')
+    compile(source, "test_example.py", "exec")
+    assert "def test_example(hil_config):" in source
+
+
+def test_unchanged_writes_are_suppressed_and_ticks_coalesce(tmp_path):
+    backend = CountingBackend()
+    hil = HilSession("Outputs", hil_var=HIL_VAR, backend=backend,
+                     report_path=str(tmp_path / "outputs.html"))
+    hil.step("Step 1")
+    hil.set_many({"MaxDefrostRequest": 0, "HVACBlowerRequest": 1})
+    hil.set_many({"MaxDefrostRequest": 0, "HVACBlowerRequest": 1})  # nothing changed
+    assert backend.writes == 1
+
+    with hil.tick():
+        hil.set("HVACBlowerRequest", 5)
+        hil.set("HVACBlowerRequest", 8)
+        hil.set("MaxDefrostRequest", 1)
+        hil.set("MaxDefrostRequest", 0)  # back to the bus value: dropped
+        assert backend.writes == 1
+    assert backend.writes == 2
+    assert backend.values["Targets/CAN_OUT/HVACBlowerRequest"] == 8
+
+    stats = hil.outputs.stats()
+    assert (stats["written"], stats["suppressed"], stats["coalesced"]) == (3, 2, 2)
+    assert len(hil.reporter.sets) == 8  # the report still lists every requested set
+
+
+def test_update_bits_ride_along_with_writes_and_gate_reads(tmp_path):
+    hil_var = {
+        "CAN_OUT": {"VehicleMode": "out/VehicleMode", "VehicleMode_UB": "out/VehicleMode_UB",
+                    "GPSData_VehSpeed": "out/GPSData_VehSpeed", "GPSData_sg_UB": "out/GPSData_sg_UB"},
+        "CAN_IN": {"MaxDefrostStatus": "in/MaxDefrostStatus", "MaxDefrostStatus_UB": "in/MaxDefrostStatus_UB"},
+    }
+    backend = CountingBackend()
+    hil = HilSession("UB", hil_var=hil_var, backend=backend, report_path=str(tmp_path / "ub.html"),
+                     update_bits={"GPSData_VehSpeed": "GPSData_sg_UB"})
+    hil.step("Step 1")
+    hil.set_many({"VehicleMode": 6, "GPSData_VehSpeed": 80})
+    assert backend.writes == 1
+    assert backend.values == {"out/VehicleMode": 6, "out/VehicleMode_UB": 1,
+                              "out/GPSData_VehSpeed": 80, "out/GPSData_sg_UB": 1}
+    hil.set("VehicleMode", 4)
+    assert backend.writes == 2 and hil.outputs.stats()["suppressed"] == 1  # UB already 1
+
+    backend.values["in/MaxDefrostStatus"] = 1
+    backend.values["in/MaxDefrostStatus_UB"] = 0
+    assert hil.get("MaxDefrostStatus", default=None) is None
+    assert backend.reads == 1  # status and its UB in one read
+    backend.values["in/MaxDefrostStatus_UB"] = 1
+    assert hil.check("MaxDefrostStatus", 1)
+    assert (hil.ub_written, hil.ub_filtered) == (3, 1)
+
+    plain = HilSession("No UB", hil_var=hil_var, backend=MockBackend(), update_bits=False)
+    plain.set("VehicleMode", 6)
+    assert plain.backend.values == {"out/VehicleMode": 6}
+
+
+def test_dbc_group_update_bits_are_known_by_default(tmp_path):
+    hil_var = {"CAN_IN": {"ParkClimTimerStat_Dur": "in/ParkClimTimerStat_Dur",
+                          "ParkClimTimerStat_sg_UB": "in/ParkClimTimerStat_sg_UB"}}
+    backend = MockBackend({"in/ParkClimTimerStat_Dur": 30, "in/ParkClimTimerStat_sg_UB": 0})
+    hil = HilSession("Group UB", hil_var=hil_var, backend=backend, report_path=str(tmp_path / "ub.html"))
+    assert hil.signals.update_bits["ParkClimTimerStat_Dur"] == "ParkClimTimerStat_sg_UB"  # from the DBC
+    assert hil.get("ParkClimTimerStat_Dur", default=None) is None
+    backend.values["in/ParkClimTimerStat_sg_UB"] = 1
+    assert hil.get("ParkClimTimerStat_Dur") == 30
+
+
+def test_ensure_state_writes_and_waits_only_for_differences(tmp_path):
+    backend = CountingBackend({"Targets/CAN_IN/MaxDefrostStatus": 0})
+    hil = HilSession("Ensure", hil_var=HIL_VAR, backend=backend, report_path=str(tmp_path / "ensure.html"))
+    hil.step("Reset")
+    reset = {"MaxDefrostRequest": 0, "HVACBlowerRequest": 1, "MaxDefrostStatus": 0}
+    assert hil.ensure_state(reset)
+    assert (backend.writes, backend.reads) == (1, 1)
+
+    assert hil.ensure_state(reset)  # redundant reset: no I/O at all
+    assert (backend.writes, backend.reads) == (1, 1)
+
+    hil.set("HVACBlowerRequest", 4)
+    assert hil.ensure_state(reset)  # one write back, status re-read after the write
+    assert (backend.writes, backend.reads) == (3, 2)
+    assert backend.values["Targets/CAN_OUT/HVACBlowerRequest"] == 1
+    assert hil.reporter.notes[-1].text.endswith("1 written, 1 awaited, 1 already in place")
+
+    backend.values["Targets/CAN_IN/MaxDefrostStatus"] = 1
+    hil.get("MaxDefrostStatus")
+    assert not hil.ensure_state({"MaxDefrostStatus": 0}, timeout=0.1)
+
+
+def test_max_failures_policy_stops_the_script(tmp_path, monkeypatch):
+    monkeypatch.setenv("HIL_MAX_FAILURES", "2")
+    hil = HilSession("Policy", hil_var=HIL_VAR, backend=MockBackend(),
+                     report_path=str(tmp_path / "policy.html"))
+    assert hil.policy.max_failures == 2 and not hil.policy.abort_on_precondition
+    hil.step("Step 1: Verify")
+    assert not hil.check("MaxDefrostStatus", 1)
+    with pytest.raises(TestAborted, match="2 failed checks"):
+        hil.check_many({"MaxDefrostStatus": 1, "HVACBlowerLevelStat_BlowerLevel": 0})
+    assert hil.failed_checks == 2 and hil.report_paths
+
+
+def test_update_bit_not_set_fails_the_check_on_the_simulator(tmp_path):
+    hil_var = {"CAN_IN": {"MaxDefrostStatus": "in/MaxDefrostStatus", "MaxDefrostStatus_UB": "in/MaxDefrostStatus_UB"}}
+    backend = SimulatorBackend(lambda state, name: 0)  # status 0, update bit 0
+    hil = HilSession("UB sim", hil_var=hil_var, backend=backend, report_path=str(tmp_path / "ub_sim.html"))
+    hil.step("Step 1")
+    assert not hil.check("MaxDefrostStatus", 1)
+    assert not hil.wait_for({"MaxDefrostStatus": 0})
+    assert [c.actual for c in hil.reporter.checks] == ["N/A (update bit not set)"] * 2
+    assert not any("assumed" in n.text for n in hil.reporter.notes)
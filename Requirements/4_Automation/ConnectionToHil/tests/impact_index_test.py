@@ -0,0 +1,110 @@
+import json
+import subprocess
+
+from impact_index import ImpactIndex, changes_since, frame_of_path, script_names
+from signal_db import parse_dbc
+
+
+DBC = """BO_ 284262208 CIOM_Cab_02P: 8 CIOM
+ SG_ VehicleMode : 32|4@1+ (1,0) [0|0] ""  CCM
+
+BO_ 2432644760 CCM_Cab_07P: 8 CCM
+ SG_ MaxDefrostStatus : 44|2@1+ (1,0) [0|0] ""  CIOM
+
+BO_ 2432644761 CIOM_Cab_62P: 8 CIOM
+ SG_ HVACBlowerRequest : 8|5@1+ (1,0) [0|31] ""  CCM
+
+BA_ "GenMsgCycleTime" BO_ 284262208 10;
+"""
+
+CONFIG = {"variables": {
+    "CAN_OUT": {"VehicleMode": "CAN/Outgoing/Cyclic/CIOM_Cab_02P (284262208)/VehicleMode",
+                "HVACBlowerRequest": "CAN/Outgoing/Cyclic/CIOM_Cab_62P (2432644761)/HVACBlowerRequest"},
+    "CAN_IN": {"MaxDefrostStatus": "CAN/Incoming/Single-Point/CCM_Cab_07P (2432644760)/MaxDefrostStatus"},
+}}
+
+SCRIPT = """
+def test_section():
+    set_can_signal(hil_var, "{signal}", 1)
+    check_can_signal(hil_var, "MaxDefrostStatus", 1)
+"""
+
+SDF = """<Section Name="CIOM_Cab_02P (284262208)">
+  <Channel Name="VehicleMode" BitFields="13">
+    <Property Name="Default Value" Value="0"/>
+  </Channel>
+</Section>
+"""
+
+
+def git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout
+
+
+def make_repo(tmp_path):
+    (tmp_path / "db.dbc").write_text(DBC)
+    (tmp_path / "projectConfig.json").write_text(json.dumps(CONFIG))
+    (tmp_path / "cRIO.nivssdf").write_text(SDF)
+    (tmp_path / "test_Script_req_section_1.py").write_text(SCRIPT.format(signal="VehicleMode"))
+    (tmp_path / "test_Script_req_section_2.py").write_text(SCRIPT.format(signal="HVACBlowerRequest"))
+    (tmp_path / "scenario_req_section_2.md").write_text("Set `HVACBlowerRequest` to 3.")
+    (tmp_path / "helpers.py").write_text("NAMES = ['VehicleMode']\n")
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", "base")
+    index = ImpactIndex(parse_dbc(DBC), CONFIG["variables"]).scan([tmp_path], [tmp_path])
+    return index, tmp_path / "test_Script_req_section_1.py", tmp_path / "test_Script_req_section_2.py"
+
+
+# tests
+
+def test_index_maps_files_and_sections_to_signals_and_frames(tmp_path):
+    index, first, second = make_repo(tmp_path)
+    assert str(tmp_path / "helpers.py") not in index.files  # no test functions
+    assert index.files[str(first)] == {"kind": "script", "section": "req_section_1",
+                                       "signals": ["MaxDefrostStatus", "VehicleMode"],
+                                       "frames": ["CCM_Cab_07P", "CIOM_Cab_02P"]}
+    sections = index.sections({"req_section_2": {}})
+    assert list(sections) == ["req_section_2"]
+    assert sections["req_section_2"]["signals"] == ["HVACBlowerRequest", "MaxDefrostStatus"]
+    assert len(sections["req_section_2"]["files"]) == 2
+    assert frame_of_path("A/CIOM_Cab_02P (284262208)/VehicleMode") == "CIOM_Cab_02P"
+
+
+def test_script_names_come_from_io_helper_arguments_only():
+    source = """
+response_map = {"HVACBlowerRequest": "HVACBlowerLevelStat_BlowerLevel"}
+MOCK_CONFIG = {"CAN_OUT": {"ClimateAirDistRequest": "out/ClimateAirDistRequest"}}
+
+def test_section(hil):
+    set_can_signal(hil_var, "VehicleMode", 6)
+    hil.check_many({"MaxDefrostStatus": 1})
+    hil.get_many(["ClimateAirDistStatus_Defrost"])
+    hil.wait_for({"HVACBlowerLevelStat_BlowerLevel": 10}, timeout=5.0)
+    os.environ.get("HIL_FAIL_FAST")
+"""
+    assert script_names(source) == {"VehicleMode", "MaxDefrostStatus", "ClimateAirDistStatus_Defrost",
+                                    "HVACBlowerLevelStat_BlowerLevel"}
+
+
+def test_changed_since_selects_only_affected_tests(tmp_path):
+    index, first, second = make_repo(tmp_path)
+    select = lambda: index.select(changes_since("HEAD", tmp_path))[0]
+    assert select() == []
+
+    (tmp_path / "db.dbc").write_text(DBC.replace("284262208 10;", "284262208 20;"))
+    assert select() == [str(first)]  # cycle time of CIOM_Cab_02P changed
+    git(tmp_path, "checkout", "-q", "db.dbc")
+
+    config = json.loads(json.dumps(CONFIG))
+    config["variables"]["CAN_OUT"]["HVACBlowerRequest"] += "_moved"
+    (tmp_path / "projectConfig.json").write_text(json.dumps(config))
+    assert select() == [str(second)]
+    git(tmp_path, "checkout", "-q", "projectConfig.json")
+
+    (tmp_path / "cRIO.nivssdf").write_text(SDF.replace('Value="0"', 'Value="6"'))
+    assert select() == [str(first)]
+    git(tmp_path, "checkout", "-q", "cRIO.nivssdf")
+
+    (tmp_path / "scenario_req_section_2.md").write_text("Set `HVACBlowerRequest` to 4.")
+    assert select() == [str(second)]
@@ -0,0 +1,62 @@
+import json
+
+from hil_runtime import Journal, read_journal, resume_point
+from hil_runtime import scenario as scenario_module
+
+
+CONFIG = {"projectpath": "p.nivsproj", "Systemadress": "localhost",
+          "variables": {"CAN_OUT": {"VehicleMode": "out/VehicleMode", "MaxDefrostRequest": "out/MaxDefrostRequest"},
+                        "CAN_IN": {"MaxDefrostStatus": "in/MaxDefrostStatus"}}}
+
+SCENARIO = """# Test Type: AUTOMATED
+# Scenario: {title}
+**Steps:**
+1. Set `VehicleMode` to {mode}.
+**Expected Outcome:**
+- `VehicleMode` == {mode}
+"""
+
+
+# tests
+
+def test_journal_syncs_in_batches_and_survives_a_torn_line(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    with Journal(path, sync_every=3, sync_interval=60) as journal:
+        journal.record("test_start", test="a")
+        journal.record("step", session="a", step="Step 1")
+        assert journal.syncs == 0
+        journal.record("step", session="a", step="Step 2")
+        assert journal.syncs == 1  # batch full
+        journal.record("checkpoint", test="a", state={"VehicleMode": 6})
+        journal.record("test_done", test="a", passed=True)
+        assert journal.syncs == 3  # always synced
+        journal.record("test_start", test="b")
+    with open(path, "a") as f:
+        f.write('{"type": "test_done", "te')  # crash mid-write
+    assert len(read_journal(path)) == 6
+    assert resume_point(path) == ({"a": True}, {"VehicleMode": 6})
+
+
+def test_resume_skips_completed_scenarios_and_restores_the_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("CI_PROJECT_DIR", str(tmp_path))
+    (tmp_path / "projectConfig.json").write_text(json.dumps(CONFIG))
+    first, second = tmp_path / "scenario_a.md", tmp_path / "scenario_b.md"
+    first.write_text(SCENARIO.format(title="A", mode=6))
+    second.write_text(SCENARIO.format(title="B", mode=4))
+    argv = [str(first), str(second), "--backend", "simulator", "--journal", "journal.jsonl"]
+
+    assert scenario_module.main(argv) == 0
+    events = read_journal("journal.jsonl")
+    assert [e["test"] for e in events if e["type"] == "test_done"] == [str(first), str(second)]
+
+    # Crash during the second scenario: only the first one is in the journal
+    lines = (tmp_path / "journal.jsonl").read_text().splitlines()
+    done = next(i for i, e in enumerate(events) if e["type"] == "test_done")
+    (tmp_path / "journal.jsonl").write_text("\n".join(lines[:done + 2]) + "\n")
+    assert scenario_module.main(argv + ["--resume"]) == 0
+    events = read_journal("journal.jsonl")
+    steps = [e["step"] for e in events[done + 2:] if e["type"] == "step"]
+    assert steps[0] == "Resume"  # checkpoint of scenario A restored before B
+    assert [e["test"] for e in events if e["type"] == "test_done"] == [str(first), str(second)]
+    assert resume_point("journal.jsonl")[1] == {"VehicleMode": 4}
@@ -0,0 +1,70 @@
+import time
+
+from hil_runtime import (HilSession, MockBackend, SimulatorBackend, always, eventually_within, never,
+                         stable_for)
+from hil_runtime.monitors import MonitorSet
+
+
+def feed(monitor, samples):
+    for t, value in samples:
+        if monitor.update(t, value) is not None:
+            break
+    return monitor
+
+
+# tests
+
+def test_monitors_decide_as_soon_as_the_samples_do():
+    assert feed(always("S", 1, 2.0), [(0, 1), (1, 1), (2, 1), (3, 0)]).verdict is True
+    violated = feed(always("S", 1, 2.0), [(10, 1), (10.5, 0), (11, 1)])
+    assert violated.verdict is False and violated.decided_at == 0.5
+    assert feed(never("S", 1, 1.0), [(0, 0), (0.5, None), (1, 0)]).verdict is True  # None is skipped
+    assert feed(eventually_within("S", 10, 1.0), [(0, 1), (0.4, 10)]).decided_at == 0.4
+    assert feed(eventually_within("S", 10, 1.0), [(0, 1), (1.2, 10)]).verdict is False
+    stable = feed(stable_for("S", lambda v: v > 5, 1.0, within=2.0), [(0, 9), (0.5, 1), (1, 9), (2, 9)])
+    assert stable.verdict is True and stable.reason == "stable from 1.00s to 2.00s"
+    assert feed(stable_for("S", 1, 1.0, within=0.5), [(0, 0), (1, 1), (1.5, 1)]).verdict is False
+
+    pending = MonitorSet([always("S", 1, 5.0), eventually_within("T", 1, 5.0)], clock=lambda: 1.0)
+    pending.on_values(["S", "T"], [1, 0])
+    assert len(pending.pending) == 2
+    assert pending.finish() is False  # open monitors fail at the end of the stream
+
+
+def test_session_monitor_ends_early_on_the_virtual_clock(tmp_path):
+    hil_var = {"CAN_OUT": {"MaxDefrostRequest": "out/MaxDefrostRequest"},
+               "CAN_IN": {"MaxDefrostStatus": "in/MaxDefrostStatus"}}
+    backend = SimulatorBackend(lambda state, name: int(state.get("MaxDefrostRequest", 0) == 1 and
+                                                       backend.now() >= 0.3))
+    hil = HilSession("Monitors", hil_var=hil_var, backend=backend, report_path=str(tmp_path / "m.html"))
+    hil.step("Step 1")
+    hil.set("MaxDefrostRequest", 1)
+    assert hil.monitor([eventually_within("MaxDefrostStatus", 1, 2.0)])
+    assert 0.3 <= backend.now() < 0.4  # ended when decided, not after 2 s
+
+    assert not hil.monitor([always("MaxDefrostStatus", 1, 60.0), never("NoSuchStatus", 1, 1.0)])
+    assert backend.now() < 61
+    assert [c.passed for c in hil.reporter.checks] == [True, False, True]
+
+
+class SlowBackend(MockBackend):
+    """Mock rig whose reads take ``latency`` seconds, like the gateway"""
+
+    def __init__(self, latency, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+
+    def read_many(self, signals):
+        time.sleep(self.latency)
+        return super().read_many(signals)
+
+
+def test_session_monitor_covers_the_horizon_despite_read_latency(tmp_path):
+    hil_var = {"CAN_IN": {"MaxDefrostStatus": "in/MaxDefrostStatus"}}
+    hil = HilSession("Latency", hil_var=hil_var, backend=SlowBackend(0.02, initial={"in/MaxDefrostStatus": 1}),
+                     report_path=str(tmp_path / "latency.html"))
+    hil.step("Step 1")
+    for _ in range(3):
+        monitor = always("MaxDefrostStatus", 1, 0.2)
+        assert hil.monitor([monitor], period=0.075), monitor.reason
+        assert monitor.reason.startswith("held for")
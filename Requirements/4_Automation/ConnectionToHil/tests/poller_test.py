@@ -0,0 +1,72 @@
+from hil_runtime import HilSession, MockBackend, SignalPoller
+
+import asyncio
+import threading
+import time
+
+
+HIL_VAR = {"CAN": {"OUT": {"MaxDefrostRequest": "out/MaxDefrostRequest"},
+                   "IN": {"MaxDefrostStatus": "in/MaxDefrostStatus",
+                          "ClimateAirDistStatus_Defrost": "in/ClimateAirDistStatus_Defrost",
+                          "HVACBlowerLevelStat_BlowerLevel": "in/HVACBlowerLevelStat_BlowerLevel"}}}
+
+
+class RampingBackend(MockBackend):
+    """Status channels step towards their target once per read"""
+
+    def __init__(self, targets):
+        super().__init__({path: 0 for path in targets})
+        self.targets = targets
+        self.reads = []
+
+    def read_many(self, signals):
+        self.reads.append([s.path for s in signals])
+        for s in signals:
+            if self.values[s.path] < self.targets[s.path]:
+                self.values[s.path] += 1
+        return super().read_many(signals)
+
+
+# tests
+
+def test_concurrent_waits_share_one_read_per_cycle():
+    reads = []
+    state = {"a": 0, "b": 0, "c": 0}
+
+    def read_values(keys):
+        reads.append(list(keys))
+        for k in state:
+            state[k] += 1
+        return [state[k] for k in keys]
+
+    poller = SignalPoller(read_values, period=0.001)
+    results = asyncio.run(poller.wait_all({"a": lambda v: v >= 2, "b": lambda v: v >= 5,
+                                           "c": lambda v: v >= 3}, timeout=2))
+
+    assert results == {"a": (True, 2), "b": (True, 5), "c": (True, 3)}
+    assert len(reads) == 5                 # one round trip per cycle, not per wait
+    assert reads[0] == ["a", "b", "c"] and reads[-1] == ["b"]  # finished keys drop out
+
+
+def test_wait_times_out_with_last_value_and_abort_ends_waits():
+    poller = SignalPoller(lambda keys: [0] * len(keys), period=0.001)
+    assert asyncio.run(poller.wait_for("x", lambda v: v == 1, timeout=0.02)) == (False, 0)
+
+    abort = threading.Event()
+    abort.set()
+    poller = SignalPoller(lambda keys: [0] * len(keys), period=0.001, abort_event=abort)
+    started = time.perf_counter()
+    assert asyncio.run(poller.wait_for("x", lambda v: v == 1, timeout=5)) == (False, None)
+    assert time.perf_counter() - started < 1
+
+
+def test_session_wait_for(tmp_path):
+    backend = RampingBackend({"in/MaxDefrostStatus": 1, "in/ClimateAirDistStatus_Defrost": 1,
+                              "in/HVACBlowerLevelStat_BlowerLevel": 10})
+    hil = HilSession("Poll", hil_var=HIL_VAR, backend=backend, report_path=str(tmp_path / "poll.html"))
+    hil.step("Step 1")
+    assert hil.wait_for({"MaxDefrostStatus": 1, "ClimateAirDistStatus_Defrost": 1,
+                         "HVACBlowerLevelStat_BlowerLevel": 10}, timeout=2, period=0.001)
+    assert len(backend.reads) == 10
+    assert not hil.wait_for({"MaxDefrostStatus": 2}, timeout=0.02, period=0.001)
+    assert hil.reporter.checks[-1].actual == 1
@@ -0,0 +1,72 @@
+from hil_runtime import VirtualClock
+from ramp_orchestrator import Linear, RampOrchestrator, SCurve, Stepped, not_above
+
+import threading
+
+import pytest
+
+
+def virtual(clock):
+    """clock/wait pair of a RampOrchestrator running on ``clock``"""
+    def wait(seconds):
+        clock.sleep(seconds)
+        return False
+    return {"clock": lambda: clock.now, "wait": wait}
+
+
+# tests
+
+def test_profiles():
+    assert [Linear(0, 10, 1.0).value_at(t) for t in (0, 0.5, 1.0, 2.0)] == [0, 5, 10, 10]
+    assert [Stepped([8, 6, 4], 0.5).value_at(t) for t in (0, 0.49, 0.5, 1.0, 9)] == [8, 8, 6, 4, 4]
+    curve = SCurve(0, 10, 1.0, integer=False)
+    assert curve.value_at(0.1) < Linear(0, 10, 1.0, integer=False).value_at(0.1)
+    assert curve.value_at(0.5) == 5.0
+
+
+def test_signals_ramp_concurrently_with_one_write_per_tick():
+    writes = []
+    clock = VirtualClock()
+    ramp = RampOrchestrator(writes.append, tick=0.01,
+                            interlocks=[not_above("CabHeatManReq", "HVACBlowerRequest")], **virtual(clock))
+    ramp.add("HVACBlowerRequest", Stepped([8, 6, 4, 2, 0], 0.02))
+    ramp.add("CabHeatManReq", Stepped([10, 5, 0], 0.02))
+
+    assert ramp.run()
+
+    # Both finish within the longest profile, not the sum of both
+    assert clock.now == pytest.approx(0.08) and ramp.ticks == 9
+    assert writes[0] == {"HVACBlowerRequest": 8, "CabHeatManReq": 8}
+    assert all(len(w) >= 1 for w in writes)
+    final = {}
+    for w in writes:
+        final.update(w)
+        assert final["CabHeatManReq"] <= final["HVACBlowerRequest"]
+    assert final == {"HVACBlowerRequest": 0, "CabHeatManReq": 0}
+
+
+def test_ramp_aborts_when_event_is_set():
+    abort = threading.Event()
+    clock = VirtualClock()
+
+    def wait(seconds):
+        clock.sleep(seconds / 2)
+        abort.set()  # the watchdog trips halfway through the first tick
+        return True
+
+    writes = []
+    ramp = RampOrchestrator(writes.append, tick=0.05, abort_event=abort, clock=lambda: clock.now, wait=wait)
+    ramp.add("HVACBlowerRequest", Linear(0, 10, 5.0))
+
+    assert ramp.run() is False
+    assert ramp.aborted and len(writes) == 1 and ramp.ticks == 1  # no tick after the trip
+    assert clock.now == pytest.approx(0.025)
+
+
+def test_ramp_waits_on_the_abort_event_by_default():
+    abort = threading.Event()
+    abort.set()
+    writes = []
+    ramp = RampOrchestrator(writes.append, tick=60.0, abort_event=abort)
+    ramp.add("HVACBlowerRequest", Linear(0, 10, 600.0))
+    assert ramp.run() is False and writes == []
@@ -0,0 +1,68 @@
+from test_reporter import TestReporter
+import report_index
+
+import shutil
+
+
+def _write_run(directory, name, outcomes, formats=("jsonl",)):
+    reporter = TestReporter(name, formats=formats)
+    reporter.add_step("Step 1: Activate")
+    for signal, passed in outcomes:
+        reporter.add_check(signal, 1, 1 if passed else 0, passed, 0.1)
+    return reporter.generate_reports(str(directory / f"report_{name}.html"))["jsonl"]
+
+
+# tests
+
+def test_index_is_incremental_and_skips_duplicates(tmp_path):
+    reports = tmp_path / "reports"
+    (reports / "Newadded").mkdir(parents=True)
+    first = _write_run(reports, "req_section_4_2026-02-16-10-37", [("MaxDefrostStatus", True)])
+    shutil.copy(first, reports / "Newadded")
+    db = str(tmp_path / "index.sqlite")
+
+    conn = report_index.open_index(db)
+    assert report_index.index_reports(conn, [reports]) == {"req_section_4"}
+    assert conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 1
+
+    assert report_index.index_reports(conn, [reports]) == set()
+
+    _write_run(reports, "req_section_4_2026-02-17-09-00", [("MaxDefrostStatus", False)])
+    assert report_index.index_reports(conn, [reports]) == {"req_section_4"}
+    assert conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 2
+    conn.close()
+
+
+def test_run_written_as_html_and_jsonl_is_indexed_once(tmp_path):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    jsonl = _write_run(reports, "req_section_5_2026-02-16-11-34", [("MaxDefrostStatus", True)], ("html", "jsonl"))
+    parked = shutil.move(jsonl, tmp_path)
+    conn = report_index.open_index(str(tmp_path / "index.sqlite"))
+    report_index.index_reports(conn, [reports])  # HTML only so far
+    shutil.move(parked, reports)
+    report_index.index_reports(conn, [reports])
+
+    (source, latency), = conn.execute("SELECT source, latency FROM runs JOIN checks ON checks.run_id = runs.id")
+    assert source.endswith(".jsonl") and latency is not None
+    conn.close()
+
+
+def test_trend_page_lists_flaky_checks(tmp_path):
+    reports = tmp_path / "reports"
+    reports.mkdir()
+    for i, passed in enumerate([True, False, True]):
+        _write_run(reports, f"req_section_20_2026-02-1{i}-10-00",
+                   [("MaxDefrostStatus", passed), ("CabHeatManStatus", True)])
+
+    touched = report_index.build([reports], str(tmp_path / "index.sqlite"), str(tmp_path / "trends"))
+    conn = report_index.open_index(str(tmp_path / "index.sqlite"))
+    runs, latency_rows, flaky_rows = report_index.section_trends(conn, "req_section_20")
+    conn.close()
+
+    assert touched == {"req_section_20"}
+    assert len(runs) == 3
+    assert {row[0] for row in latency_rows} == {"MaxDefrostStatus", "CabHeatManStatus"}
+    assert [(row[1], row[3], row[4]) for row in flaky_rows] == [("MaxDefrostStatus", 1, 2)]
+    page = (tmp_path / "trends" / "req_section_20.html").read_text(encoding="utf-8")
+    assert "Flaky checks" in page and "MaxDefrostStatus" in page
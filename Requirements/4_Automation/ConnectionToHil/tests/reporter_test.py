@@ -0,0 +1,120 @@
+from test_reporter import TestReporter
+
+from xml.etree import ElementTree
+
+import datetime
+import json
+import sys
+import threading
+
+
+# tests
+
+def test_records_are_grouped_by_step_ranges():
+    reporter = TestReporter("ranges")
+    reporter.add_check("Orphan", 1, 1, True)
+    first = reporter.add_step("Step 1")
+    reporter.add_set("MaxDefrostRequest", 1)
+    reporter.add_check("MaxDefrostStatus", 1, 1, True)
+    reporter.add_note("first note")
+    second = reporter.add_step("Step 2")
+    reporter.add_check("MaxDefrostStatus", 1, 0, False)
+
+    assert [s.signal for s in reporter.step_sets(first)] == ["MaxDefrostRequest"]
+    assert [c.actual for c in reporter.step_checks(first)] == [1]
+    assert [n.text for n in reporter.step_notes(first)] == ["first note"]
+    assert reporter.step_sets(second) == []
+    assert [c.passed for c in reporter.step_checks(second)] == [False]
+    assert len(reporter.checks) == 3
+    assert reporter.failed
+
+
+def test_signal_names_are_interned():
+    reporter = TestReporter("intern")
+    reporter.add_step("Step 1")
+    reporter.add_check("".join(["Max", "DefrostStatus"]), 1, 1, True)
+    reporter.add_check("".join(["MaxDefrost", "Status"]), 1, 1, True)
+
+    assert reporter.checks[0].signal is reporter.checks[1].signal
+
+
+def test_timestamps_render_as_wall_time(tmp_path):
+    reporter = TestReporter("render", "description")
+    step = reporter.add_step("Step 1", "verify")
+    reporter.add_set("HVACBlowerRequest", 8)
+    reporter.add_check("HVACBlowerLevelStat_BlowerLevel", 8, 7.95, True, 0.1)
+
+    assert isinstance(reporter.wall_time(step.t_ns), datetime.datetime)
+    assert reporter.wall_time(step.t_ns) >= reporter.start_time
+
+    html = (tmp_path / "report.html")
+    reporter.generate_html(str(html))
+    text = html.read_text(encoding="utf-8")
+    assert "HVACBlowerRequest</span> = 8" in text
+    assert "Expected: 8 (±0.1)" in text
+    assert "PASSED" in text
+
+
+def test_notes_from_another_thread_stay_inside_step_ranges():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible
+    try:
+        reporter = TestReporter("threads")
+        reporter.add_step("Step 0")
+        writer = threading.Thread(target=lambda: [reporter.add_note(f"watchdog {i}") for i in range(2000)])
+        writer.start()
+        for i in range(1, 200):
+            reporter.add_step(f"Step {i}")
+            reporter.add_set("MaxDefrostRequest", i)
+        writer.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    notes = [n for step in reporter.steps for n in reporter.step_notes(step)]
+    assert len(notes) == len(reporter.notes) == 2000
+    assert sum(len(reporter.step_sets(step)) for step in reporter.steps) == 199
+
+
+def _sample_reporter(formats=None):
+    reporter = TestReporter("Max <Defrost>", "machine readable", formats=formats)
+    reporter.add_step("Step 1", "activate")
+    reporter.add_set("MaxDefrostRequest", 1)
+    reporter.add_check("MaxDefrostStatus", 1, 1, True, 0.1)
+    reporter.add_check("ClimateAirDistStatus_Defrost", 1, 0, False, 0.1)
+    reporter.add_note("done & dusted")
+    return reporter
+
+
+def test_jsonl_has_one_event_per_record(tmp_path):
+    path = tmp_path / "report.jsonl"
+    _sample_reporter().generate_jsonl(str(path))
+    events = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+    assert [e["type"] for e in events] == ["run", "step", "set", "check", "check", "note", "summary"]
+    assert events[3]["tolerance"] == 0.1 and events[3]["passed"] is True
+    assert events[4]["actual"] == 0 and events[4]["step"] == 0
+    assert events[-1]["failed"] == 1 and events[-1]["status"] == "FAILED"
+
+
+def test_junit_lists_checks_as_testcases(tmp_path):
+    path = tmp_path / "report.xml"
+    _sample_reporter().generate_junit(str(path))
+    root = ElementTree.parse(path).getroot()
+    suite = root.find("testsuite")
+
+    assert suite.get("name") == "Max <Defrost>"
+    assert suite.get("tests") == "2" and suite.get("failures") == "1"
+    cases = suite.findall("testcase")
+    assert [c.get("name") for c in cases] == ["MaxDefrostStatus", "ClimateAirDistStatus_Defrost"]
+    assert cases[1].find("failure") is not None
+    assert "done & dusted" in suite.find("system-out").text
+
+
+def test_generate_reports_can_skip_html(tmp_path, monkeypatch):
+    monkeypatch.setenv("HIL_REPORT_FORMATS", "junit,jsonl")
+    paths = _sample_reporter().generate_reports(str(tmp_path / "report_req_section_1.html"))
+
+    assert set(paths) == {"junit", "jsonl"}
+    assert not (tmp_path / "report_req_section_1.html").exists()
+    assert (tmp_path / "report_req_section_1.xml").exists()
+    assert (tmp_path / "report_req_section_1.jsonl").exists()
@@ -0,0 +1,70 @@
+import time
+
+from restbus import MemoryBus, RestBusSimulator, TimerWheel, received_frames
+from signal_db import decode_frame, parse_dbc
+
+
+DBC = """BA_DEF_ BO_  "GenMsgSendType" ENUM  "Cyclic","NotUsed","NotUsed","NotUsed","NotUsed","NotUsed","NotUsed","IfActive","NoMsgSendType","NotUsed";
+
+BO_ 1 CIOM_Cab_02P: 8 CIOM
+ SG_ VehicleMode : 32|4@1+ (1,0) [0|0] ""  CCM
+
+BO_ 2 CIOM_Cab_62P: 8 CIOM
+ SG_ HVACBlowerRequest : 8|5@1+ (1,0) [0|31] ""  CCM
+
+BO_ 3 CIOM_Cab_99P: 8 CIOM
+ SG_ ClimatePowerRequest : 0|2@1+ (1,0) [0|0] ""  CCM
+
+BO_ 4 CCM_Cab_07P: 8 CCM
+ SG_ MaxDefrostStatus : 44|2@1+ (1,0) [0|0] ""  CIOM
+
+BO_ 5 WRCS_Cab_01P: 8 WRCS
+ SG_ Unrelated : 0|8@1+ (1,0) [0|0] ""  LECM1
+
+BA_ "GenMsgCycleTime" BO_ 1 10;
+BA_ "GenMsgCycleTime" BO_ 2 100;
+BA_ "GenMsgSendType" BO_ 3 8;
+BA_ "GenSigStartValue" SG_ 1 VehicleMode 15;
+"""
+
+
+# tests
+
+def test_timer_wheel_keeps_later_rounds():
+    wheel = TimerWheel(slots=4)
+    wheel.schedule(1, "a")
+    wheel.schedule(5, "b")  # same slot, next round
+    assert wheel.advance() == ["a"]
+    assert [wheel.advance() for _ in range(3)] == [[], [], []]
+    assert wheel.advance() == ["b"]
+
+
+def test_frames_follow_cycle_times_and_start_values():
+    db = parse_dbc(DBC)
+    assert [f.name for f in received_frames(db)] == ["CIOM_Cab_02P", "CIOM_Cab_62P", "CIOM_Cab_99P"]
+    assert db.frames["CIOM_Cab_99P"].send_type == "NoMsgSendType"
+
+    sim = RestBusSimulator(db)
+    sim.advance(1000)
+    assert sim.bus.counts == {1: 100, 2: 10, 3: 1}
+    data, _ = sim.bus.last[1]
+    assert decode_frame(db, db.frames["CIOM_Cab_02P"], data)["VehicleMode"] == 15
+
+    sim.set("ClimatePowerRequest", 2)
+    sim.set("VehicleMode", 6)
+    sim.advance(10)
+    assert sim.bus.counts[3] == 2  # event frame sent on change
+    assert decode_frame(db, db.frames["CIOM_Cab_02P"], sim.bus.last[1][0])["VehicleMode"] == 6
+    assert 0 < sim.bus.load() < 0.1
+
+
+def test_real_time_run_reports_jitter():
+    bus = MemoryBus()
+    received = []
+    bus.listeners.append(lambda frame_id, data, t: received.append(frame_id))
+    with RestBusSimulator(parse_dbc(DBC), bus) as sim:
+        time.sleep(0.25)
+    stats = sim.stats()
+    assert 15 <= received.count(1) <= 30
+    assert stats["sent"] == len(received) and stats["cyclic_frames"] == 2
+    assert stats["jitter_p50_ms"] is not None and stats["frames_per_s"] > 50
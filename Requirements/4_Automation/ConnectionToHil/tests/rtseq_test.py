@@ -0,0 +1,87 @@
+import ast
+
+from hil_runtime import (Check, ExecutionPolicy, HilSession, MockBackend, SequenceCache, Set,
+                         TestAborted, Wait, WaitUntil, compile_steps, run_on_target)
+from hil_runtime.rtseq import CompiledSequence
+
+import pytest
+
+
+PATHS = {"MaxDefrostRequest": "Targets/CAN_OUT/MaxDefrostRequest",
+         "MaxDefrostStatus": "Targets/CAN_IN/MaxDefrostStatus",
+         "HVACBlowerLevelStat_BlowerLevel": "Targets/CAN_IN/HVACBlowerLevelStat_BlowerLevel"}
+
+STEPS = [Set("MaxDefrostRequest", 1), Wait(0.5),
+         WaitUntil("MaxDefrostStatus", 1, timeout=5),
+         Check("HVACBlowerLevelStat_BlowerLevel", 10, tolerance=0.5)]
+
+
+# tests
+
+def test_compile_steps_emits_rt_sequence():
+    source, results = compile_steps(STEPS, PATHS)
+    compile(source, "scenario.py", "exec")
+    assert "@nivs_rt_sequence" in source
+    assert "def scenario():" in source
+    assert "ch_0 = ChannelReference('Targets/CAN_OUT/MaxDefrostRequest')" in source
+    assert "wait(DoubleValue(0.5))" in source
+    assert "seqtime() - started.value < 5.0" in source
+    assert "ch_2.value < 9.5 or ch_2.value > 10.5" in source
+    assert "failed.value = failed.value + 2" in source
+    assert results == STEPS[2:]
+
+    with pytest.raises(KeyError):
+        compile_steps([Set("Unknown", 1)], PATHS)
+
+
+def test_compile_steps_escapes_channel_paths():
+    path = 'Targets/CAN_OUT/Max"Defrost\\Request'
+    source, _ = compile_steps([Set("MaxDefrostRequest", 1)], {"MaxDefrostRequest": path})
+    calls = [node for node in ast.walk(ast.parse(source))
+             if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "ChannelReference"]
+    assert [ast.literal_eval(call.args[0]) for call in calls] == [path]
+
+
+def test_sequence_cache_is_keyed_by_scenario_hash(tmp_path):
+    cache = SequenceCache(tmp_path)
+    first = cache.get(STEPS, PATHS)
+    assert cache.get(list(STEPS), dict(PATHS)) is first
+    assert first.path.exists() and cache.misses == 1
+
+    # A fresh process finds the compiled source on disk
+    again = SequenceCache(tmp_path).get(STEPS, PATHS)
+    assert again.path == first.path
+
+    changed = cache.get(STEPS[:-1] + [Check("HVACBlowerLevelStat_BlowerLevel", 8)], PATHS)
+    assert changed.key != first.key and cache.misses == 2
+
+    # Result bits decode to per-check outcomes
+    assert first.decode(0b10) == [(STEPS[2], True), (STEPS[3], False)]
+
+
+class TargetResult(CompiledSequence):
+    """Compiled sequence with a fixed result instead of a target run"""
+
+    def __init__(self, compiled, failed):
+        super().__init__(compiled.key, compiled.path, compiled.results)
+        self.failed = failed
+
+    def run(self):
+        return self.decode(self.failed)
+
+
+def test_on_target_checks_go_through_the_execution_policy(tmp_path):
+    hil_var = {"CAN_OUT": {"MaxDefrostRequest": PATHS["MaxDefrostRequest"]},
+               "CAN_IN": {n: p for n, p in PATHS.items() if n != "MaxDefrostRequest"}}
+    cache = SequenceCache(tmp_path / "cache")
+    cache._compiled[cache.get(STEPS, PATHS).key] = TargetResult(cache.get(STEPS, PATHS), 0b11)
+    backend = MockBackend({PATHS["HVACBlowerLevelStat_BlowerLevel"]: 3})
+    hil = HilSession("Target", hil_var=hil_var, backend=backend, policy=ExecutionPolicy(max_failures=2),
+                     report_path=str(tmp_path / "target.html"))
+    hil.step("Step 1")
+    with pytest.raises(TestAborted, match="2 failed checks"):
+        run_on_target(hil, STEPS, cache)
+    assert hil.failed_checks == 2
+    # The target returns verdicts only; the values are read back after the run
+    assert [(c.signal, c.actual) for c in hil.reporter.checks] == [
+        ("MaxDefrostStatus", "0.0 (after run)"), ("HVACBlowerLevelStat_BlowerLevel", "3 (after run)")]
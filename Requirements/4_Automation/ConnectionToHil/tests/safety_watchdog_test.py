@@ -0,0 +1,53 @@
+from safety_watchdog import SafetyWatchdog
+
+import threading
+
+
+def _over_limit(values):
+    return [f"CabHeatManStatus too high: {values['CabHeatManStatus']}"] if values["CabHeatManStatus"] > 10 else []
+
+
+def rig_reads(values):
+    """read_values returning values[n] on the n-th read (the last one from then on)"""
+    reads = []
+
+    def read(names):
+        reads.append(1)
+        return [values[min(len(reads), len(values)) - 1]]
+    return read, reads
+
+
+# tests
+
+def test_watchdog_trips_once_on_the_first_unsafe_sample():
+    read, reads = rig_reads([5, 5, 5, 5, 12])
+    trips = []
+    watchdog = SafetyWatchdog(read, ["CabHeatManStatus"], _over_limit, trips.append, rate_hz=200)
+    with watchdog:
+        assert watchdog.tripped.wait(5.0)
+
+    assert trips == ["CabHeatManStatus too high: 12"]
+    assert len(reads) == 5  # the sampling loop ended with the unsafe sample
+    stats = watchdog.stats()
+    assert stats["tripped"] and stats["samples"] == 5
+    assert stats["trip_latency_ms"] is not None
+    assert stats["jitter_max_ms"] is not None
+
+
+def test_read_errors_do_not_stop_sampling():
+    calls = []
+    enough = threading.Event()
+
+    def flaky_read(names):
+        calls.append(1)
+        if len(calls) == 6:
+            enough.set()
+        if len(calls) % 2:
+            raise IOError("gateway timeout")
+        return [0]
+
+    with SafetyWatchdog(flaky_read, ["CabHeatManStatus"], _over_limit, lambda r: None, rate_hz=200) as watchdog:
+        assert enough.wait(5.0)
+
+    assert watchdog.read_errors >= 3 and watchdog.samples >= 3  # sampling went on after every error
+    assert not watchdog.tripped.is_set()
@@ -0,0 +1,140 @@
+from hil_runtime import (ExecutionPolicy, HilSession, MockBackend, SimulatorBackend, Set, Wait,
+                         load_scenario, order_suite, parse_scenario)
+from hil_runtime import scenario as scenario_module
+
+SCENARIO = """# Test Type: AUTOMATED
+# Scenario: Max Defrost Availability
+**Description:** Max Defrost activates in PreRunning and Running.
+**Pre-conditions:**
+- Vehicle is in a state where Max Defrost is currently inactive.
+- `MaxDefrostRequest` == `FALSE`
+- `MaxDefrostStatus` == `Inactive`
+**Trigger:**
+- Set `MaxDefrostRequest` to `TRUE`.
+**Steps:**
+1. Set `VehicleMode` to `PreRunning`.
+2. Set `MaxDefrostRequest` to `TRUE`.
+3. Wait for 2 seconds.
+4. Set `MaxDefrostRequest` to 'Released' (0).
+5. Set `VehicleMode` to 6 (Running).
+6. Set `MaxDefrostRequest` to `TRUE`.
+**Expected Outcome:**
+- When `VehicleMode` == `PreRunning` and `MaxDefrostRequest` == `TRUE`, then `MaxDefrostStatus` == `Active`.
+- When `VehicleMode` is 'Running' AND `MaxDefrostRequest` is 'Pressed' (1):
+    - `MaxDefrostStatus` == 'Active' (1)
+    - `HVACBlowerLevelStat_BlowerLevel` == 10
+- `ClimateAirDistStatus_Defrost` == 1
+- `HVACBlowerLevelStat_BlowerLevel` == [highest possible value]
+"""
+
+HIL_VAR = {"CAN": {"OUT": {"MaxDefrostRequest": "out/MaxDefrostRequest", "VehicleMode": "out/VehicleMode"},
+                   "IN": {"MaxDefrostStatus": "in/MaxDefrostStatus",
+                          "HVACBlowerLevelStat_BlowerLevel": "in/HVACBlowerLevelStat_BlowerLevel",
+                          "ClimateAirDistStatus_Defrost": "in/ClimateAirDistStatus_Defrost"}}}
+
+
+def ecu(state, name):
+    active = state.get("MaxDefrostRequest") == 1 and state.get("VehicleMode", 0) >= 4
+    return {"MaxDefrostStatus": int(active), "HVACBlowerLevelStat_BlowerLevel": 10 if active else 1,
+            "ClimateAirDistStatus_Defrost": int(active)}.get(name)
+
+
+# tests
+
+def test_parse_builds_step_graph():
+    s = parse_scenario(SCENARIO)
+    assert s.title == "Max Defrost Availability" and s.automated
+    assert s.preconditions == [("MaxDefrostRequest", 0), ("MaxDefrostStatus", 0)]
+    assert [a for a, _ in s.nodes] == [Set("VehicleMode", 4), Set("MaxDefrostRequest", 1), Wait(2.0),
+                                       Set("MaxDefrostRequest", 0), Set("VehicleMode", 6),
+                                       Set("MaxDefrostRequest", 1)]  # trigger not repeated
+    assert s.nodes[1][1] == [("MaxDefrostStatus", 1)]
+    assert s.nodes[5][1] == [("MaxDefrostStatus", 1), ("HVACBlowerLevelStat_BlowerLevel", 10),
+                             ("ClimateAirDistStatus_Defrost", 1)]
+    assert len(s.manual) == 2  # free-text pre-condition and the unparseable expectation
+
+
+def test_load_scenario_caches_by_content_hash(tmp_path, monkeypatch):
+    path = tmp_path / "scenario.md"
+    path.write_text(SCENARIO)
+    cache = tmp_path / "cache"
+    first = load_scenario(path, cache)
+    assert load_scenario(path, cache) is first
+    assert len(list(cache.glob("*.json"))) == 1
+
+    # A new process reads the cached graph instead of parsing
+    scenario_module._memory_cache.clear()
+    monkeypatch.setattr(scenario_module, "parse_scenario", None)
+    again = load_scenario(path, cache)
+    assert again.nodes == first.nodes and again.preconditions == first.preconditions
+
+
+def test_run_scenario_on_simulator(tmp_path):
+    hil = HilSession("Scenario", hil_var=HIL_VAR, backend=SimulatorBackend(ecu),
+                     report_path=str(tmp_path / "scenario.html"))
+    assert scenario_module.run_scenario(hil, parse_scenario(SCENARIO))
+    assert [c.signal for c in hil.reporter.checks][:2] == ["MaxDefrostStatus", "MaxDefrostStatus"]
+    assert hil.outputs.stats()["written"] == 6
+
+
+def preconditions(**state):
+    lines = "\n".join(f"- `{name}` == {value}" for name, value in state.items())
+    return parse_scenario(f"**Pre-conditions:**\n{lines}\n**Steps:**\n1. Set `MaxDefrostRequest` to 0.\n"
+                          f"**Expected Outcome:**\n- `MaxDefrostStatus` == 0\n")
+
+
+def test_suite_order_minimises_state_changes_and_skips_re_setup(tmp_path):
+    suite = [("running_a", preconditions(VehicleMode=6, MaxDefrostRequest=0)),
+             ("off", preconditions(VehicleMode=0, MaxDefrostRequest=0)),
+             ("running_b", preconditions(VehicleMode=6, MaxDefrostRequest=0))]
+    ordered, cost = order_suite(suite)
+    assert [key for key, _ in ordered] == ["off", "running_a", "running_b"]
+    assert cost == 1 + 10  # MaxDefrostRequest once, one wake-up
+
+    backend = MockBackend()
+    previous = None
+    for key, scenario in ordered:
+        hil = HilSession(key, hil_var=HIL_VAR, backend=backend, report_path=str(tmp_path / f"{key}.html"))
+        if previous is not None:
+            hil.carry_over(previous)
+        hil.step("Run")
+        assert scenario_module.run_scenario(hil, scenario)
+        previous = hil
+    assert hil.outputs.stats()["written"] == 0  # running_b found its pre-conditions in place
+
+
+def test_failed_precondition_aborts_with_teardown_and_skipped_steps(tmp_path):
+    broken = lambda state, name: 1 if name == "MaxDefrostStatus" else ecu(state, name)  # stuck active
+    policy = ExecutionPolicy(abort_on_precondition=True, teardown={"VehicleMode": 0})
+    backend = SimulatorBackend(broken)
+    hil = HilSession("Abort", hil_var=HIL_VAR, backend=backend, policy=policy,
+                     report_path=str(tmp_path / "abort.html"))
+    assert not scenario_module.run_scenario(hil, parse_scenario(SCENARIO))
+    assert hil.aborted == "pre-condition failed in 'Pre-conditions'"
+    assert backend.state == {"MaxDefrostRequest": 0, "VehicleMode": 0}  # no step ran, teardown did
+    assert [s.name for s in hil.reporter.steps][-2:] == ["Teardown (abort)", "Skipped"]
+    skipped = [n.text for n in hil.reporter.notes if n.text.startswith("SKIPPED")]
+    assert len(skipped) == len(parse_scenario(SCENARIO).nodes) + 1  # every step + manual verification
+    assert hil.report_paths and hil.finish() is False  # report written once
+
+
+def test_suite_wide_abort_falls_back_to_safe_state(tmp_path, monkeypatch):
+    monkeypatch.setenv("HIL_MAX_FAILURES", "1")
+    dead = lambda state, name: 0  # ECU never answers the request
+    backend = SimulatorBackend(dead)
+    hil = HilSession("Abort", hil_var=HIL_VAR, backend=backend, report_path=str(tmp_path / "abort.html"))
+    assert not scenario_module.run_scenario(hil, parse_scenario(SCENARIO))
+    assert hil.aborted == "1 failed checks (limit 1)"
+    assert backend.state == {"MaxDefrostRequest": 0, "VehicleMode": 0}  # request released, ignition off
+    assert [s.name for s in hil.reporter.steps][-2:] == ["Teardown (abort)", "Skipped"]
+
+
+def test_scenario_without_expectations_is_inconclusive(tmp_path):
+    manual_only = parse_scenario("**Steps:**\n1. Set `MaxDefrostRequest` to 1.\n"
+                                 "**Expected Outcome:**\n- The windscreen clears.\n")
+    assert manual_only.expectations == 0
+    hil = HilSession("Inconclusive", hil_var=HIL_VAR, backend=SimulatorBackend(ecu),
+                     report_path=str(tmp_path / "inconclusive.html"))
+    assert not scenario_module.run_scenario(hil, manual_only)
+    assert not hil.checks_passed and hil.outputs.stats()["written"] == 0
+    assert any(n.text.startswith("INCONCLUSIVE") for n in hil.reporter.notes)
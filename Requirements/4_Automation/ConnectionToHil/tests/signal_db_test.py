@@ -0,0 +1,179 @@
+import json
+
+import scenario_critic_loop
+from signal_db import (DbSignal, FeasibilityOracle, Frame, SignalDB, decode_frame, encode_frame,
+                       load_db, parse_dbc, parse_ldf)
+
+
+DBC = """BU_: CCM CIOM
+
+BO_ 2432644760 CCM_Cab_07P: 8 CCM
+ SG_ ShortStopHeater_cmd : 44|2@1+ (1,0) [0|0] ""  CIOM
+
+BO_ 284262208 CIOM_Cab_02P: 8 CIOM
+ SG_ VehicleMode : 32|4@1+ (1,0) [0|0] ""  CCM
+ SG_ HVACBlowerRequest : 8|5@1+ (1,0) [0|31] ""  CCM
+ SG_ OpLevel : 56|8@1+ (0.5,0) [0|127.5] "Percent"  CCM
+
+BA_ "GenMsgCycleTime" BO_ 284262208 10;
+BA_ "GenSigStartValue" SG_ 284262208 VehicleMode 15;
+VAL_ 2432644760 ShortStopHeater_cmd 1 "Request_RequestActive" 0 "Request_NotRequested" ;
+SIG_GROUP_ 284262208 VehicleMode_sg 1 : VehicleMode HVACBlowerRequest;
+"""
+
+LDF = """LIN_description_file;\r
+Nodes {\r
+  Master: CCM, 5 ms, 0.5 ms ;\r
+  Slaves: EACC_TV ;\r
+}\r
+Signals {\r
+  Comp_OnRq: 2, 3, CCM, EACC_TV ;\r
+  CompSpd_Est: 8, 255, EACC_TV, CCM ;\r
+}\r
+Frames {\r
+  MastertoEACCTV_L28: 10, CCM, 8 {\r
+    Comp_OnRq, 0 ;\r
+  }\r
+  EACCTVtoMaster_L28: 11, EACC_TV, 8 {\r
+    CompSpd_Est, 8 ;\r
+  }\r
+}\r
+Signal_encoding_types {\r
+  OffOnRq { logical_value, 0, "Off" ; logical_value, 1, "On" ; }\r
+  Speed { physical_value, 0, 250, 50, 0, "rpm" ; logical_value, 255, "NotAvailable" ; }\r
+}\r
+Signal_representation {\r
+  OffOnRq: Comp_OnRq ;\r
+  Speed: CompSpd_Est ;\r
+}\r
+"""
+
+HIL_VAR = {
+    "CAN_OUT": {"VehicleMode": "CAN/Outgoing/VehicleMode", "HVACBlowerRequest": "CAN/Outgoing/HVACBlowerRequest"},
+    "CAN_IN": {"ShortStopHeater_cmd": "CAN/Incoming/ShortStopHeater_cmd", "VehicleMode": "CAN/Incoming/VehicleMode"},
+}
+
+GOOD = """# Test Type: AUTOMATED
+# Scenario: Blower
+**Steps:**
+1. Set `VehicleMode` to 6.
+2. Set `HVACBlowerRequest` to 31.
+**Expected Outcome:**
+- `ShortStopHeater_cmd` == 1
+"""
+
+BAD = """# Test Type: AUTOMATED
+# Scenario: Heater
+**Steps:**
+1. Set `ShortStopHeater_cmd` to Maximum_Value.
+2. Set `HVACBlowerRequest` to 100.
+**Expected Outcome:**
+- `Flap_Defrost` == 1
+"""
+
+
+def make_db():
+    db = parse_dbc(DBC)
+    return parse_ldf(LDF, db, bus="LIN28")
+
+
+def fixed_writer(row, feedback):
+    return BAD if not feedback else GOOD
+
+
+def accept_all(row, draft):
+    return []
+
+
+# tests
+
+def test_dbc_and_ldf_are_indexed():
+    db = make_db()
+    heater, mode = db.signals["ShortStopHeater_cmd"], db.signals["VehicleMode"]
+    assert (heater.direction, heater.minimum, heater.maximum) == ("IN", 0, 3)
+    assert heater.values[1] == "Request_RequestActive"
+    assert (mode.direction, mode.maximum, mode.initial) == ("OUT", 15, 15)
+    assert db.signals["OpLevel"].maximum == 127.5
+    assert db.frames["CIOM_Cab_02P"].cycle_ms == 10
+    assert db.groups["VehicleMode_sg"] == (284262208, ["VehicleMode", "HVACBlowerRequest"])
+
+    comp, speed = db.signals["Comp_OnRq"], db.signals["CompSpd_Est"]
+    assert (comp.direction, comp.frame, comp.start, comp.maximum) == ("IN", "MastertoEACCTV_L28", 0, 3)
+    assert (speed.direction, speed.minimum, speed.maximum, speed.start) == ("OUT", 0, 12500, 8)
+    assert db.frames["EACCTVtoMaster_L28"].bus == "LIN28"
+
+
+def test_frames_encode_and_decode_both_byte_orders():
+    db = make_db()
+    frame = db.frames["CIOM_Cab_02P"]
+    data = encode_frame(db, frame, {"VehicleMode": 6, "OpLevel": 50.5, "HVACBlowerRequest": 31})
+    assert data == bytes([0, 31, 0, 0, 6, 0, 0, 101])
+    assert decode_frame(db, frame, data) == {"VehicleMode": 6, "HVACBlowerRequest": 31, "OpLevel": 50.5}
+    assert decode_frame(db, frame, encode_frame(db, frame, {"VehicleMode": 2}, data))["OpLevel"] == 50.5
+
+    motorola = SignalDB()
+    frame = Frame("M", 1, 8, "CIOM", "CAN")
+    frame.signals = ["Speed", "Temp"]
+    motorola.add_signal(DbSignal("Speed", "M", 7, 12, little_endian=False))
+    motorola.add_signal(DbSignal("Temp", "M", 19, 8, little_endian=False, signed=True, offset=-40))
+    data = encode_frame(motorola, frame, {"Speed": 0xABC, "Temp": -50})
+    assert data[:4] == bytes([0xAB, 0xC0, 0x0F, 0x60])
+    assert decode_frame(motorola, frame, data) == {"Speed": 0xABC, "Temp": -50}
+
+
+def test_oracle_answers_from_config_then_db():
+    oracle = FeasibilityOracle(make_db(), HIL_VAR)
+    assert not oracle.lookup("Flap_Defrost").exists
+    heater = oracle.lookup("ShortStopHeater_cmd")
+    assert heater.exists and heater.mapped and not heater.writable
+    assert oracle.lookup("VehicleMode").writable  # mapped both ways: the rig can write it
+    speed = oracle.lookup("CompSpd_Est")
+    assert speed.exists and not speed.mapped and speed.writable and speed.source == "LIN28/EACCTVtoMaster_L28"
+    assert oracle.lookup("HVACBlowerRequest").in_range(31) and not oracle.lookup("HVACBlowerRequest").in_range(32)
+    assert oracle.lookup("VehicleMode") is oracle.lookup("VehicleMode")
+
+
+def test_oracle_checks_scenarios():
+    oracle = FeasibilityOracle(make_db(), HIL_VAR)
+    assert oracle.check_text(GOOD) == []
+    assert oracle.check_text(BAD) == [
+        "Value 100 of 'HVACBlowerRequest' is outside its range [0, 31].",
+        "Signal 'Flap_Defrost' not found in DB.",
+        "Cannot set incoming signal 'ShortStopHeater_cmd'; it is sent by the ECU and read-only.",
+    ]
+    assert oracle.check_text(BAD.replace("AUTOMATED", "MANUAL")) == []
+
+
+def test_oracle_rejects_before_the_critic():
+    critic_drafts = []
+
+    def critic(row, draft):
+        critic_drafts.append(draft)
+        return []
+
+    result = scenario_critic_loop.refine({"chunk_id": "req_section_5"}, fixed_writer, critic,
+                                         FeasibilityOracle(make_db(), HIL_VAR))
+    assert result["accepted"] and result["draft"] == GOOD
+    assert (result["oracle_rejections"], result["critic_calls"]) == (1, 1)
+    assert critic_drafts == [GOOD]
+    assert result["attempts"][0].startswith("Feasibility Error: Value 100")
+
+
+def test_sections_run_in_a_process_pool(tmp_path):
+    db_dir = tmp_path / "DB"
+    db_dir.mkdir()
+    (db_dir / "Cab.dbc").write_text(DBC)
+    (db_dir / "LIN28_CCM.ldf").write_text(LDF, newline="")
+    config = tmp_path / "projectConfig.json"
+    config.write_text('{"variables": %s}' % json.dumps(HIL_VAR))
+    requirements = {f"req_section_{n}": {"chunk_id": f"req_section_{n}", "source": "text"} for n in (1, 2)}
+
+    results = scenario_critic_loop.run(requirements, f"{__name__}:fixed_writer", f"{__name__}:accept_all",
+                                       out_dir=tmp_path / "out", jobs=2, db_dir=db_dir, config=config,
+                                       cache_dir=tmp_path / "cache")
+    assert [r["accepted"] for r in results] == [True, True]
+    names = sorted(p.name.rsplit("_", 1)[0] for p in (tmp_path / "out").iterdir())
+    assert names == ["Scenario_Writer_Critic_Error_Log_req_section_1", "Scenario_Writer_Critic_Error_Log_req_section_2",
+                     "scenario_req_section_1", "scenario_req_section_2"]
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+    assert load_db(db_dir, tmp_path / "cache").signals["CompSpd_Est"].maximum == 12500
@@ -0,0 +1,54 @@
+from signal_latency import LatencyHistogram, LatencyTracker, paired_status
+from test_reporter import TestReporter
+
+import random
+
+
+# tests
+
+def test_pairs_follow_request_status_naming():
+    assert paired_status("MaxDefrostRequest") == "MaxDefrostStatus"
+    assert paired_status("ClimateAirDistRequest_Floor") == "ClimateAirDistStatus_Floor"
+    assert paired_status("CabHeatManReq") == "CabHeatManStatus"
+    assert paired_status("HVACBlowerRequest") == "HVACBlowerLevelStat_BlowerLevel"
+    assert paired_status("VehicleMode") is None
+    assert paired_status("TipperShakerRequest", known_status={"MaxDefrostStatus"}) is None
+
+
+def test_histogram_percentiles_are_within_one_percent():
+    rng = random.Random(29)
+    values = [rng.randint(1_000, 2_000_000) for _ in range(20_000)]
+    h = LatencyHistogram()
+    for v in values:
+        h.record(v)
+    values.sort()
+
+    for q in (50, 95, 99):
+        exact = values[int(q / 100 * len(values)) - 1]
+        assert abs(h.percentile(q) - exact) <= exact * 0.01
+    assert h.max == values[-1] and h.count == len(values)
+
+
+def test_first_matching_read_closes_measurement():
+    tracker = LatencyTracker()
+    tracker.on_write("MaxDefrostRequest", 1, t_ns=0)
+
+    assert tracker.on_read("MaxDefrostStatus", 0, t_ns=100_000_000) is None
+    assert tracker.on_read("MaxDefrostStatus", 1, t_ns=250_000_000) == 0.25
+    assert tracker.on_read("MaxDefrostStatus", 1, t_ns=900_000_000) is None
+
+    (request, status, count, p50, p95, p99, worst), = tracker.summary()
+    assert (request, status, count) == ("MaxDefrostRequest", "MaxDefrostStatus", 1)
+    assert abs(p50 - 250) < 2.5
+
+
+def test_report_shows_latency_percentiles(tmp_path):
+    reporter = TestReporter("latency")
+    reporter.latency = LatencyTracker()
+    reporter.latency.on_write("ClimatePowerRequest", 1, t_ns=0)
+    reporter.latency.on_read("ClimatePowerStatus", 1, t_ns=40_000_000)
+    reporter.add_step("Step 1")
+
+    path = tmp_path / "report.html"
+    reporter.generate_html(str(path))
+    assert "ClimatePowerRequest &rarr; ClimatePowerStatus" in path.read_text(encoding="utf-8")